@@ -14,8 +14,6 @@ import logging
 from difflib import SequenceMatcher
 from typing import List, Optional, Tuple
 
-from transliterate import translit
-
 logger = logging.getLogger(__name__)
 
 # A candidate must score at least this to be considered a match.
@@ -62,24 +60,27 @@ class AssigneeService:
                 # query (user-privacy settings). Don't cache the empty result so a
                 # later call can succeed, and make the cause obvious in the logs.
                 logger.warning(
-                    f"search_assignable_users_for_projects('', {project_key}) returned "
-                    "0 users; this Jira instance may not allow empty-query user listing"
+                    "search_assignable_users_for_projects('', %s) returned 0 users; this Jira instance may not allow empty-query user listing",
+                    project_key,
                 )
                 return result
 
             self._cache[project_key] = result
             logger.info(
-                f"Fetched {len(result)} assignable users for project {project_key}"
+                "Fetched %s assignable users for project %s", len(result), project_key
             )
             return result
         except Exception as e:
             logger.error(
-                f"Failed to fetch assignable users for project {project_key}: {e}"
+                "Failed to fetch assignable users for project %s: %s", project_key, e
             )
             return []
 
     @staticmethod
     def _translit(text: str) -> str:
+        # Imported lazily: only needed once a query is actually scored
+        from transliterate import translit
+
         try:
             return translit(text, "ru", reversed=True)
         except Exception:
@@ -150,7 +151,10 @@ class AssigneeService:
             close = [u for u, s in above if s >= best - AMBIGUITY_BAND]
             if len(close) == 1:
                 logger.info(
-                    f"Fuzzy matched assignee '{close[0]['name']}' for '{query}' (score {best:.2f})"
+                    "Fuzzy matched assignee '%s' for '%s' (score %.2f)",
+                    close[0]["name"],
+                    query,
+                    best,
                 )
                 return close[0]["name"], None
             return None, self._ambiguous_message(query, close)
@@ -1,13 +1,168 @@
+import functools
 import logging
-from difflib import get_close_matches
-from typing import Optional
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional
 
-from transliterate import translit
+from rapidfuzz import fuzz, process, utils
 
-from .components import components
+from .components import components_tuple
 
 logger = logging.getLogger(__name__)
 
+# Seconds a project's fetched component list is reused
+COMPONENT_CACHE_TTL = 600
+
+# Module-level because a ComponentService is built per command.
+# project key -> (components, monotonic expiry time)
+_component_cache: dict[str, tuple[tuple[str, ...], float]] = {}
+
+# Component fetches currently in progress, keyed by project
+_inflight_fetches: dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def _single_flight(project_key: str, fetch: Callable[[], tuple[str, ...]]):
+    """
+    Run fetch() for a project unless a fetch for it is already in progress.
+
+    Concurrent callers for the same project wait for the first caller's result
+    (or exception) instead of each sending their own Jira request.
+    """
+    with _inflight_lock:
+        future = _inflight_fetches.get(project_key)
+        leader = future is None
+        if leader:
+            future = _inflight_fetches[project_key] = Future()
+
+    if not leader:
+        return future.result()
+
+    try:
+        result = fetch()
+        future.set_result(result)
+        return result
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight_fetches[project_key]
+
+
+@functools.lru_cache(maxsize=None)
+def _ru_to_latin_table() -> dict[int, str]:
+    """
+    Russian -> Latin transliteration table, composed once per Cyrillic character.
+
+    translit(..., reversed=True) for Russian is a pure per-character mapping
+    (no multi-character input rules), so str.translate with this table gives the
+    same result without re-running the language pack's passes on every call.
+    Built on first non-ASCII label so transliterate is only imported when needed.
+    """
+    from transliterate import translit
+
+    return {
+        code: latin
+        for code in range(0x0400, 0x0530)
+        if (latin := translit(chr(code), "ru", reversed=True)) != chr(code)
+    }
+
+
+def _to_latin(text: str) -> str:
+    """Transliterate Russian text to Latin (same output as reversed translit)."""
+    if text.isascii():
+        # Nothing to transliterate in already-Latin labels
+        return text
+    return text.translate(_ru_to_latin_table())
+
+
+@functools.lru_cache(maxsize=64)
+def _component_index(
+    available_components: tuple[str, ...],
+) -> tuple[tuple[str, ...], dict[str, str]]:
+    """
+    Lookup structures for a component list, built in one pass.
+
+    Returns the names normalized for the fuzzy matcher (index-aligned with
+    the input) and a map from lowercased name to original spelling.
+    """
+    normalized = []
+    by_lower = {}
+    for comp in available_components:
+        normalized.append(utils.default_process(comp))
+        by_lower.setdefault(comp.lower(), comp)
+    return tuple(normalized), by_lower
+
+
+@functools.lru_cache(maxsize=64)
+def _format_components(available_components: tuple[str, ...]) -> str:
+    """Bullet list of components (already sorted at fetch time)."""
+    return "\n".join(f"• {comp}" for comp in available_components)
+
+
+@functools.lru_cache(maxsize=4096)
+def _match_component(
+    component_label: str,
+    project_key: Optional[str],
+    available_components: tuple[str, ...],
+) -> tuple[str, str]:
+    """
+    Match a label against a component list.
+
+    Memoized: users keep typing the same labels, so repeated lookups skip
+    transliteration and fuzzy scoring. The component list is part of the key,
+    so a refetched list that differs never hits a stale entry.
+    """
+    # Step 1: Transliterate from Russian to Latin
+    transliterated = _to_latin(component_label)
+    logger.info("Transliterated '%s' to '%s'", component_label, transliterated)
+
+    # Most labels name a component exactly (modulo case): skip fuzzy scoring
+    normalized, by_lower = _component_index(available_components)
+    exact = by_lower.get(transliterated.lower())
+    if exact is not None:
+        logger.info(
+            "Exact component match: '%s' for input '%s' in project %s",
+            exact,
+            component_label,
+            project_key or "default",
+        )
+        return exact, ""
+
+    # Step 2: Find closest match using fuzzy matching. token_sort_ratio
+    # tolerates word order and case but, unlike WRatio, does not score
+    # partial substrings, so a short prefix like "comp" can't silently
+    # pick an arbitrary component. Choices are normalized once per component
+    # list, so only the query is processed here.
+    match = process.extractOne(
+        utils.default_process(transliterated),
+        normalized,
+        scorer=fuzz.token_sort_ratio,
+        processor=None,
+        score_cutoff=70,
+    )
+
+    if match:
+        selected_component = available_components[match[2]]
+        logger.info(
+            "Found closest component: '%s' for input '%s' in project %s",
+            selected_component,
+            component_label,
+            project_key or "default",
+        )
+        return selected_component, ""
+
+    logger.info(
+        "No close match found for '%s' in project %s",
+        component_label,
+        project_key or "default",
+    )
+    available = _format_components(available_components)
+    message = f"❌ No close match found for '{component_label}' in project {project_key or 'default'}\n\n📋 Available components:\n{available}"
+    return "default", message
+
 
 class ComponentService:
     """Service for component selection based on transliteration and fuzzy matching."""
@@ -15,49 +170,61 @@ class ComponentService:
     def __init__(self, jira_service=None):
         """Initialize with optional Jira service for dynamic component fetching."""
         self.jira_service = jira_service
-        self._cached_components = None
 
-    def _get_components_from_jira(self, project_key: str = None) -> list[str]:
-        """Fetch components from Jira project."""
+    def _get_components_from_jira(self, project_key: str = None) -> tuple[str, ...]:
+        """Fetch a project's components, reusing them for COMPONENT_CACHE_TTL seconds."""
         # Use provided project_key or default
         if not project_key and self.jira_service:
             project_key = self.jira_service.project_key
 
-        # Check cache only for default project
-        if not project_key or (
-            self.jira_service and project_key == self.jira_service.project_key
-        ):
-            if self._cached_components is not None:
-                return self._cached_components
-
         if not self.jira_service:
             logger.warning("No Jira service provided, using static components")
-            return components
+            return components_tuple
 
-        try:
-            # Fetch components from Jira project
-            jira_components = self.jira_service.jira.project_components(project_key)
-            component_names = [comp.name for comp in jira_components]
-
-            # Filter out components that start with "DEPRECATED"
-            filtered_components = [
-                comp for comp in component_names if not comp.startswith("DEPRECATED")
-            ]
-
-            # Cache only for default project
-            if project_key == self.jira_service.project_key:
-                self._cached_components = filtered_components
+        cached = _component_cache.get(project_key)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
 
-            logger.info(
-                f"Fetched {len(component_names)} components from Jira project {project_key}, filtered to {len(filtered_components)} active components: {filtered_components}"
+        try:
+            filtered_components = _single_flight(
+                project_key, lambda: self._fetch_components(project_key)
+            )
+            _component_cache[project_key] = (
+                filtered_components,
+                time.monotonic() + COMPONENT_CACHE_TTL,
             )
             return filtered_components
         except Exception as e:
             logger.error(
-                f"Failed to fetch components from Jira project {project_key}: {e}"
+                "Failed to fetch components from Jira project %s: %s", project_key, e
             )
             logger.info("Falling back to static components")
-            return components
+            return components_tuple
+
+    def _fetch_components(self, project_key: str) -> tuple[str, ...]:
+        """Fetch active (non-deprecated) components from Jira, sorted."""
+        jira_components = self.jira_service.jira.project_components(project_key)
+
+        # Drop components that start with "DEPRECATED" and sort in the same
+        # pass, so error messages can list them as-is
+        filtered_components = tuple(
+            sorted(
+                comp.name
+                for comp in jira_components
+                if not comp.name.startswith("DEPRECATED")
+            )
+        )
+        # Build the lookup indexes now, not on the first user query
+        _component_index(filtered_components)
+
+        logger.info(
+            "Fetched %s components from Jira project %s, filtered to %s active components: %s",
+            len(jira_components),
+            project_key,
+            len(filtered_components),
+            filtered_components,
+        )
+        return filtered_components
 
     def find_component(
         self, component_label: str, project_key: str = None
@@ -76,41 +243,19 @@ class ComponentService:
         try:
             # Get components from Jira or fallback to static list
             available_components_list = self._get_components_from_jira(project_key)
-
-            # Step 1: Transliterate from Russian to Latin
-            transliterated = translit(component_label, "ru", reversed=True)
-            logger.info(f"Transliterated '{component_label}' to '{transliterated}'")
-
-            # Step 2: Find closest match using fuzzy matching
-            matches = get_close_matches(
-                transliterated, available_components_list, n=1, cutoff=0.7
+            return _match_component(
+                component_label, project_key, available_components_list
             )
 
-            if matches:
-                selected_component = matches[0]
-                logger.info(
-                    f"Found closest component: '{selected_component}' for input '{component_label}' in project {project_key or 'default'}"
-                )
-                return selected_component, ""
-            else:
-                logger.info(
-                    f"No close match found for '{component_label}' in project {project_key or 'default'}"
-                )
-                available_components = "\n".join(
-                    [f"• {comp}" for comp in sorted(available_components_list)]
-                )
-                message = f"❌ No close match found for '{component_label}' in project {project_key or 'default'}\n\n📋 Available components:\n{available_components}"
-                return "default", message
-
         except Exception as e:
-            logger.error(f"Error in component selection for '{component_label}': {e}")
-            available_components_list = self._get_components_from_jira(project_key)
-            available_components = "\n".join(
-                [f"• {comp}" for comp in sorted(available_components_list)]
+            logger.error(
+                "Error in component selection for '%s': %s", component_label, e
             )
+            available_components_list = self._get_components_from_jira(project_key)
+            available_components = _format_components(available_components_list)
             message = f"❌ Error processing component '{component_label}'\n\n📋 Available components:\n{available_components}"
             return "default", message
 
     def get_available_components(self) -> list:
         """Get list of available components."""
-        return self._get_components_from_jira().copy()
+        return list(self._get_components_from_jira())
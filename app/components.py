@@ -12,3 +12,6 @@ components = [
     "component-k",
     "component-l",
 ]
+
+# Immutable view for lookups and cache keys; ``components`` stays the editable source
+components_tuple = tuple(components)
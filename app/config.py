@@ -26,6 +26,9 @@ class Config:
     CH_DATABASE = os.getenv("CH_DATABASE", "default")
     CH_USER = os.getenv("CH_USER")
     CH_PASSWORD = os.getenv("CH_PASSWORD")
+    # Native-protocol block compression ("lz4" or "lz4hc"; zstd would need the
+    # zstd package, which isn't a dependency); unset = off
+    CH_COMPRESSION = os.getenv("CH_COMPRESSION")
 
     # Grafana Configuration (for message reference links)
     GRAFANA_MESSAGE_URL = os.getenv(
@@ -55,17 +58,14 @@ class Config:
     @classmethod
     def validate(cls):
         """Validate that all required configuration is present."""
-        required_vars = [
-            "TELEGRAM_BOT_TOKEN",
-            "CH_USER",
-            "CH_PASSWORD",
-            "TOKEN_ENCRYPTION_KEY",
-        ]
-
-        missing_vars = []
-        for var in required_vars:
-            if not getattr(cls, var):
-                missing_vars.append(var)
+        required_vars = (
+            ("TELEGRAM_BOT_TOKEN", cls.TELEGRAM_BOT_TOKEN),
+            ("CH_USER", cls.CH_USER),
+            ("CH_PASSWORD", cls.CH_PASSWORD),
+            ("TOKEN_ENCRYPTION_KEY", cls.TOKEN_ENCRYPTION_KEY),
+        )
+
+        missing_vars = [name for name, value in required_vars if not value]
 
         if missing_vars:
             raise ValueError(
@@ -1,6 +1,7 @@
 """Cryptographic service for encrypting and decrypting sensitive data."""
 
 import logging
+import threading
 from typing import Optional
 
 from cryptography.fernet import Fernet, InvalidToken
@@ -13,6 +14,10 @@ logger = logging.getLogger(__name__)
 class CryptoService:
     """Service for encrypting and decrypting tokens using Fernet symmetric encryption."""
 
+    # Fernet instances shared across services, keyed by the encryption key
+    _fernets: dict[str, Fernet] = {}
+    _fernets_lock = threading.Lock()
+
     def __init__(self):
         """Initialize the crypto service with encryption key from config."""
         self._fernet = None
@@ -28,13 +33,23 @@ class CryptoService:
                 )
                 return
 
-            # Fernet key must be 32 url-safe base64-encoded bytes
-            self._fernet = Fernet(key.encode())
+            self._fernet = self._get_fernet(key)
             logger.info("Crypto service initialized successfully")
         except Exception as e:
-            logger.error(f"Failed to initialize crypto service: {e}")
+            logger.error("Failed to initialize crypto service: %s", e)
             raise
 
+    @classmethod
+    def _get_fernet(cls, key: str) -> Fernet:
+        """Return the shared Fernet cipher for a key, creating it on first use."""
+        with cls._fernets_lock:
+            fernet = cls._fernets.get(key)
+            if fernet is None:
+                # Fernet key must be 32 url-safe base64-encoded bytes
+                fernet = Fernet(key.encode())
+                cls._fernets[key] = fernet
+            return fernet
+
     def encrypt_token(self, token: str) -> Optional[str]:
         """
         Encrypt a token using Fernet symmetric encryption.
@@ -53,7 +68,7 @@ class CryptoService:
             encrypted = self._fernet.encrypt(token.encode())
             return encrypted.decode()
         except Exception as e:
-            logger.error(f"Failed to encrypt token: {e}")
+            logger.error("Failed to encrypt token: %s", e)
             return None
 
     def decrypt_token(self, encrypted_token: str) -> Optional[str]:
@@ -77,7 +92,7 @@ class CryptoService:
             logger.error("Invalid token or wrong encryption key")
             return None
         except Exception as e:
-            logger.error(f"Failed to decrypt token: {e}")
+            logger.error("Failed to decrypt token: %s", e)
             return None
 
     @staticmethod
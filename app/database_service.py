@@ -1,21 +1,73 @@
 """Database service for ClickHouse operations."""
 
 import logging
+import threading
+import time
 from typing import Optional
 
 from clickhouse_driver import Client
+from clickhouse_driver.errors import NetworkError, SocketTimeoutError
 
 from app.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Errors that mean the connection dropped and a reconnect may help
+_CONNECTION_ERRORS = (EOFError, OSError, NetworkError, SocketTimeoutError)
+
+# Buffered link inserts are written once this many rows are queued,
+# or this many seconds after the first row was queued
+INSERT_BATCH_SIZE = 1000
+INSERT_FLUSH_INTERVAL = 0.5
+# After a failed flush the timer is re-armed, doubling the delay up to this
+INSERT_RETRY_MAX_DELAY = 30.0
+
+# Seconds a fetched user token is served from memory before re-reading it
+TOKEN_CACHE_TTL = 300
+
 
 class DatabaseService:
     """Service for ClickHouse database operations."""
 
+    # Queries on the hot paths. clickhouse-driver substitutes %(name)s
+    # parameters client-side, so these are sent as-is apart from the values.
+
+    # A link exists if its latest row is not a tombstone. updated_at is a
+    # DateTime64(6) written with now64(6), so rows from the same second still
+    # have a clear latest one, picked the same way as ReplacingMergeTree(updated_at).
+    _Q_LINK_EXISTS = """
+        SELECT 1 FROM jira_issues
+        WHERE message_ref = %(message_ref)s AND jira_key = %(jira_key)s
+        GROUP BY message_ref, jira_key
+        HAVING argMax(is_deleted, updated_at) = 0
+    """
+
+    # Native block insert: rows are passed separately, not substituted
+    _Q_INSERT_LINKS = "INSERT INTO jira_issues (message_ref, jira_key) VALUES"
+
+    # Latest version by updated_at without FINAL's merge work; GROUP BY
+    # makes a user with no rows return no result instead of '', and
+    # HAVING hides users whose latest row is a tombstone
+    _Q_GET_TOKEN = """
+        SELECT argMax(jira_token_encrypted, updated_at)
+        FROM user_tokens
+        WHERE telegram_id = %(telegram_id)s
+        GROUP BY telegram_id
+        HAVING argMax(is_deleted, updated_at) = 0
+    """
+
     def __init__(self):
         """Initialize database service."""
         self.client = None
+        # The ClickHouse client is not thread-safe and the flush timer runs on
+        # its own thread, so every client call goes through _execute and this lock
+        self._lock = threading.RLock()
+        self._insert_buffer: list[tuple[str, str]] = []
+        self._buffered_links: set[tuple[str, str]] = set()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_failures = 0
+        # telegram_id -> (encrypted token, monotonic expiry time)
+        self._token_cache: dict[int, tuple[str, float]] = {}
         self._connect()
 
     def _connect(self):
@@ -27,21 +79,31 @@ class DatabaseService:
                 user=Config.CH_USER,
                 password=Config.CH_PASSWORD,
                 database=Config.CH_DATABASE,
+                compression=Config.CH_COMPRESSION or False,
             )
             # Test connection
             self.client.execute("SELECT 1")
             logger.info("Successfully connected to ClickHouse database")
         except Exception as e:
-            logger.error(f"Failed to connect to ClickHouse: {e}")
+            logger.error("Failed to connect to ClickHouse: %s", e)
             raise
 
-    def _ensure_connection(self):
-        """Ensure ClickHouse connection is active."""
-        try:
-            self.client.execute("SELECT 1")
-        except Exception:
-            logger.info("Reconnecting to ClickHouse...")
-            self._connect()
+    def _execute(self, query: str, params=None, **kwargs):
+        """Execute a query, reconnecting and retrying once if the connection dropped."""
+        with self._lock:
+            try:
+                return self.client.execute(query, params, **kwargs)
+            except _CONNECTION_ERRORS as e:
+                logger.info("ClickHouse connection lost (%s), reconnecting...", e)
+                self._connect()
+                return self.client.execute(query, params, **kwargs)
+
+    def _link_in_db(self, message_ref: str, jira_key: str) -> bool:
+        """Check ClickHouse (not the insert buffer) for a link; errors propagate."""
+        result = self._execute(
+            self._Q_LINK_EXISTS, {"message_ref": message_ref, "jira_key": jira_key}
+        )
+        return bool(result)
 
     def link_exists(self, message_ref: str, jira_key: str) -> bool:
         """
@@ -55,20 +117,12 @@ class DatabaseService:
             bool: True if link exists, False otherwise
         """
         try:
-            self._ensure_connection()
-
-            query = """
-                SELECT count() FROM jira_issues
-                WHERE message_ref = %(message_ref)s AND jira_key = %(jira_key)s
-            """
-            result = self.client.execute(
-                query, {"message_ref": message_ref, "jira_key": jira_key}
-            )
-
-            return result[0][0] > 0
+            if (message_ref, jira_key) in self._buffered_links:
+                return True
+            return self._link_in_db(message_ref, jira_key)
 
         except Exception as e:
-            logger.error(f"Error checking link existence: {e}")
+            logger.error("Error checking link existence: %s", e)
             return False
 
     def insert_jira_issue_link(
@@ -77,6 +131,9 @@ class DatabaseService:
         """
         Insert a link between a message reference and a Jira issue.
 
+        The link is checked for duplicates right away but written to ClickHouse
+        in a batch (see flush), so many single links end up in one insert.
+
         Args:
             message_ref: UUID of the message reference
             jira_key: Jira issue key (e.g., AAI-1020)
@@ -85,34 +142,109 @@ class DatabaseService:
             tuple[bool, str]: (success, error_message) - success is True if inserted,
                              error_message contains reason if failed
         """
+        link = (message_ref, jira_key)
         try:
-            self._ensure_connection()
-
-            # Check for duplicate
-            if self.link_exists(message_ref, jira_key):
-                logger.warning(
-                    f"Duplicate link rejected: message_ref={message_ref}, jira_key={jira_key}"
-                )
-                return False, "duplicate"
-
-            query = """
-                INSERT INTO jira_issues (message_ref, jira_key, created_at)
-                VALUES (%(message_ref)s, %(jira_key)s, now())
-            """
-
-            self.client.execute(
-                query, {"message_ref": message_ref, "jira_key": jira_key}
-            )
+            with self._lock:
+                if link in self._buffered_links or self._link_in_db(*link):
+                    logger.warning(
+                        "Duplicate link rejected: message_ref=%s, jira_key=%s",
+                        message_ref,
+                        jira_key,
+                    )
+                    return False, "duplicate"
+
+                self._insert_buffer.append(link)
+                self._buffered_links.add(link)
+                if len(self._insert_buffer) >= INSERT_BATCH_SIZE:
+                    self.flush()
+                elif self._flush_timer is None:
+                    self._schedule_flush(INSERT_FLUSH_INTERVAL)
 
             logger.info(
-                f"Successfully inserted link: message_ref={message_ref}, jira_key={jira_key}"
+                "Queued link for insert: message_ref=%s, jira_key=%s",
+                message_ref,
+                jira_key,
             )
             return True, ""
 
         except Exception as e:
-            logger.error(f"Error inserting jira_issue link: {e}")
+            logger.error("Error inserting jira_issue link: %s", e)
             return False, "error"
 
+    def insert_jira_issue_links(self, rows: list[tuple[str, str]]) -> bool:
+        """
+        Insert many message reference / Jira issue links in a single block.
+
+        Unlike insert_jira_issue_link, rows are not checked for duplicates.
+
+        Args:
+            rows: (message_ref, jira_key) pairs
+
+        Returns:
+            bool: True if all rows were inserted
+        """
+        if not rows:
+            return True
+
+        try:
+            self._execute(
+                self._Q_INSERT_LINKS,
+                [
+                    {"message_ref": message_ref, "jira_key": jira_key}
+                    for message_ref, jira_key in rows
+                ],
+            )
+            logger.info("Successfully inserted %s jira_issue links", len(rows))
+            return True
+
+        except Exception as e:
+            logger.error("Error inserting jira_issue links: %s", e)
+            return False
+
+    def _schedule_flush(self, delay: float):
+        """Start the timer that flushes the insert buffer; caller holds _lock."""
+        self._flush_timer = threading.Timer(delay, self.flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _cancel_flush(self):
+        """Stop a pending flush timer; caller holds _lock."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    def flush(self) -> bool:
+        """
+        Write buffered link inserts to ClickHouse in one block.
+
+        Rows stay buffered if the write fails, and the flush timer is re-armed
+        with exponential backoff (up to INSERT_RETRY_MAX_DELAY) so they are
+        retried even if no further link is queued.
+
+        Returns:
+            bool: True if the buffer is empty afterwards
+        """
+        with self._lock:
+            self._cancel_flush()
+
+            if not self._insert_buffer:
+                return True
+
+            if not self.insert_jira_issue_links(self._insert_buffer):
+                self._flush_failures += 1
+                self._schedule_flush(
+                    min(
+                        INSERT_FLUSH_INTERVAL * 2**self._flush_failures,
+                        INSERT_RETRY_MAX_DELAY,
+                    )
+                )
+                return False
+
+            self._flush_failures = 0
+            self._insert_buffer = []
+            self._buffered_links.clear()
+            return True
+
     def delete_jira_issue_link(
         self, message_ref: str, jira_key: str
     ) -> tuple[bool, str]:
@@ -128,31 +260,34 @@ class DatabaseService:
                              error_message contains reason if failed
         """
         try:
-            self._ensure_connection()
-
+            self.flush()
             # Check if link exists
             if not self.link_exists(message_ref, jira_key):
                 logger.warning(
-                    f"Link not found for deletion: message_ref={message_ref}, jira_key={jira_key}"
+                    "Link not found for deletion: message_ref=%s, jira_key=%s",
+                    message_ref,
+                    jira_key,
                 )
                 return False, "not_found"
 
+            # Soft delete: a tombstone row supersedes the link instead of an
+            # ALTER ... DELETE mutation rewriting parts
             query = """
-                ALTER TABLE jira_issues DELETE
-                WHERE message_ref = %(message_ref)s AND jira_key = %(jira_key)s
+                INSERT INTO jira_issues (message_ref, jira_key, created_at, updated_at, is_deleted)
+                VALUES (%(message_ref)s, %(jira_key)s, now(), now64(6), 1)
             """
 
-            self.client.execute(
-                query, {"message_ref": message_ref, "jira_key": jira_key}
-            )
+            self._execute(query, {"message_ref": message_ref, "jira_key": jira_key})
 
             logger.info(
-                f"Successfully deleted link: message_ref={message_ref}, jira_key={jira_key}"
+                "Successfully deleted link: message_ref=%s, jira_key=%s",
+                message_ref,
+                jira_key,
             )
             return True, ""
 
         except Exception as e:
-            logger.error(f"Error deleting jira_issue link: {e}")
+            logger.error("Error deleting jira_issue link: %s", e)
             return False, "error"
 
     def get_jira_keys_by_message_ref(self, message_ref: str) -> list[str]:
@@ -166,17 +301,23 @@ class DatabaseService:
             list[str]: List of Jira keys
         """
         try:
-            self._ensure_connection()
-
-            query = (
-                "SELECT jira_key FROM jira_issues WHERE message_ref = %(message_ref)s"
-            )
-            results = self.client.execute(query, {"message_ref": message_ref})
+            self.flush()
+            # Latest row per link wins; links whose latest row is a tombstone
+            # are dropped
+            query = """
+                SELECT jira_key FROM jira_issues
+                WHERE message_ref = %(message_ref)s
+                GROUP BY jira_key
+                HAVING argMax(is_deleted, updated_at) = 0
+            """
+            # Columnar: the driver hands back the decoded jira_key column as
+            # is, instead of building a tuple per row for us to unpack
+            columns = self._execute(query, {"message_ref": message_ref}, columnar=True)
 
-            return [row[0] for row in results]
+            return list(columns[0]) if columns else []
 
         except Exception as e:
-            logger.error(f"Error fetching jira keys: {e}")
+            logger.error("Error fetching jira keys: %s", e)
             return []
 
     # ==================== User Token Methods ====================
@@ -196,15 +337,13 @@ class DatabaseService:
             tuple[bool, str]: (success, error_message)
         """
         try:
-            self._ensure_connection()
-
             # Insert new token (ReplacingMergeTree will handle updates)
             query = """
                 INSERT INTO user_tokens (telegram_id, jira_token_encrypted, telegram_username, created_at, updated_at)
-                VALUES (%(telegram_id)s, %(token)s, %(username)s, now(), now())
+                VALUES (%(telegram_id)s, %(token)s, %(username)s, now(), now64(6))
             """
 
-            self.client.execute(
+            self._execute(
                 query,
                 {
                     "telegram_id": telegram_id,
@@ -213,11 +352,12 @@ class DatabaseService:
                 },
             )
 
-            logger.info(f"Successfully saved token for telegram_id={telegram_id}")
+            self._token_cache.pop(telegram_id, None)
+            logger.info("Successfully saved token for telegram_id=%s", telegram_id)
             return True, ""
 
         except Exception as e:
-            logger.error(f"Error saving user token: {e}")
+            logger.error("Error saving user token: %s", e)
             return False, "error"
 
     def get_user_token(self, telegram_id: int) -> Optional[str]:
@@ -230,22 +370,24 @@ class DatabaseService:
         Returns:
             The encrypted token string, or None if not found
         """
-        try:
-            self._ensure_connection()
+        cached = self._token_cache.get(telegram_id)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
 
-            # Use FINAL to get the latest version from ReplacingMergeTree
-            query = """
-                SELECT jira_token_encrypted FROM user_tokens FINAL
-                WHERE telegram_id = %(telegram_id)s
-            """
-            result = self.client.execute(query, {"telegram_id": telegram_id})
+        try:
+            result = self._execute(self._Q_GET_TOKEN, {"telegram_id": telegram_id})
 
             if result:
-                return result[0][0]
+                token = result[0][0]
+                self._token_cache[telegram_id] = (
+                    token,
+                    time.monotonic() + TOKEN_CACHE_TTL,
+                )
+                return token
             return None
 
         except Exception as e:
-            logger.error(f"Error getting user token: {e}")
+            logger.error("Error getting user token: %s", e)
             return None
 
     def delete_user_token(self, telegram_id: int) -> tuple[bool, str]:
@@ -259,26 +401,28 @@ class DatabaseService:
             tuple[bool, str]: (success, error_message)
         """
         try:
-            self._ensure_connection()
-
             # Check if token exists
             existing = self.get_user_token(telegram_id)
             if not existing:
-                logger.warning(f"Token not found for deletion: telegram_id={telegram_id}")
+                logger.warning(
+                    "Token not found for deletion: telegram_id=%s", telegram_id
+                )
                 return False, "not_found"
 
+            # Soft delete via tombstone row (see delete_jira_issue_link)
             query = """
-                ALTER TABLE user_tokens DELETE
-                WHERE telegram_id = %(telegram_id)s
+                INSERT INTO user_tokens (telegram_id, jira_token_encrypted, telegram_username, created_at, updated_at, is_deleted)
+                VALUES (%(telegram_id)s, '', NULL, now(), now64(6), 1)
             """
 
-            self.client.execute(query, {"telegram_id": telegram_id})
+            self._execute(query, {"telegram_id": telegram_id})
+            self._token_cache.pop(telegram_id, None)
 
-            logger.info(f"Successfully deleted token for telegram_id={telegram_id}")
+            logger.info("Successfully deleted token for telegram_id=%s", telegram_id)
             return True, ""
 
         except Exception as e:
-            logger.error(f"Error deleting user token: {e}")
+            logger.error("Error deleting user token: %s", e)
             return False, "error"
 
     def user_is_registered(self, telegram_id: int) -> bool:
@@ -294,7 +438,15 @@ class DatabaseService:
         return self.get_user_token(telegram_id) is not None
 
     def close(self):
-        """Close ClickHouse connection."""
+        """Flush buffered inserts and close ClickHouse connection."""
+        with self._lock:
+            if not self.flush():
+                logger.error(
+                    "%s buffered link inserts could not be written before closing",
+                    len(self._insert_buffer),
+                )
+            # No retry once closed
+            self._cancel_flush()
         if self.client:
             self.client.disconnect()
             logger.info("ClickHouse connection closed")
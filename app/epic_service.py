@@ -13,8 +13,6 @@ import logging
 from difflib import SequenceMatcher
 from typing import List, Optional, Tuple
 
-from transliterate import translit
-
 logger = logging.getLogger(__name__)
 
 MATCH_THRESHOLD = 0.6
@@ -45,17 +43,20 @@ class EpicService:
             )
             epics = [{"key": i.key, "name": i.fields.summary or i.key} for i in issues]
             if not epics:
-                logger.warning(f"No epics found in project {project_key}")
+                logger.warning("No epics found in project %s", project_key)
                 return epics
             self._cache[project_key] = epics
-            logger.info(f"Fetched {len(epics)} epics for project {project_key}")
+            logger.info("Fetched %s epics for project %s", len(epics), project_key)
             return epics
         except Exception as e:
-            logger.error(f"Failed to fetch epics for project {project_key}: {e}")
+            logger.error("Failed to fetch epics for project %s: %s", project_key, e)
             return []
 
     @staticmethod
     def _translit(text: str) -> str:
+        # Imported lazily: only needed once a query is actually scored
+        from transliterate import translit
+
         try:
             return translit(text, "ru", reversed=True)
         except Exception:
@@ -130,7 +131,10 @@ class EpicService:
             close = [e for e, s in above if s >= best - AMBIGUITY_BAND]
             if len(close) == 1:
                 logger.info(
-                    f"Fuzzy matched epic '{close[0]['key']}' for '{query}' (score {best:.2f})"
+                    "Fuzzy matched epic '%s' for '%s' (score %.2f)",
+                    close[0]["key"],
+                    query,
+                    best,
                 )
                 return close[0]["key"], None
             return None, self._ambiguous_message(query, close)
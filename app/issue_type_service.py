@@ -1,15 +1,24 @@
+import functools
 import logging
-from difflib import get_close_matches
+
+from rapidfuzz import fuzz, process
 
 from .issue_types import issue_types
 
 logger = logging.getLogger(__name__)
 
+# Derived once from the static issue type list
+_ISSUE_TYPES_LOWER = tuple(t.lower() for t in issue_types)
+_AVAILABLE_ISSUE_TYPES = "\n".join(f"• {issue_type}" for issue_type in issue_types)
+
 
 class IssueTypeService:
     """Service for issue type selection based on fuzzy matching."""
 
     @staticmethod
+    # Memoized like component matching: labels repeat and the issue type list
+    # is static, so a repeated label skips the fuzzy scan
+    @functools.lru_cache(maxsize=256)
     def find_issue_type(issue_type_label: str) -> tuple[str, str]:
         """
         Find the closest issue type based on fuzzy matching.
@@ -22,38 +31,37 @@ class IssueTypeService:
                            or contains available issue types list if not found
         """
         try:
-            # Find closest match using fuzzy matching (case-insensitive)
-            matches = get_close_matches(
+            # Find closest match using fuzzy matching (case-insensitive).
+            # fuzz.ratio is the Indel similarity difflib's ratio approximates;
+            # WRatio would also accept bare prefixes like "b" -> "Bug".
+            match = process.extractOne(
                 issue_type_label.lower(),
-                [t.lower() for t in issue_types],
-                n=1,
-                cutoff=0.7,
+                _ISSUE_TYPES_LOWER,
+                scorer=fuzz.ratio,
+                score_cutoff=70,
             )
 
-            if matches:
-                # Find the original case version of the matched issue type
-                matched_lower = matches[0]
-                selected_issue_type = next(
-                    (t for t in issue_types if t.lower() == matched_lower), "Story"
-                )
+            if match:
+                # Map the matched index back to the original-case issue type
+                selected_issue_type = issue_types[match[2]]
                 logger.info(
-                    f"Found closest issue type: '{selected_issue_type}' for input '{issue_type_label}'"
+                    "Found closest issue type: '%s' for input '%s'",
+                    selected_issue_type,
+                    issue_type_label,
                 )
                 return selected_issue_type, ""
             else:
-                logger.info(f"No close match found for issue type '{issue_type_label}'")
-                available_types = "\n".join(
-                    [f"• {issue_type}" for issue_type in issue_types]
+                logger.info(
+                    "No close match found for issue type '%s'", issue_type_label
                 )
-                message = f"❌ No close match found for issue type '{issue_type_label}'\n\n📋 Available issue types:\n{available_types}"
+                message = f"❌ No close match found for issue type '{issue_type_label}'\n\n📋 Available issue types:\n{_AVAILABLE_ISSUE_TYPES}"
                 return "Story", message
 
         except Exception as e:
-            logger.error(f"Error in issue type selection for '{issue_type_label}': {e}")
-            available_types = "\n".join(
-                [f"• {issue_type}" for issue_type in issue_types]
+            logger.error(
+                "Error in issue type selection for '%s': %s", issue_type_label, e
             )
-            message = f"❌ Error processing issue type '{issue_type_label}'\n\n📋 Available issue types:\n{available_types}"
+            message = f"❌ Error processing issue type '{issue_type_label}'\n\n📋 Available issue types:\n{_AVAILABLE_ISSUE_TYPES}"
             return "Story", message
 
     @staticmethod
@@ -1,18 +1,85 @@
+import functools
+import hashlib
+import io
 import logging
 import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 
 from jira import JIRA
 from jira.exceptions import JIRAError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .config import Config
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on attachments uploaded at once by create_story
+MAX_PARALLEL_UPLOADS = 8
+
+# Bytes copied per read when saving a downloaded attachment
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Upper bound on attachments downloaded at once by download_attachments
+MAX_PARALLEL_DOWNLOADS = 8
+
+# Seconds a get_issue result is reused, and how many results are kept
+ISSUE_CACHE_TTL = 30
+ISSUE_CACHE_SIZE = 512
+
+# Shared JIRA clients kept at most, and seconds an unused one is kept
+MAX_CACHED_CLIENTS = 32
+CLIENT_IDLE_TTL = 3600
+
+# Upper bound, in seconds, on how long create_story waits out a Jira rate limit
+MAX_RATE_LIMIT_WAIT = 60
+
+# Fields get_issue reads. Requesting only these keeps Jira from loading and
+# serializing every (custom) field of the issue.
+ISSUE_FIELDS = (
+    "summary",
+    "description",
+    "status",
+    "issuetype",
+    "assignee",
+    "reporter",
+    "created",
+    "updated",
+)
+
 
 class JiraService:
     """Service class for Jira operations."""
 
+    # The caches below are keyed by a hash of the API token (_token_key), so
+    # they don't hold the token itself as a key.
+
+    # JIRA clients shared across services: token key -> (client, monotonic
+    # time of last use), least recently used first. A JiraService is built per
+    # command, so keeping the client keeps its pooled keep-alive connections
+    # instead of paying a TCP+TLS handshake on every command. Bounded by
+    # MAX_CACHED_CLIENTS and CLIENT_IDLE_TTL, and forget_token drops tokens
+    # that failed verification or were replaced.
+    _clients: "OrderedDict[str, tuple[JIRA, float]]" = OrderedDict()
+    _clients_lock = threading.Lock()
+
+    # (token key, issue key) -> (issue data, monotonic expiry time, whether
+    # attachments were fetched). Keyed by token because what an issue shows
+    # depends on the user's permissions. get_issue runs in to_thread workers,
+    # so every access holds _issue_cache_lock.
+    _issue_cache: dict[tuple[str, str], tuple[dict, float, bool]] = {}
+    _issue_cache_lock = threading.Lock()
+
+    # Token key -> monotonic time before which Jira asked (via a 429's
+    # Retry-After) not to be called. Jira rate-limits per user, so per token.
+    _rate_limited_until: dict[str, float] = {}
+
     def __init__(self, api_token: Optional[str] = None):
         """
         Initialize Jira service with configuration.
@@ -23,6 +90,7 @@ class JiraService:
         self.jira = None
         self.project_key = Config.JIRA_PROJECT_KEY
         self._api_token = api_token or Config.JIRA_API_TOKEN
+        self._token_key = self._token_key_for(self._api_token)
         self._connect()
 
     @classmethod
@@ -41,26 +109,150 @@ class JiraService:
     def _connect(self):
         """Establish connection to Jira using Bearer token authentication."""
         try:
-            # Create custom headers for Bearer token authentication
-            headers = {
-                "Authorization": f"Bearer {self._api_token}",
-                "Accept": "application/json",
-                "Content-Type": "application/json",
-            }
-
-            self.jira = JIRA(server=Config.JIRA_URL, options={"headers": headers})
+            self.jira = self._get_client(self._api_token)
             logger.info("Successfully connected to Jira with Bearer token")
         except JIRAError as e:
-            logger.error(f"Failed to connect to Jira: {e}")
+            logger.error("Failed to connect to Jira: %s", e)
             raise
 
+    @staticmethod
+    def _token_key_for(api_token: str) -> str:
+        """The key the class-level caches use for a token."""
+        return hashlib.sha256(api_token.encode()).hexdigest()
+
+    @classmethod
+    def _get_client(cls, api_token: str) -> JIRA:
+        """Return the shared JIRA client for a token, creating it on first use."""
+        token_key = cls._token_key_for(api_token)
+        now = time.monotonic()
+        evicted = []
+        with cls._clients_lock:
+            cached = cls._clients.pop(token_key, None)
+            if cached and cached[1] + CLIENT_IDLE_TTL > now:
+                client = cached[0]
+            else:
+                if cached:
+                    evicted.append(cached[0])
+                client = cls._build_client(api_token, token_key)
+            cls._clients[token_key] = (client, now)
+
+            # Drop clients unused for CLIENT_IDLE_TTL, then the least recently
+            # used ones beyond MAX_CACHED_CLIENTS
+            for key, (other, last_used) in list(cls._clients.items()):
+                if (
+                    last_used + CLIENT_IDLE_TTL > now
+                    and len(cls._clients) <= MAX_CACHED_CLIENTS
+                ):
+                    break
+                del cls._clients[key]
+                evicted.append(other)
+
+        for old in evicted:
+            cls._close_client(old)
+        return client
+
+    @classmethod
+    def _build_client(cls, api_token: str, token_key: str) -> JIRA:
+        """Create a JIRA client for a token with pooled connections."""
+        # Create custom headers for Bearer token authentication
+        headers = {
+            "Authorization": f"Bearer {api_token}",
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        }
+
+        # Skip the serverInfo request on construction; none of the calls
+        # used here depend on the server version. Note that the token is
+        # therefore not checked until the first request.
+        client = JIRA(
+            server=Config.JIRA_URL,
+            options={"headers": headers},
+            get_server_info=False,
+        )
+
+        # Pooled keep-alive connections so concurrent commands reuse
+        # them; the transport retries only cover gateway errors
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=64,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.2,
+                status_forcelist=[502, 503, 504],
+                raise_on_status=False,
+            ),
+        )
+        client._session.mount("https://", adapter)
+        client._session.mount("http://", adapter)
+        client._session.hooks["response"].append(
+            functools.partial(cls._note_rate_limit, token_key)
+        )
+        return client
+
+    @staticmethod
+    def _close_client(client: JIRA):
+        """Close a dropped client's pooled connections."""
+        try:
+            client.close()
+        except Exception as e:
+            logger.warning("Failed to close Jira client: %s", e)
+
+    @classmethod
+    def forget_token(cls, api_token: str):
+        """
+        Drop everything cached for a token.
+
+        For tokens that failed verification, were replaced by /register or
+        removed by /unregister, so neither they nor their connections linger.
+        """
+        token_key = cls._token_key_for(api_token)
+        with cls._clients_lock:
+            cached = cls._clients.pop(token_key, None)
+            cls._rate_limited_until.pop(token_key, None)
+        with cls._issue_cache_lock:
+            for cache_key in [k for k in cls._issue_cache if k[0] == token_key]:
+                del cls._issue_cache[cache_key]
+        if cached:
+            cls._close_client(cached[0])
+
+    @classmethod
+    def _note_rate_limit(cls, token_key: str, response, *args, **kwargs):
+        """
+        Session response hook: remember a 429's Retry-After for the token.
+
+        The jira library already retries the rate-limited request itself; this
+        lets the token's other requests wait instead of each running into the
+        limit and backing off on its own.
+        """
+        if response.status_code != 429:
+            return
+        try:
+            retry_after = int(response.headers.get("Retry-After", ""))
+        except ValueError:
+            return  # Missing, or an HTTP date
+        until = time.monotonic() + min(retry_after, MAX_RATE_LIMIT_WAIT)
+        with cls._clients_lock:
+            if until > cls._rate_limited_until.get(token_key, 0.0):
+                cls._rate_limited_until[token_key] = until
+        logger.warning("Jira rate limit hit, backing off for %ss", retry_after)
+
+    def _wait_for_rate_limit(self):
+        """Sleep until Jira's last Retry-After for this token has passed."""
+        until = self._rate_limited_until.get(self._token_key)
+        if until is None:
+            return
+        delay = until - time.monotonic()
+        if delay > 0:
+            logger.info("Waiting %.1fs for the Jira rate limit", delay)
+            time.sleep(delay)
+
     def create_story(
         self,
         summary: str,
         description: str = None,
         component_name: str = None,
         issue_type: str = "Story",
-        attachments: List[str] = None,
+        attachments: List[tuple[str, bytes]] = None,
         sprint_id: int = None,
         labels: List[str] = None,
         project_key: str = None,
@@ -75,7 +267,8 @@ class JiraService:
             description (str, optional): The issue description
             component_name (str, optional): The component name (defaults to Config.JIRA_COMPONENT_NAME)
             issue_type (str, optional): The issue type (defaults to "Story")
-            attachments (List[str], optional): List of file paths to attach to the issue
+            attachments (List[tuple[str, bytes]], optional): (filename, content) of
+                each file to attach to the issue
             sprint_id (int, optional): The sprint ID to add the issue to
             labels (List[str], optional): List of labels to add to the issue
             project_key (str, optional): The project key (defaults to Config.JIRA_PROJECT_KEY)
@@ -84,39 +277,19 @@ class JiraService:
             tuple: (issue_key, error_message) - issue_key is the created issue key (e.g., 'PROJ-123') or None if failed,
                    error_message contains user-friendly error message if creation failed
         """
-        try:
-            # Use provided project key or default to Config.JIRA_PROJECT_KEY
-            if not project_key:
-                project_key = Config.JIRA_PROJECT_KEY
-
-            # Get the project to verify it exists
-            project = self.jira.project(project_key)
-            logger.info(f"Found project: {project.name} (Key: {project_key})")
-
-            # Use provided component name or default to Config.JIRA_COMPONENT_NAME
-            target_component = component_name or Config.JIRA_COMPONENT_NAME
-
-            # Get the component ID for the target component
-            components = self.jira.project_components(project_key)
-            target_component_obj = None
-            for component in components:
-                if component.name == target_component:
-                    target_component_obj = component
-                    break
+        # Use provided project key or default to Config.JIRA_PROJECT_KEY
+        if not project_key:
+            project_key = Config.JIRA_PROJECT_KEY
 
-            if not target_component_obj:
-                # Get list of all available components for error message
-                available_components = [comp.name for comp in components]
-                error_msg = (
-                    f"❌ Component '{target_component}' not found in project {project_key}.\n\n"
-                    f"📋 Available components:\n" + 
-                    "\n".join([f"• {comp}" for comp in sorted(available_components)])
-                )
-                logger.error(
-                    f"Component '{target_component}' not found in project {project_key}. "
-                    f"Available components: {', '.join(available_components)}"
-                )
-                return None, error_msg
+        # Use provided component name or default to Config.JIRA_COMPONENT_NAME
+        target_component = component_name or Config.JIRA_COMPONENT_NAME
+
+        # Don't add to a burst Jira has already rate-limited
+        self._wait_for_rate_limit()
+
+        try:
+            # No project/component preflight: Jira validates both on create and
+            # answers 400 with per-field errors, handled below
 
             # Prepare issue data
             issue_dict = {
@@ -134,7 +307,7 @@ class JiraService:
 
             # Create the issue
             new_issue = self.jira.create_issue(fields=issue_dict)
-            logger.info(f"Created issue: {new_issue.key}")
+            logger.info("Created issue: %s", new_issue.key)
 
             # Assign the issue if an assignee was resolved. Done via assign_issue
             # (separate REST endpoint) rather than the create fields, so it works
@@ -143,10 +316,13 @@ class JiraService:
             if assignee:
                 try:
                     self.jira.assign_issue(new_issue.key, assignee)
-                    logger.info(f"Assigned issue {new_issue.key} to {assignee}")
+                    logger.info("Assigned issue %s to %s", new_issue.key, assignee)
                 except Exception as e:
                     logger.error(
-                        f"Failed to assign issue {new_issue.key} to {assignee}: {e}"
+                        "Failed to assign issue %s to %s: %s",
+                        new_issue.key,
+                        assignee,
+                        e,
                     )
 
             # Link the issue to an epic if provided. Best-effort (separate Agile
@@ -154,85 +330,124 @@ class JiraService:
             if epic_key:
                 try:
                     self.jira.add_issues_to_epic(epic_key, [new_issue.key])
-                    logger.info(f"Added issue {new_issue.key} to epic {epic_key}")
+                    logger.info("Added issue %s to epic %s", new_issue.key, epic_key)
                 except Exception as e:
                     logger.error(
-                        f"Failed to add issue {new_issue.key} to epic {epic_key}: {e}"
+                        "Failed to add issue %s to epic %s: %s",
+                        new_issue.key,
+                        epic_key,
+                        e,
                     )
 
             # Add issue to sprint if sprint_id provided
             if sprint_id:
                 try:
                     self.jira.add_issues_to_sprint(sprint_id, [new_issue.key])
-                    logger.info(f"Added issue {new_issue.key} to sprint {sprint_id}")
+                    logger.info("Added issue %s to sprint %s", new_issue.key, sprint_id)
                 except Exception as e:
-                    logger.error(f"Failed to add issue to sprint {sprint_id}: {e}")
+                    logger.error("Failed to add issue to sprint %s: %s", sprint_id, e)
                     # Don't fail the whole operation if sprint assignment fails
 
-            # Add attachments if provided
+            # Add attachments if provided. Uploads are independent, so they
+            # run in parallel; a failed upload doesn't stop the others.
             if attachments:
-                try:
-                    for attachment_path in attachments:
-                        if os.path.exists(attachment_path):
-                            with open(attachment_path, "rb") as f:
-                                self.jira.add_attachment(issue=new_issue, attachment=f)
-                            logger.info(f"Added attachment: {attachment_path}")
-                            # Clean up temporary file
-                            os.unlink(attachment_path)
-                        else:
-                            logger.warning(
-                                f"Attachment file not found: {attachment_path}"
-                            )
-                except Exception as e:
-                    logger.error(
-                        f"Failed to add attachments to issue {new_issue.key}: {e}"
-                    )
+                with ThreadPoolExecutor(
+                    max_workers=min(MAX_PARALLEL_UPLOADS, len(attachments))
+                ) as executor:
+                    for filename, content in attachments:
+                        executor.submit(
+                            self._upload_attachment, new_issue, filename, content
+                        )
 
             return new_issue.key, None
 
         except JIRAError as e:
+            if e.status_code == 400:
+                field_errors = self._field_errors(e)
+                if "components" in field_errors:
+                    return None, self._component_not_found_message(
+                        target_component, project_key
+                    )
+                if "project" in field_errors:
+                    logger.error("Project %s not found: %s", project_key, e)
+                    return None, f"❌ Project '{project_key}' not found in Jira."
             error_msg = f"❌ Failed to create Jira issue: {str(e)}"
-            logger.error(f"Failed to create Jira story: {e}")
+            logger.error("Failed to create Jira story: %s", e)
             return None, error_msg
         except Exception as e:
             error_msg = f"❌ Unexpected error creating Jira issue: {str(e)}"
-            logger.error(f"Unexpected error creating Jira story: {e}")
+            logger.error("Unexpected error creating Jira story: %s", e)
             return None, error_msg
 
-    def add_attachment(self, issue_key: str, attachment_path: str) -> bool:
+    def _upload_attachment(self, issue, filename: str, content: bytes):
+        """Attach one in-memory file to an issue; errors are logged."""
+        try:
+            self.jira.add_attachment(
+                issue=issue, attachment=io.BytesIO(content), filename=filename
+            )
+            logger.info("Added attachment: %s", filename)
+        except Exception as e:
+            logger.error(
+                "Failed to add attachment %s to issue %s: %s",
+                filename,
+                issue.key,
+                e,
+            )
+
+    @staticmethod
+    def _field_errors(error: JIRAError) -> dict:
+        """Per-field errors ({"components": "..."}) from a Jira 400 response."""
+        try:
+            return error.response.json().get("errors") or {}
+        except Exception:
+            return {}
+
+    def _component_not_found_message(self, component: str, project_key: str) -> str:
+        """User-facing message listing the project's components."""
+        logger.error("Component '%s' not found in project %s", component, project_key)
+        message = f"❌ Component '{component}' not found in project {project_key}."
+        try:
+            # Only fetched on this error path
+            names = sorted(c.name for c in self.jira.project_components(project_key))
+        except Exception as e:
+            logger.error(
+                "Failed to fetch components for project %s: %s", project_key, e
+            )
+            return message
+        return (
+            message
+            + "\n\n📋 Available components:\n"
+            + "\n".join(f"• {name}" for name in names)
+        )
+
+    def add_attachment(self, issue_key: str, filename: str, content: bytes) -> bool:
         """
         Add an attachment to an existing Jira issue.
 
         Args:
             issue_key (str): The issue key (e.g., 'PROJ-123')
-            attachment_path (str): Path to the file to attach
+            filename (str): Name the attachment gets in Jira
+            content (bytes): The file's contents
 
         Returns:
             bool: True if successful, False otherwise
         """
         try:
-            if not os.path.exists(attachment_path):
-                logger.warning(f"Attachment file not found: {attachment_path}")
-                return False
-
             # Get the issue
             issue = self.jira.issue(issue_key)
 
             # Add the attachment
-            with open(attachment_path, "rb") as f:
-                self.jira.add_attachment(issue=issue, attachment=f)
-            logger.info(f"Added attachment to {issue_key}: {attachment_path}")
-
-            # Clean up temporary file
-            try:
-                os.unlink(attachment_path)
-            except Exception as e:
-                logger.warning(f"Failed to clean up temp file {attachment_path}: {e}")
-
+            self.jira.add_attachment(
+                issue=issue, attachment=io.BytesIO(content), filename=filename
+            )
+            logger.info("Added attachment to %s: %s", issue_key, filename)
+            # The cached issue's attachment list is now stale
+            with self._issue_cache_lock:
+                self._issue_cache.pop((self._token_key, issue_key), None)
             return True
 
         except Exception as e:
-            logger.error(f"Failed to add attachment to issue {issue_key}: {e}")
+            logger.error("Failed to add attachment to issue %s: %s", issue_key, e)
             return False
 
     def link_issues(
@@ -262,21 +477,27 @@ class JiraService:
                 inwardIssue=inward_issue,
                 outwardIssue=outward_issue,
             )
-            logger.info(f"Created link: {inward_issue} {link_type} {outward_issue}")
+            logger.info(
+                "Created link: %s %s %s", inward_issue, link_type, outward_issue
+            )
             return True
 
         except Exception as e:
             logger.error(
-                f"Failed to link issues {inward_issue} -> {outward_issue}: {e}"
+                "Failed to link issues %s -> %s: %s", inward_issue, outward_issue, e
             )
             return False
 
-    def get_issue(self, issue_key: str) -> Optional[dict]:
+    def get_issue(
+        self, issue_key: str, with_attachments: bool = True
+    ) -> Optional[dict]:
         """
         Get details of a Jira issue.
 
         Args:
             issue_key (str): The issue key (e.g., 'PROJ-123' or just '123' for default project)
+            with_attachments (bool): Also fetch attachment metadata (otherwise
+                "attachments" is an empty list)
 
         Returns:
             dict: Issue details including summary, description, status, attachments, etc.
@@ -287,8 +508,21 @@ class JiraService:
             if issue_key.isdigit():
                 issue_key = f"{self.project_key}-{issue_key}"
 
-            # Get the issue
-            issue = self.jira.issue(issue_key, expand="attachment")
+            # Repeat lookups of the same issue within ISSUE_CACHE_TTL (e.g. a
+            # follow-up command) skip the request
+            cache_key = (self._token_key, issue_key)
+            with self._issue_cache_lock:
+                cached = self._issue_cache.get(cache_key)
+            if cached and cached[1] > time.monotonic():
+                # An entry fetched with attachments serves both kinds of call
+                if cached[2] or not with_attachments:
+                    return cached[0]
+
+            # Get the issue, only the fields used below
+            fields = (
+                (ISSUE_FIELDS + ("attachment",)) if with_attachments else ISSUE_FIELDS
+            )
+            issue = self.jira.issue(issue_key, fields=",".join(fields))
 
             # Extract relevant information
             issue_data = {
@@ -309,33 +543,36 @@ class JiraService:
             }
 
             # Get attachments if any
-            if hasattr(issue.fields, "attachment"):
-                for attachment in issue.fields.attachment:
-                    issue_data["attachments"].append(
-                        {
-                            "id": attachment.id,
-                            "filename": attachment.filename,
-                            "size": attachment.size,
-                            "mimeType": attachment.mimeType,
-                            "content_url": attachment.content,
-                        }
-                    )
+            if with_attachments and hasattr(issue.fields, "attachment"):
+                issue_data["attachments"] = [
+                    {
+                        "id": attachment.id,
+                        "filename": attachment.filename,
+                        "size": attachment.size,
+                        "mimeType": attachment.mimeType,
+                        "content_url": attachment.content,
+                    }
+                    for attachment in issue.fields.attachment
+                ]
 
             logger.info(
-                f"Retrieved issue {issue_key} with {len(issue_data['attachments'])} attachments"
+                "Retrieved issue %s with %s attachments",
+                issue_key,
+                len(issue_data["attachments"]),
             )
+            self._cache_issue(cache_key, issue_data, with_attachments)
             return issue_data
 
         except JIRAError as e:
             if e.status_code == 404:
-                logger.warning(f"Issue {issue_key} not found")
+                logger.warning("Issue %s not found", issue_key)
             elif e.status_code == 403:
-                logger.warning(f"Permission denied for issue {issue_key}")
+                logger.warning("Permission denied for issue %s", issue_key)
             else:
-                logger.error(f"Failed to get issue {issue_key}: {e}")
+                logger.error("Failed to get issue %s: %s", issue_key, e)
             return None
         except Exception as e:
-            logger.error(f"Unexpected error getting issue {issue_key}: {e}")
+            logger.error("Unexpected error getting issue %s: %s", issue_key, e)
             return None
 
     @staticmethod
@@ -402,7 +639,7 @@ class JiraService:
         else:
             jql = f"{text_clause} ORDER BY updated DESC"
 
-        logger.info(f"Searching issues with JQL: {jql}")
+        logger.info("Searching issues with JQL: %s", jql)
 
         try:
             issues = self.jira.search_issues(
@@ -421,17 +658,17 @@ class JiraService:
                 for issue in issues
             ]
 
-            logger.info(f"Search returned {len(results)} issues for query '{query}'")
+            logger.info("Search returned %s issues for query '%s'", len(results), query)
             return results, None
 
         except JIRAError as e:
-            logger.error(f"Failed to search issues for '{query}': {e}")
+            logger.error("Failed to search issues for '%s': %s", query, e)
             return None, (
                 f"❌ Не удалось выполнить поиск по запросу '{query}'.\n"
                 "Попробуйте изменить формулировку (уберите спецсимволы)."
             )
         except Exception as e:
-            logger.error(f"Unexpected error searching issues for '{query}': {e}")
+            logger.error("Unexpected error searching issues for '%s': %s", query, e)
             return None, "❌ Произошла ошибка при поиске. Попробуйте позже."
 
     def download_attachment(
@@ -448,34 +685,83 @@ class JiraService:
             str: Path to the downloaded file, or None if failed
         """
         try:
-            import tempfile
-
-            import requests
-
-            # Create custom headers for Bearer token authentication
-            headers = {
-                "Authorization": f"Bearer {self._api_token}",
-            }
-
-            # Download the attachment
-            response = requests.get(attachment_url, headers=headers, stream=True)
+            # Download through the Jira client's session: it already sends the
+            # Bearer token and keeps pooled keep-alive connections to Jira
+            # Override the client's JSON Accept header for binary content, as
+            # the jira library's Attachment.get() does; some servers and
+            # proxies answer it with 406 or an error page
+            response = self.jira._session.get(
+                attachment_url, stream=True, headers={"Accept": "*/*"}
+            )
             response.raise_for_status()
 
             # Save to temporary file
             with tempfile.NamedTemporaryFile(
                 delete=False, suffix=f"_{attachment_filename}"
             ) as temp_file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    temp_file.write(chunk)
+                # Reserve the file's blocks up front when the size is known, so
+                # the filesystem doesn't extend it on every write
+                size = int(response.headers.get("Content-Length") or 0)
+                if size and hasattr(os, "posix_fallocate"):
+                    try:
+                        os.posix_fallocate(temp_file.fileno(), 0, size)
+                    except OSError:
+                        pass  # Filesystem without fallocate support
+
+                # Let the C-level copy move the body in large blocks; raw must
+                # undo any gzip/deflate transfer encoding itself
+                response.raw.decode_content = True
+                shutil.copyfileobj(response.raw, temp_file, DOWNLOAD_CHUNK_SIZE)
+                # Content-Length counts encoded bytes; drop any unused reservation
+                temp_file.truncate()
                 temp_path = temp_file.name
 
-            logger.info(f"Downloaded attachment to {temp_path}")
+            logger.info("Downloaded attachment to %s", temp_path)
             return temp_path
 
         except Exception as e:
-            logger.error(f"Failed to download attachment {attachment_filename}: {e}")
+            logger.error("Failed to download attachment %s: %s", attachment_filename, e)
             return None
 
+    @classmethod
+    def _cache_issue(
+        cls, cache_key: tuple[str, str], issue_data: dict, with_attachments: bool
+    ):
+        """Store a get_issue result, evicting the oldest entry when full."""
+        with cls._issue_cache_lock:
+            cls._issue_cache.pop(cache_key, None)
+            if len(cls._issue_cache) >= ISSUE_CACHE_SIZE:
+                cls._issue_cache.pop(next(iter(cls._issue_cache)), None)
+            cls._issue_cache[cache_key] = (
+                issue_data,
+                time.monotonic() + ISSUE_CACHE_TTL,
+                with_attachments,
+            )
+
+    def download_attachments(self, attachments: List[dict]) -> List[Optional[str]]:
+        """
+        Download several Jira attachments to temporary files in parallel.
+
+        Args:
+            attachments (List[dict]): Attachments as returned in get_issue()["attachments"]
+
+        Returns:
+            List[Optional[str]]: Paths in the same order as attachments, None where
+                                 a download failed
+        """
+        if not attachments:
+            return []
+
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_PARALLEL_DOWNLOADS, len(attachments))
+        ) as executor:
+            return list(
+                executor.map(
+                    lambda a: self.download_attachment(a["content_url"], a["filename"]),
+                    attachments,
+                )
+            )
+
     def get_issue_url(self, issue_key: str) -> str:
         """Get the full URL for a Jira issue."""
         return f"{Config.JIRA_URL}/browse/{issue_key}"
@@ -497,12 +783,12 @@ class JiraService:
                 issue_key = f"{self.project_key}-{issue_key}"
 
             self.jira.add_comment(issue_key, comment)
-            logger.info(f"Added comment to issue {issue_key}")
+            logger.info("Added comment to issue %s", issue_key)
             return True
 
         except JIRAError as e:
-            logger.error(f"Failed to add comment to issue {issue_key}: {e}")
+            logger.error("Failed to add comment to issue %s: %s", issue_key, e)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error adding comment to {issue_key}: {e}")
+            logger.error("Unexpected error adding comment to %s: %s", issue_key, e)
             return False
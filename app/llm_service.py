@@ -44,10 +44,12 @@ class LLMService:
                 http_client=http_client,
             )
             logger.info(
-                f"LLM service initialized (model={self._model}, timeout={self._timeout}s)"
+                "LLM service initialized (model=%s, timeout=%ss)",
+                self._model,
+                self._timeout,
             )
         except Exception as e:
-            logger.error(f"Failed to initialize LLM service: {e}")
+            logger.error("Failed to initialize LLM service: %s", e)
             self._client = None
 
     def is_configured(self) -> bool:
@@ -102,14 +104,16 @@ class LLMService:
             # Model may wrap the answer; take the last whitespace-delimited token.
             answer = content.split()[-1] if content else ""
             if answer in valid_values:
-                logger.info(f"LLM picked {kind} '{answer}' for query '{query}'")
+                logger.info("LLM picked %s '%s' for query '%s'", kind, answer, query)
                 return answer
             logger.info(
-                f"LLM returned no usable match for query '{query}' (raw: '{content}')"
+                "LLM returned no usable match for query '%s' (raw: '%s')",
+                query,
+                content,
             )
             return None
         except Exception as e:
-            logger.warning(f"LLM {kind} lookup failed for '{query}': {e}")
+            logger.warning("LLM %s lookup failed for '%s': %s", kind, query, e)
             return None
 
     def pick_username(self, query: str, candidates: List[dict]) -> Optional[str]:
@@ -1,15 +1,58 @@
+import functools
 import logging
-from difflib import SequenceMatcher
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Tuple
 
 from jira import JIRA
 from jira.exceptions import JIRAError
-from transliterate import translit
+from rapidfuzz import fuzz
 
 from .config import Config
 
 logger = logging.getLogger(__name__)
 
+# Seconds a project's board ID and a board's active+future sprints are reused
+BOARD_CACHE_TTL = 3600
+SPRINT_CACHE_TTL = 60
+
+# Module-level because a SprintService is built per command.
+# project key -> (board ID, monotonic expiry time)
+_board_cache: dict[str, tuple[int, float]] = {}
+# board ID -> (sprints, monotonic expiry time)
+_sprint_cache: dict[int, tuple[List[dict], float]] = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _ru_translit():
+    """
+    The Russian language pack's translit function, built once.
+
+    transliterate.translit() looks the pack up in the registry and builds a
+    new pack instance (with its mapping tables) on every call.
+    """
+    # Imported lazily: only needed once a query is actually scored
+    from transliterate import get_translit_function
+
+    return get_translit_function("ru")
+
+
+@functools.lru_cache(maxsize=1024)
+def _normalize(text: str) -> tuple[str, str, tuple[str, ...], tuple[str, ...]]:
+    """
+    Lowercased text, its Russian -> Latin transliteration, and the words of each.
+
+    Memoized: sprint names are stable and the query is the same for every
+    sprint scored in one find_sprint call, so each string is transliterated
+    and split once.
+    """
+    lower = text.lower()
+    try:
+        latin = _ru_translit()(lower, reversed=True)
+    except Exception:
+        latin = lower  # If transliteration fails, use original
+    return lower, latin, tuple(lower.split()), tuple(latin.split())
+
 
 class SprintService:
     """Service for sprint matching and operations."""
@@ -32,50 +75,104 @@ class SprintService:
             List of sprint dictionaries with id, name, and state
         """
         try:
-            # Get the board ID for the project
-            boards = self.jira.boards(projectKeyOrID=self.project_key)
-            if not boards:
-                logger.warning(f"No boards found for project {self.project_key}")
+            board_id = self._get_board_id()
+            if board_id is None:
                 return []
 
-            board_id = boards[0].id
-            logger.info(f"Using board ID: {board_id}")
+            cached = _sprint_cache.get(board_id)
+            if cached and cached[1] > time.monotonic():
+                return list(cached[0])
 
-            # Get all sprints (active, future, and closed)
-            all_sprints = []
-
-            # Get active sprints
+            # Get active and future sprints in one request (the Agile API takes
+            # a comma-separated state list), all pages of it
             try:
-                active_sprints = self.jira.sprints(board_id, state="active")
-                all_sprints.extend(
-                    [
-                        {"id": s.id, "name": s.name, "state": s.state}
-                        for s in active_sprints
-                    ]
+                sprints = self.jira.sprints(
+                    board_id, maxResults=False, state="active,future"
                 )
-            except Exception as e:
-                logger.warning(f"Failed to get active sprints: {e}")
-
-            # Get future sprints
-            try:
-                future_sprints = self.jira.sprints(board_id, state="future")
-                all_sprints.extend(
-                    [
-                        {"id": s.id, "name": s.name, "state": s.state}
-                        for s in future_sprints
-                    ]
+                # Active first, as when the states were fetched separately
+                all_sprints = sorted(
+                    ({"id": s.id, "name": s.name, "state": s.state} for s in sprints),
+                    key=lambda s: s["state"] != "active",
                 )
+                complete = True
             except Exception as e:
-                logger.warning(f"Failed to get future sprints: {e}")
-
-            logger.info(f"Found {len(all_sprints)} sprints")
-            return all_sprints
+                logger.warning("Failed to get active and future sprints: %s", e)
+                all_sprints, complete = self._get_sprints_by_state(board_id)
+
+            logger.info("Found %s sprints", len(all_sprints))
+            # Don't cache a partial list
+            if complete:
+                _sprint_cache[board_id] = (
+                    all_sprints,
+                    time.monotonic() + SPRINT_CACHE_TTL,
+                )
+            return list(all_sprints)
 
         except Exception as e:
-            logger.error(f"Failed to get sprints: {e}")
+            logger.error("Failed to get sprints: %s", e)
             return []
 
-    def _calculate_similarity(self, sprint_name: str, query: str) -> float:
+    def _get_sprints_by_state(self, board_id: int) -> tuple[List[dict], bool]:
+        """
+        Fetch active and future sprints with one request per state.
+
+        Fallback for when the combined request fails, so one state can still
+        be returned if the other errors. The two requests are independent and
+        run side by side; results keep active-then-future order.
+
+        Returns:
+            (sprints, complete) - complete is False if any state failed
+        """
+        all_sprints = []
+        complete = True
+
+        states = ("active", "future")
+        with ThreadPoolExecutor(max_workers=len(states)) as executor:
+            futures = [
+                executor.submit(self.jira.sprints, board_id, state=state)
+                for state in states
+            ]
+
+        for state, future in zip(states, futures):
+            try:
+                all_sprints.extend(
+                    {"id": s.id, "name": s.name, "state": s.state}
+                    for s in future.result()
+                )
+            except Exception as e:
+                complete = False
+                self._forget_board_if_missing(e)
+                logger.warning("Failed to get %s sprints: %s", state, e)
+
+        return all_sprints, complete
+
+    def _get_board_id(self) -> Optional[int]:
+        """Get the project's board ID, reusing it for BOARD_CACHE_TTL seconds."""
+        cached = _board_cache.get(self.project_key)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
+        boards = self.jira.boards(projectKeyOrID=self.project_key)
+        if not boards:
+            logger.warning("No boards found for project %s", self.project_key)
+            return None
+
+        board_id = boards[0].id
+        logger.info("Using board ID: %s", board_id)
+        _board_cache[self.project_key] = (board_id, time.monotonic() + BOARD_CACHE_TTL)
+        return board_id
+
+    def _forget_board_if_missing(self, error: Exception):
+        """Drop cached board and sprints when Jira says the board is gone."""
+        if isinstance(error, JIRAError) and error.status_code == 404:
+            cached = _board_cache.pop(self.project_key, None)
+            if cached:
+                _sprint_cache.pop(cached[0], None)
+
+    @staticmethod
+    def _calculate_similarity(
+        sprint_name: str, query: str, score_cutoff: float = 0.0
+    ) -> float:
         """
         Calculate similarity between sprint name and query.
         Uses transliteration and fuzzy matching.
@@ -83,40 +180,22 @@ class SprintService:
         Args:
             sprint_name: Name of the sprint
             query: User's search query
+            score_cutoff: Ratio scores below this count as 0.0, which lets
+                rapidfuzz reject hopeless pairs (e.g. by length) without
+                running the full comparison
 
         Returns:
             Similarity score (0.0 to 1.0)
         """
-        # Normalize both strings
-        sprint_lower = sprint_name.lower()
-        query_lower = query.lower()
-
-        # Also create transliterated versions
-        try:
-            sprint_latin = translit(sprint_lower, "ru", reversed=True)
-        except:
-            sprint_latin = sprint_lower  # If transliteration fails, use original
-
-        try:
-            query_latin = translit(query_lower, "ru", reversed=True)
-        except:
-            query_latin = query_lower  # If transliteration fails, use original
+        # Normalize both strings, with transliterated versions (memoized)
+        sprint_lower, sprint_latin, _, _ = _normalize(sprint_name)
+        query_lower, query_latin, query_words, query_latin_words = _normalize(query)
 
         # Calculate multiple similarity scores
         scores = []
 
-        # Direct comparison
-        direct_score = SequenceMatcher(None, sprint_lower, query_lower).ratio()
-        scores.append(direct_score)
-
-        # Transliterated comparison
-        latin_score = SequenceMatcher(None, sprint_latin, query_latin).ratio()
-        scores.append(latin_score)
-
-        # Check if ALL query words are contained in sprint name (word matching)
-        query_words = query_lower.split()
-        query_latin_words = query_latin.split()
-
+        # Check if ALL query words are contained in sprint name (word matching).
+        # Done first because it is cheap and is the common hit.
         # Count how many words match
         matches_lower = sum(1 for word in query_words if word in sprint_lower)
         matches_latin = sum(1 for word in query_latin_words if word in sprint_latin)
@@ -124,8 +203,22 @@ class SprintService:
         # Calculate word match ratio (all words must match for high score)
         if query_words:
             word_match_score = max(matches_lower, matches_latin) / len(query_words)
+            if word_match_score == 1.0:
+                # Already the top score; the ratios below can't change it
+                return 1.0
             scores.append(word_match_score)
 
+        # Direct comparison
+        cutoff = score_cutoff * 100
+        direct_score = (
+            fuzz.ratio(sprint_lower, query_lower, score_cutoff=cutoff) / 100.0
+        )
+        scores.append(direct_score)
+
+        # Transliterated comparison
+        latin_score = fuzz.ratio(sprint_latin, query_latin, score_cutoff=cutoff) / 100.0
+        scores.append(latin_score)
+
         # Return the maximum score
         return max(scores) if scores else 0.0
 
@@ -161,7 +254,7 @@ class SprintService:
 
             sprint = active_sprints[0]
             logger.info(
-                f"Selected active sprint: {sprint['name']} (ID: {sprint['id']})"
+                "Selected active sprint: %s (ID: %s)", sprint["name"], sprint["id"]
             )
             return sprint["id"], None
 
@@ -171,18 +264,24 @@ class SprintService:
         if not sprints:
             return None, "❌ No sprints found in the project."
 
+        # Only matches scoring at least this are considered
+        threshold = 0.4
+
         # Calculate similarity for each sprint
         sprint_scores = []
         for sprint in sprints:
-            similarity = self._calculate_similarity(sprint["name"], sprint_query)
+            similarity = self._calculate_similarity(
+                sprint["name"], sprint_query, score_cutoff=threshold
+            )
             sprint_scores.append((sprint, similarity))
-            logger.info(f"Sprint '{sprint['name']}' similarity score: {similarity:.2f}")
+            logger.info(
+                "Sprint '%s' similarity score: %.2f", sprint["name"], similarity
+            )
 
         # Sort by similarity (highest first)
         sprint_scores.sort(key=lambda x: x[1], reverse=True)
 
-        # Get the best matches (similarity > 0.4)
-        threshold = 0.4
+        # Get the best matches (similarity >= threshold)
         best_matches = [(s, score) for s, score in sprint_scores if score >= threshold]
 
         if not best_matches:
@@ -210,7 +309,9 @@ class SprintService:
         # We have a clear winner
         best_sprint = best_matches[0][0]
         logger.info(
-            f"Found best match: {best_sprint['name']} (score: {best_matches[0][1]:.2f})"
+            "Found best match: %s (score: %.2f)",
+            best_sprint["name"],
+            best_matches[0][1],
         )
         return best_sprint["id"], None
 
@@ -228,12 +329,14 @@ class SprintService:
         try:
             # Add the issue to the sprint
             self.jira.add_issues_to_sprint(sprint_id, [issue_key])
-            logger.info(f"Added issue {issue_key} to sprint {sprint_id}")
+            logger.info("Added issue %s to sprint %s", issue_key, sprint_id)
             return True
 
         except JIRAError as e:
-            logger.error(f"Failed to add issue {issue_key} to sprint {sprint_id}: {e}")
+            logger.error(
+                "Failed to add issue %s to sprint %s: %s", issue_key, sprint_id, e
+            )
             return False
         except Exception as e:
-            logger.error(f"Unexpected error adding issue to sprint: {e}")
+            logger.error("Unexpected error adding issue to sprint: %s", e)
             return False
@@ -3,12 +3,13 @@ import functools
 import html
 import logging
 import os
+import re
 import signal
-import tempfile
 from typing import List
 
 import backoff  # type: ignore[import-untyped]
 from telegram import Update
+from telegram.constants import ChatAction
 from telegram.error import NetworkError
 from telegram.ext import (
     Application,
@@ -28,10 +29,166 @@ from .issue_type_service import IssueTypeService
 from .jira_service import JiraService
 from .llm_service import LLMService
 from .sprint_service import SprintService
+from .update_processor import ChatOrderedUpdateProcessor
 from .users import UserConfig
 
 logger = logging.getLogger(__name__)
 
+# Keywords accepted by _parse_task_parameters
+_PARAM_KEYWORDS = (
+    "type:|component:|sprint:|desc:|description:|link:|project:|assignee:|who:|epic:"
+)
+# Alias keywords (without the colon) -> the parameter they set
+_PARAM_ALIASES = {"desc": "description", "who": "assignee"}
+# A parameter keyword at the start of a word. Keywords are only located with
+# this; values are sliced out between them. (A single lazy-value regex with a
+# lookahead for the next keyword re-scanned whitespace runs at every position,
+# quadratic in their length.)
+_PARAM_RE = re.compile(rf"\b({_PARAM_KEYWORDS})")
+# re's case-insensitive matching is several times slower than matching
+# lowercased text, so _split_params only needs this variant as a fallback
+_PARAM_RE_IGNORECASE = re.compile(rf"\b({_PARAM_KEYWORDS})", re.IGNORECASE)
+
+
+def _split_params(text: str) -> tuple[str, list[tuple[str, str]]]:
+    """
+    Split a task description into its summary and its parameters.
+
+    Each keyword's value runs up to the next keyword (or the end of the text);
+    the summary is whatever precedes the first keyword. Keywords with a blank
+    value are ignored.
+
+    Returns:
+        (summary, [(keyword without its colon, lowercased; value), ...]) with
+        the summary and values stripped, in order of appearance
+    """
+    if ":" not in text:
+        # Every keyword ends in a colon
+        return text.strip(), []
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        anchors = list(_PARAM_RE.finditer(lowered))
+    else:
+        # Some character lowercased to several (e.g. "İ"), so the copy's
+        # offsets wouldn't line up with text
+        anchors = list(_PARAM_RE_IGNORECASE.finditer(text))
+    if not anchors:
+        return text.strip(), []
+
+    params = []
+    ends = [m.start() for m in anchors[1:]] + [len(text)]
+    for anchor, end in zip(anchors, ends):
+        value = text[anchor.end() : end].strip()
+        if value:
+            params.append((anchor.group(1).lower().rstrip(":"), value))
+    return text[: anchors[0].start()].strip(), params
+
+
+# Whitespace runs collapsed to one space in summaries (one pass, rather than
+# building a list of words with split() only to join it again)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Jira rejects summaries longer than this. It counts Java string length,
+# i.e. UTF-16 code units, so characters outside the BMP (emoji) count twice.
+_SUMMARY_MAX = 255
+_SUMMARY_ELLIPSIS = "..."
+_SUMMARY_BODY_MAX = _SUMMARY_MAX - len(_SUMMARY_ELLIPSIS)
+
+
+def _truncate_summary(summary: str) -> str:
+    """Cut a summary to Jira's length limit, marking the cut with an ellipsis."""
+    # Every character is one or two UTF-16 units, so short summaries need no
+    # encoding to know they fit
+    if len(summary) * 2 <= _SUMMARY_MAX:
+        return summary
+    encoded = summary.encode("utf-16-le")
+    if len(encoded) <= _SUMMARY_MAX * 2:
+        return summary
+    logger.warning(
+        "Summary too long (%s chars), truncating to %s chars",
+        len(summary),
+        _SUMMARY_MAX,
+    )
+    # "ignore" drops an emoji whose surrogate pair the cut split in half
+    body = encoded[: _SUMMARY_BODY_MAX * 2].decode("utf-16-le", "ignore")
+    return body + _SUMMARY_ELLIPSIS
+
+
+# Characters replaced with "_" in labels built from chat titles and names
+_LABEL_TRANSLATION = str.maketrans({" ": "_", "-": "_"})
+
+
+def _clean_label(text: str) -> str:
+    """Make a chat title or name usable in a Jira label."""
+    return text.translate(_LABEL_TRANSLATION)
+
+
+# Issue type set by each shortcut command
+_COMMAND_ISSUE_TYPES = {"/bug": "Bug", "/story": "Story"}
+
+# A type: parameter, dropped from /bug and /story descriptions since those
+# commands set the type themselves
+_TYPE_PARAM_RE = re.compile(r"\btype:\s*\w+", re.IGNORECASE)
+
+# A bare issue number ("123"), expanded to a key in the default project.
+# ASCII only: str.isdigit() also accepts digits like "۱" or "²", which would
+# make a malformed key.
+_ISSUE_NUMBER_RE = re.compile(r"[0-9]+")
+
+# Parameters of /register, /link and /unlink, and /search's project: filter
+_TOKEN_PARAM_RE = re.compile(r"token:\s*(\S+)", re.IGNORECASE)
+_MESSAGE_REF_RE = re.compile(r"message_ref:\s*([a-fA-F0-9\-]+)", re.IGNORECASE)
+_JIRA_PARAM_RE = re.compile(r"jira:\s*([A-Z]+-\d+|\d+)", re.IGNORECASE)
+_SEARCH_PROJECT_RE = re.compile(r"project:\s*(\S+)", re.IGNORECASE)
+# A message_ref must be a UUID
+_UUID_RE = re.compile(
+    r"^[a-fA-F0-9]{8}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{12}$"
+)
+
+
+def _read_file(path: str) -> bytes:
+    """A file's contents; run via asyncio.to_thread to keep disk reads off the loop."""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _remove_files(paths: List[str]):
+    """Delete temp files, ignoring ones already gone."""
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+# Photo caption commands that create a task
+_CAPTION_COMMANDS = ("/task", "/bug", "/story")
+
+# Seconds without a new photo after which a media group is considered complete
+_MEDIA_GROUP_WAIT = 1.5
+
+
+def _parse_caption_command(caption: str) -> tuple[str, str | None] | None:
+    """
+    Task description and forced issue type from a photo caption.
+
+    Returns None if the caption doesn't start with /task, /bug or /story.
+    """
+    if not caption.startswith(_CAPTION_COMMANDS):
+        return None
+    # Command word, then the rest as typed (like /bug and /story text), so a
+    # multi-line desc: keeps its line breaks
+    parts = caption.split(maxsplit=1)
+    command = parts[0]
+    logger.debug("DEBUG: Found %s command in caption", command)
+    task_description = parts[1].strip() if len(parts) > 1 else ""
+
+    # /bug and /story set the type; drop any type: parameter
+    forced_issue_type = _COMMAND_ISSUE_TYPES.get(command)
+    if forced_issue_type:
+        task_description = _TYPE_PARAM_RE.sub("", task_description).strip()
+    return task_description, forced_issue_type
+
 
 class TelegramBot:
     """Telegram bot for creating Jira stories."""
@@ -43,6 +200,116 @@ class TelegramBot:
         "и вызовите команду /register для регистрации вашего Jira токена."
     )
 
+    # Replies to /task, /bug and /story without a description
+    TASK_USAGE_MSG = (
+        "❌ Please provide a task description.\n\n"
+        "📝 Usage examples:\n"
+        "• `/task Fix login bug`\n"
+        "• `/task Add new feature component: авиа-параметры`\n"
+        "• `/task Fix critical bug type: Bug`\n"
+        "• `/task desc: Implement user authentication system`\n"
+        "• `/task Update database component: devops type: Bug`\n\n"
+        "💡 Available issue types: Story, Bug\n"
+        "💡 Components are matched using transliteration and fuzzy matching\n"
+        "💡 Use `/help` for more detailed information"
+    )
+    BUG_USAGE_MSG = (
+        "❌ Please provide a bug description.\n\n"
+        "📝 Usage: `/bug <description>`\n"
+        "Example: `/bug Login fails on mobile`"
+    )
+    STORY_USAGE_MSG = (
+        "❌ Please provide a story description.\n\n"
+        "📝 Usage: `/story <description>`\n"
+        "Example: `/story Add new dashboard feature`"
+    )
+
+    START_TEXT = (
+        "Hello! I'm the Jira Bot. Use /task to create a new Jira task or /desc to view existing tasks.\n\n"
+        "Type /help for more commands."
+    )
+
+    HELP_TEXT = """
+🤖 Jira Bot Commands:
+
+🔐 Регистрация (в приватном чате):
+/register token: <jira-token> - Зарегистрировать ваш Jira токен
+/unregister - Удалить ваш Jira токен
+
+📋 Работа с задачами:
+/task <description> - Create a new Jira task
+/bug <description> - Create a bug (shortcut for /task with type: Bug)
+/story <description> - Create a story (shortcut for /task with type: Story)
+/task <description> component: <label> - Create task with specific component
+/task <description> type: <type> - Create task with specific type (Story, Bug)
+/task <description> sprint: <query> - Add task to a specific sprint
+/task <description> link: <issue-key> - Link to another Jira issue
+/task <description> project: <key> - Create task in a specific project (default: AAI)
+/task <description> assignee: <name> - Assign to a user (alias: who:; matched by name)
+/task <description> epic: <name> - Link to an epic (matched by name or key)
+/task desc: <description> - Use description after "desc:" as task description
+/desc <issue-key> - Get details of a Jira issue (e.g., /desc 123 or /desc PROJ-123)
+/search <words> - Full-text search issues by summary and description (default project: AAI)
+/search <words> project: <key> - Search within another project (project: all - search everywhere)
+/link message_ref: <uuid> jira: <key> - Store message reference and Jira issue link
+/unlink message_ref: <uuid> jira: <key> - Remove message reference and Jira issue link
+
+ℹ️ Информация:
+/help - Show this help message
+/start - Start the bot
+/userinfo - Show your user information
+/admin - Show admin information (requires authorization)
+
+📝 Examples:
+/register token: ATATT3xFfGF0...
+/task Fix login bug
+/bug Critical authentication error
+/story Add new dashboard component: авиа-параметры
+/desc 123
+/desc PROJ-456
+/search login timeout
+/search оплата картой project: SV
+/link message_ref: 550e8400-e29b-41d4-a716-446655440000 jira: AAI-1020
+/unlink message_ref: 550e8400-e29b-41d4-a716-446655440000 jira: AAI-1020
+/task Fix critical bug type: Bug
+/bug Login issue component: авиа-параметры sprint: active
+/story desc: Implement user authentication system
+/task Update schema component: devops type: Bug sprint: s3 agent
+/bug Login broken assignee: Алексей
+/story New report who: редикульцев epic: мобильное приложение
+/task Add filter epic: AAI-100
+/bug Fix related issue link: 2825
+/task Create new feature project: PROJ component: frontend
+/bug Database error project: SV component: backend sprint: active
+/story New UI feature project: DESIGN component: frontend
+
+💡 Features:
+• Для работы с ботом необходимо зарегистрировать свой Jira токен (/register)
+• Регистрация доступна только в приватном чате с ботом
+• Component matching uses transliteration and fuzzy matching for Russian labels
+• Components are fetched dynamically from Jira (DEPRECATED components are filtered out)
+• Sprint matching uses fuzzy matching (e.g., "s3 agent" matches "2025Q4-S3_агент")
+• Link parameter creates "Relates" link to specified issue (e.g., link: 123 or link: PROJ-123)
+• Project parameter allows creating tasks in any Jira project (default: AAI)
+• Available issue types: Story, Bug
+• /bug and /story commands ignore any type: parameter but support all other parameters (component, sprint, link, project, desc)
+• If no close component match is found, you'll see available components list
+• Image attachments are automatically added to Jira tasks (works with /task, /bug, and /story)
+• Assignee is guessed from a partial/Russian name (assignee: or who:) using transliteration, fuzzy matching, and an optional LLM
+• Epic is guessed from its name (epic:) the same way, or you can pass the epic key directly (e.g. epic: AAI-100)
+• All parameters (type, component, sprint, link, project, desc, assignee, epic) can appear in any order
+    """
+
+    # Filled in per user by /userinfo
+    USERINFO_TEMPLATE = """
+👤 User Information:
+
+🆔 User ID: {user_id}
+👤 Username: @{username}
+📛 Name: {first_name} {last_name}
+✅ Access: {access}
+    """
+
     def __init__(self):
         """Initialize the Telegram bot."""
         self.database_service = DatabaseService()
@@ -57,6 +324,13 @@ class TelegramBot:
         self.assignee_service = None
         self.epic_service = None
         self.application = None
+        # Command name -> handler, filled in by setup_handlers
+        self._command_handlers = {}
+        # Media group ID -> its updates so far, and the timer that flushes it
+        self._media_group_buffer: dict[str, list[Update]] = {}
+        self._media_group_timers: dict[str, asyncio.TimerHandle] = {}
+        # Media group ID -> photos that arrived while its task was being created
+        self._media_group_pending: dict[str, list[Update]] = {}
 
     def _get_user_jira_service(self, telegram_id: int) -> JiraService | None:
         """
@@ -74,11 +348,20 @@ class TelegramBot:
 
         decrypted_token = self.crypto_service.decrypt_token(encrypted_token)
         if not decrypted_token:
-            logger.error(f"Failed to decrypt token for user {telegram_id}")
+            logger.error("Failed to decrypt token for user %s", telegram_id)
             return None
 
         return JiraService.with_token(decrypted_token)
 
+    def _forget_user_token(self, telegram_id: int):
+        """Drop the Jira client and caches held for a user's stored token."""
+        encrypted_token = self.database_service.get_user_token(telegram_id)
+        if not encrypted_token:
+            return
+        decrypted_token = self.crypto_service.decrypt_token(encrypted_token)
+        if decrypted_token:
+            JiraService.forget_token(decrypted_token)
+
     def _get_component_service(self, jira_service: JiraService) -> ComponentService:
         """Get a ComponentService instance for a specific JiraService."""
         return ComponentService(jira_service)
@@ -99,10 +382,7 @@ class TelegramBot:
         """Handle the /start command."""
         if not update.message:
             return
-        await update.message.reply_text(
-            f"Hello! I'm the Jira Bot. Use /task to create a new Jira task or /desc to view existing tasks.\n\n"
-            f"Type /help for more commands."
-        )
+        await update.message.reply_text(self.START_TEXT)
 
     async def _parse_task_parameters(
         self,
@@ -112,16 +392,17 @@ class TelegramBot:
         sprint_service: SprintService = None,
         assignee_service: AssigneeService = None,
         epic_service: EpicService = None,
+        forced_issue_type: str | None = None,
     ):
         """
         Parse task parameters from task_description. Parameters can appear in any order.
         Supported parameters: type:, component:, sprint:, desc:/description:, link:, project:, assignee:/who:, epic:
+        A forced_issue_type (/bug, /story) is used as is and any type: parameter is ignored.
         Returns: (summary, description, component_name, issue_type, sprint_id, link_issue, project_key, assignee, epic_key, should_stop)
         """
-        import re
 
         # Initialize defaults
-        issue_type = "Story"
+        issue_type = forced_issue_type or "Story"
         component_name = Config.JIRA_COMPONENT_NAME
         jira_description = None
         sprint_id = None
@@ -136,54 +417,31 @@ class TelegramBot:
         _assignee_service = assignee_service or getattr(self, "assignee_service", None)
         _epic_service = epic_service or getattr(self, "epic_service", None)
 
-        # Pattern to find all parameters. Captures the parameter name and value up
-        # to the next parameter keyword. re.DOTALL lets desc: span newlines; the
-        # lookahead stops at the next keyword. NOTE: the keyword list must be kept
-        # identical in the capture group and the lookahead, or summary extraction breaks.
-        param_pattern = r"(type:|component:|sprint:|desc:|description:|link:|project:|assignee:|who:|epic:)\s*(.+?)(?=\s*\b(?:type:|component:|sprint:|desc:|description:|link:|project:|assignee:|who:|epic:)|$)"
-
-        matches = list(
-            re.finditer(param_pattern, task_description, re.IGNORECASE | re.DOTALL)
-        )
-
-        if matches:
-            # Extract parameters
-            params = {}
-            for match in matches:
-                param_name = match.group(1).lower().rstrip(":")
-                param_value = match.group(2).strip()
-
-                # Handle desc/description as the same parameter
-                if param_name in ["desc", "description"]:
-                    param_name = "description"
+        summary, found_params = _split_params(task_description)
 
-                # Handle who as an alias for assignee
-                if param_name == "who":
-                    param_name = "assignee"
-
-                params[param_name] = param_value
-
-            # Remove all parameter definitions from the task description to get the summary
-            summary = task_description
-            for match in reversed(
-                matches
-            ):  # Remove in reverse order to maintain positions
-                summary = summary[: match.start()] + summary[match.end() :]
-            summary = summary.strip()
+        if found_params:
+            # Extract parameters under their canonical names (a later
+            # occurrence wins)
+            params = {
+                _PARAM_ALIASES.get(param_name, param_name): param_value
+                for param_name, param_value in found_params
+            }
 
             # Process project parameter first (before component and link parameters need it)
             if "project" in params:
                 project_key = params["project"].strip().upper()
-                logger.info(f"Using custom project: '{project_key}'")
+                logger.info("Using custom project: '%s'", project_key)
 
             # Process type parameter
-            if "type" in params:
+            if "type" in params and not forced_issue_type:
                 issue_type_label = params["type"]
                 issue_type, issue_type_message = IssueTypeService.find_issue_type(
                     issue_type_label
                 )
                 logger.info(
-                    f"Selected issue type '{issue_type}' for label '{issue_type_label}'"
+                    "Selected issue type '%s' for label '%s'",
+                    issue_type,
+                    issue_type_label,
                 )
 
                 if issue_type_message:
@@ -193,11 +451,14 @@ class TelegramBot:
             # Process component parameter (needs project_key)
             if "component" in params and _component_service:
                 component_label = params["component"]
-                component_name, component_message = _component_service.find_component(
-                    component_label, project_key
+                component_name, component_message = await asyncio.to_thread(
+                    _component_service.find_component, component_label, project_key
                 )
                 logger.info(
-                    f"Selected component '{component_name}' for label '{component_label}' in project '{project_key}'"
+                    "Selected component '%s' for label '%s' in project '%s'",
+                    component_name,
+                    component_label,
+                    project_key,
                 )
 
                 if component_message:
@@ -207,7 +468,9 @@ class TelegramBot:
             # Process sprint parameter
             if "sprint" in params and _sprint_service:
                 sprint_query = params["sprint"]
-                sprint_id, sprint_message = _sprint_service.find_sprint(sprint_query)
+                sprint_id, sprint_message = await asyncio.to_thread(
+                    _sprint_service.find_sprint, sprint_query
+                )
 
                 if sprint_message:
                     # Error or ambiguity - notify user
@@ -215,27 +478,27 @@ class TelegramBot:
                     return None, None, None, None, None, None, None, None, None, True
 
                 logger.info(
-                    f"Selected sprint ID: {sprint_id} for query '{sprint_query}'"
+                    "Selected sprint ID: %s for query '%s'", sprint_id, sprint_query
                 )
 
             # Process description parameter
             if "description" in params:
                 jira_description = params["description"]
-                logger.info(f"Extracted Jira description: '{jira_description}'")
+                logger.info("Extracted Jira description: '%s'", jira_description)
 
             # Process link parameter
             if "link" in params:
                 link_issue = params["link"].strip()
                 # If only digits, prepend project key
-                if link_issue.isdigit():
+                if _ISSUE_NUMBER_RE.fullmatch(link_issue):
                     link_issue = f"{project_key}-{link_issue}"
-                logger.info(f"Extracted link issue: '{link_issue}'")
+                logger.info("Extracted link issue: '%s'", link_issue)
 
             # Process assignee parameter (needs project_key to fetch the user pool)
             if "assignee" in params and _assignee_service:
                 assignee_query = params["assignee"]
-                assignee_username, assignee_message = _assignee_service.find_assignee(
-                    assignee_query, project_key
+                assignee_username, assignee_message = await asyncio.to_thread(
+                    _assignee_service.find_assignee, assignee_query, project_key
                 )
 
                 if assignee_message:
@@ -244,14 +507,16 @@ class TelegramBot:
                     return None, None, None, None, None, None, None, None, None, True
 
                 logger.info(
-                    f"Selected assignee '{assignee_username}' for query '{assignee_query}'"
+                    "Selected assignee '%s' for query '%s'",
+                    assignee_username,
+                    assignee_query,
                 )
 
             # Process epic parameter (needs project_key to fetch the epic pool)
             if "epic" in params and _epic_service:
                 epic_query = params["epic"]
-                epic_key, epic_message = _epic_service.find_epic(
-                    epic_query, project_key
+                epic_key, epic_message = await asyncio.to_thread(
+                    _epic_service.find_epic, epic_query, project_key
                 )
 
                 if epic_message:
@@ -259,31 +524,31 @@ class TelegramBot:
                     await update.message.reply_text(epic_message)
                     return None, None, None, None, None, None, None, None, None, True
 
-                logger.info(f"Selected epic '{epic_key}' for query '{epic_query}'")
+                logger.info("Selected epic '%s' for query '%s'", epic_key, epic_query)
 
-            # Use summary from what's left after removing parameters
-            task_description = summary
-            logger.info(f"Task summary: '{task_description}'")
+        # Use summary from what's left after removing parameters. Cleaned up
+        # even without parameters: /bug and /story may pass none, and a plain
+        # summary has the same Jira limits
+        task_description = summary
+        logger.debug("Task summary: '%s'", task_description)
 
-            # If summary is empty but description exists, use description as summary
-            if not task_description and jira_description:
-                task_description = jira_description
-                jira_description = None
-                logger.info(
-                    f"Summary was empty, using description as summary: '{task_description}'"
-                )
+        # If summary is empty but description exists, use description as summary
+        if not task_description and jira_description:
+            task_description = jira_description
+            jira_description = None
+            logger.info(
+                "Summary was empty, using description as summary: '%s'",
+                task_description,
+            )
 
-            # Clean summary: remove newlines and extra whitespace (Jira doesn't allow newlines in summary)
-            if task_description:
-                task_description = " ".join(task_description.split())
-                logger.info(f"Cleaned summary (removed newlines): '{task_description}'")
+        # Clean summary: remove newlines and extra whitespace (Jira doesn't allow newlines in summary)
+        if task_description:
+            task_description = _WHITESPACE_RE.sub(" ", task_description).strip()
+            logger.debug("Cleaned summary (removed newlines): '%s'", task_description)
 
-            # Truncate summary to 255 characters (Jira limit)
-            if task_description and len(task_description) > 255:
-                logger.warning(
-                    f"Summary too long ({len(task_description)} chars), truncating to 255 chars"
-                )
-                task_description = task_description[:252] + "..."
+        # Truncate summary to Jira's 255 character limit
+        if task_description:
+            task_description = _truncate_summary(task_description)
 
         return (
             task_description,
@@ -292,499 +557,135 @@ class TelegramBot:
             issue_type,
             sprint_id,
             link_issue,
-            project_key,
-            assignee_username,
-            epic_key,
-            False,
-        )
-
-    async def _process_bug_or_story(
-        self, update: Update, context: ContextTypes.DEFAULT_TYPE, task_description: str
-    ):
-        """Common processing logic for /bug and /story commands."""
-        try:
-            # Check user permissions
-            user = update.effective_user
-            if not UserConfig.is_user_allowed(user.username, user.id):
-                await update.message.reply_text(
-                    "❌ Access denied. You are not authorized to create Jira tasks.\n"
-                    f"Contact administrator to get access."
-                )
-                logger.warning(
-                    f"Unauthorized access attempt by user: {user.username} (ID: {user.id})"
-                )
-                return
-
-            # Get user's JiraService with their personal token
-            jira_service = self._get_user_jira_service(user.id)
-            if not jira_service:
-                await update.message.reply_text(self.REGISTRATION_REQUIRED_MSG)
-                return
-
-            # Check for photo attachments
-            photo_attachments = []
-            if update.message.photo:
-                photo_attachments = update.message.photo
-                logger.info(f"Found {len(photo_attachments)} photo attachments")
-
-            # Get component, sprint, assignee and epic services for this user's jira_service
-            component_service = self._get_component_service(jira_service)
-            sprint_service = self._get_sprint_service(jira_service)
-            assignee_service = self._get_assignee_service(jira_service)
-            epic_service = self._get_epic_service(jira_service)
-
-            # Parse task parameters using the helper method
-            (
-                task_description,
-                jira_description,
-                component_name,
-                issue_type,
-                sprint_id,
-                link_issue,
-                project_key,
-                assignee,
-                epic,
-                should_stop,
-            ) = await self._parse_task_parameters(
-                task_description,
-                update,
-                component_service,
-                sprint_service,
-                assignee_service,
-                epic_service,
-            )
-            if should_stop:
-                return
-
-            # Prepare labels for Jira issue
-            labels = []
-            chat = update.effective_chat
-
-            # Add chat/channel name as label
-            if chat:
-                if chat.type in ["group", "supergroup", "channel"]:
-                    # For groups and channels, use the chat title
-                    if chat.title:
-                        # Clean label: replace spaces and special chars
-                        chat_label = chat.title.replace(" ", "_").replace("-", "_")
-                        labels.append(f"tg_chat:{chat_label}")
-                elif chat.type == "private":
-                    # For private chats, use "private"
-                    labels.append("tg_chat:private")
-
-            # Add username as label
-            if user:
-                if user.username:
-                    labels.append(f"tg_user:{user.username}")
-                elif user.first_name:
-                    # If no username, use first name
-                    user_label = user.first_name.replace(" ", "_").replace("-", "_")
-                    labels.append(f"tg_user:{user_label}")
-
-            logger.info(f"Adding labels to Jira issue: {labels}")
-
-            # Create the Jira issue
-            await update.message.reply_text(f"Creating Jira {issue_type.lower()}...")
-
-            # Prepare description for Jira
-            if jira_description:
-                final_description = jira_description
-            else:
-                final_description = f"Created via Telegram bot by user {user.username or user.first_name}"
-
-            # Download photo attachments if any
-            attachment_files = []
-            if photo_attachments:
-                try:
-                    attachment_files = await self._download_photos(photo_attachments)
-                    logger.info(f"Downloaded {len(attachment_files)} photo attachments")
-                except Exception as e:
-                    logger.error(f"Failed to download photo attachments: {e}")
-                    await update.message.reply_text(
-                        "⚠️ Warning: Failed to download some photo attachments. Creating task without them."
-                    )
-
-            issue_key, error_message = jira_service.create_story(
-                summary=task_description,
-                description=final_description,
-                component_name=component_name,
-                issue_type=issue_type,
-                attachments=attachment_files,
-                sprint_id=sprint_id,
-                labels=labels,
-                project_key=project_key,
-                assignee=assignee,
-                epic_key=epic,
-            )
-
-            if error_message:
-                # If there's an error message, send it to the user
-                await update.message.reply_text(error_message)
-                return
-
-            if issue_key:
-                issue_url = jira_service.get_issue_url(issue_key)
-
-                # Link to another issue if specified
-                if link_issue:
-                    link_success = jira_service.link_issues(
-                        inward_issue=issue_key, outward_issue=link_issue
-                    )
-                    if link_success:
-                        logger.info(f"Successfully linked {issue_key} to {link_issue}")
-                    else:
-                        await update.message.reply_text(
-                            f"⚠️ Created task but failed to link to {link_issue}. Please check the issue key."
-                        )
-
-                await update.message.reply_text(
-                    f"✅ Jira {issue_type.lower()} created successfully!\n\n"
-                    f"📋 Task Key: {issue_key}\n"
-                    f"🔗 URL: {issue_url}"
-                )
-            else:
-                await update.message.reply_text(
-                    f"❌ Failed to create Jira {issue_type.lower()}. Please check the bot configuration and try again."
-                )
-
-        except Exception as e:
-            logger.error(f"Error in _process_bug_or_story: {e}")
-            await update.message.reply_text(
-                "❌ An error occurred while creating the Jira task. Please try again later."
-            )
-
-    async def bug_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle the /bug command as a shortcut for creating a bug."""
-        logger.debug("DEBUG: bug_command triggered")
-        # Get the task description and force type to Bug
-        if update.message and update.message.text:
-            # Get everything after /bug
-            parts = update.message.text.split(maxsplit=1)
-            if len(parts) > 1:
-                task_description = parts[1]
-                # Remove type: parameter if it exists (it will be ignored)
-                import re
-
-                task_description = re.sub(
-                    r"\btype:\s*\w+", "", task_description, flags=re.IGNORECASE
-                ).strip()
-                # Add type: Bug to the description
-                task_description = f"{task_description} type: Bug".strip()
-            else:
-                task_description = "type: Bug"
-
-            # Process as task command with modified description
-            await self._process_bug_or_story(update, context, task_description)
-        else:
-            await update.message.reply_text(
-                "❌ Please provide a bug description.\n\n"
-                "📝 Usage: `/bug <description>`\n"
-                "Example: `/bug Login fails on mobile`"
-            )
-
-    async def story_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle the /story command as a shortcut for creating a story."""
-        logger.debug("DEBUG: story_command triggered")
-        # Get the task description and force type to Story
-        if update.message and update.message.text:
-            # Get everything after /story
-            parts = update.message.text.split(maxsplit=1)
-            if len(parts) > 1:
-                task_description = parts[1]
-                # Remove type: parameter if it exists (it will be ignored)
-                import re
-
-                task_description = re.sub(
-                    r"\btype:\s*\w+", "", task_description, flags=re.IGNORECASE
-                ).strip()
-                # Add type: Story to the description
-                task_description = f"{task_description} type: Story".strip()
-            else:
-                task_description = "type: Story"
-
-            # Process as task command with modified description
-            await self._process_bug_or_story(update, context, task_description)
-        else:
-            await update.message.reply_text(
-                "❌ Please provide a story description.\n\n"
-                "📝 Usage: `/story <description>`\n"
-                "Example: `/story Add new dashboard feature`"
-            )
-
-    async def task_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle the /task command to create a Jira story."""
-        logger.debug("DEBUG: task_command triggered")
-        logger.debug(f"DEBUG: Message text: '{update.message.text}'")
-        logger.debug(f"DEBUG: Message caption: '{update.message.caption}'")
-        logger.debug(f"DEBUG: Has photos: {bool(update.message.photo)}")
-        try:
-            # Check if message exists
-            if not update.message:
-                logger.warning("Received update without message")
-                return
-
-            # Check user permissions
-            user = update.effective_user
-            if not UserConfig.is_user_allowed(user.username, user.id):
-                await update.message.reply_text(
-                    "❌ Access denied. You are not authorized to create Jira tasks.\n"
-                    f"Contact administrator to get access."
-                )
-                logger.warning(
-                    f"Unauthorized access attempt by user: {user.username} (ID: {user.id})"
-                )
-                return
-
-            # Get user's JiraService with their personal token
-            jira_service = self._get_user_jira_service(user.id)
-            if not jira_service:
-                await update.message.reply_text(self.REGISTRATION_REQUIRED_MSG)
-                return
-
-            # Get component, sprint, assignee and epic services for this user's jira_service
-            component_service = self._get_component_service(jira_service)
-            sprint_service = self._get_sprint_service(jira_service)
-            assignee_service = self._get_assignee_service(jira_service)
-            epic_service = self._get_epic_service(jira_service)
-
-            # Get the user's message text
-            message_text = update.message.text or ""
-
-            # Check for photo attachments
-            photo_attachments = []
-            if update.message.photo:
-                photo_attachments = update.message.photo
-                logger.info(f"Found {len(photo_attachments)} photo attachments")
-
-            # Extract the task description (everything after /task)
-            if message_text and len(message_text.split()) > 1:
-                task_description = " ".join(message_text.split()[1:])
-                logger.debug(f"DEBUG: Task description from text: '{task_description}'")
-            elif photo_attachments and not message_text:
-                # If there are photos but no text, use a default description
-                task_description = "Task with image attachment"
-                logger.debug("DEBUG: Using default description for photo-only task")
-            else:
-                await update.message.reply_text(
-                    "❌ Please provide a task description.\n\n"
-                    "📝 Usage examples:\n"
-                    "• `/task Fix login bug`\n"
-                    "• `/task Add new feature component: авиа-параметры`\n"
-                    "• `/task Fix critical bug type: Bug`\n"
-                    "• `/task desc: Implement user authentication system`\n"
-                    "• `/task Update database component: devops type: Bug`\n\n"
-                    "💡 Available issue types: Story, Bug\n"
-                    "💡 Components are matched using transliteration and fuzzy matching\n"
-                    "💡 Use `/help` for more detailed information"
-                )
-                return
-
-            # Parse task parameters using the helper method
-            (
-                task_description,
-                jira_description,
-                component_name,
-                issue_type,
-                sprint_id,
-                link_issue,
-                project_key,
-                assignee,
-                epic,
-                should_stop,
-            ) = await self._parse_task_parameters(
-                task_description,
-                update,
-                component_service,
-                sprint_service,
-                assignee_service,
-                epic_service,
-            )
-            if should_stop:
-                return
-
-            # Prepare labels for Jira issue
-            labels = []
-            chat = update.effective_chat
-
-            # Add chat/channel name as label
-            if chat:
-                if chat.type in ["group", "supergroup", "channel"]:
-                    # For groups and channels, use the chat title
-                    if chat.title:
-                        # Clean label: replace spaces and special chars
-                        chat_label = chat.title.replace(" ", "_").replace("-", "_")
-                        labels.append(f"tg_chat:{chat_label}")
-                elif chat.type == "private":
-                    # For private chats, use "private"
-                    labels.append("tg_chat:private")
-
-            # Add username as label
-            if user:
-                if user.username:
-                    labels.append(f"tg_user:{user.username}")
-                elif user.first_name:
-                    # If no username, use first name
-                    user_label = user.first_name.replace(" ", "_").replace("-", "_")
-                    labels.append(f"tg_user:{user_label}")
-
-            logger.info(f"Adding labels to Jira issue: {labels}")
-
-            # Create the Jira issue
-            await update.message.reply_text(f"Creating Jira {issue_type.lower()}...")
-
-            # Prepare description for Jira
-            if jira_description:
-                final_description = jira_description
-            else:
-                final_description = f"Created via Telegram bot by user {user.username or user.first_name}"
-
-            # Download photo attachments if any
-            attachment_files = []
-            if photo_attachments:
-                try:
-                    attachment_files = await self._download_photos(photo_attachments)
-                    logger.info(f"Downloaded {len(attachment_files)} photo attachments")
-                except Exception as e:
-                    logger.error(f"Failed to download photo attachments: {e}")
-                    await update.message.reply_text(
-                        "⚠️ Warning: Failed to download some photo attachments. Creating task without them."
-                    )
-
-            issue_key, error_message = jira_service.create_story(
-                summary=task_description,
-                description=final_description,
-                component_name=component_name,
-                issue_type=issue_type,
-                attachments=attachment_files,
-                sprint_id=sprint_id,
-                labels=labels,
-                project_key=project_key,
-                assignee=assignee,
-                epic_key=epic,
-            )
+            project_key,
+            assignee_username,
+            epic_key,
+            False,
+        )
 
-            if error_message:
-                # If there's an error message, send it to the user
-                await update.message.reply_text(error_message)
-                return
+    @staticmethod
+    def _build_labels(chat, user) -> List[str]:
+        """Jira labels recording the chat and user a task was created from."""
+        labels = []
+
+        # Add chat/channel name as label
+        if chat:
+            if chat.type in ["group", "supergroup", "channel"]:
+                # For groups and channels, use the chat title
+                if chat.title:
+                    labels.append(f"tg_chat:{_clean_label(chat.title)}")
+            elif chat.type == "private":
+                # For private chats, use "private"
+                labels.append("tg_chat:private")
+
+        # Add username as label
+        if user:
+            if user.username:
+                labels.append(f"tg_user:{user.username}")
+            elif user.first_name:
+                # If no username, use first name
+                labels.append(f"tg_user:{_clean_label(user.first_name)}")
+
+        return labels
 
-            if issue_key:
-                issue_url = jira_service.get_issue_url(issue_key)
+    async def bug_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle the /bug command as a shortcut for creating a bug."""
+        logger.debug("DEBUG: bug_command triggered")
+        # Get the task description and force type to Bug
+        if update.message and update.message.text:
+            # Get everything after /bug
+            parts = update.message.text.split(maxsplit=1)
+            if len(parts) > 1:
+                # Drop any type: parameter; the command sets the type
+                task_description = _TYPE_PARAM_RE.sub("", parts[1]).strip()
+            else:
+                task_description = ""
 
-                # Link to another issue if specified
-                if link_issue:
-                    link_success = jira_service.link_issues(
-                        inward_issue=issue_key, outward_issue=link_issue
-                    )
-                    if link_success:
-                        logger.info(f"Successfully linked {issue_key} to {link_issue}")
-                    else:
-                        await update.message.reply_text(
-                            f"⚠️ Created task but failed to link to {link_issue}. Please check the issue key."
-                        )
+            await self._create_jira_task(
+                update,
+                task_description,
+                update.message.photo,
+                forced_issue_type="Bug",
+            )
+        else:
+            await update.message.reply_text(self.BUG_USAGE_MSG)
 
-                await update.message.reply_text(
-                    f"✅ Jira {issue_type.lower()} created successfully!\n\n"
-                    f"📋 Task Key: {issue_key}\n"
-                    f"🔗 URL: {issue_url}"
-                )
+    async def story_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle the /story command as a shortcut for creating a story."""
+        logger.debug("DEBUG: story_command triggered")
+        # Get the task description and force type to Story
+        if update.message and update.message.text:
+            # Get everything after /story
+            parts = update.message.text.split(maxsplit=1)
+            if len(parts) > 1:
+                # Drop any type: parameter; the command sets the type
+                task_description = _TYPE_PARAM_RE.sub("", parts[1]).strip()
             else:
-                await update.message.reply_text(
-                    f"❌ Failed to create Jira {issue_type.lower()}. Please check the bot configuration and try again."
-                )
+                task_description = ""
 
-        except Exception as e:
-            logger.error(f"Error in task_command: {e}")
-            await update.message.reply_text(
-                "❌ An error occurred while creating the Jira story. Please try again later."
+            await self._create_jira_task(
+                update,
+                task_description,
+                update.message.photo,
+                forced_issue_type="Story",
             )
+        else:
+            await update.message.reply_text(self.STORY_USAGE_MSG)
 
-    async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle the /help command."""
+    async def task_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle the /task command to create a Jira story."""
+        logger.debug("DEBUG: task_command triggered")
+        # Check if message exists
         if not update.message:
+            logger.warning("Received update without message")
             return
-        help_text = f"""
-🤖 Jira Bot Commands:
 
-🔐 Регистрация (в приватном чате):
-/register token: <jira-token> - Зарегистрировать ваш Jira токен
-/unregister - Удалить ваш Jira токен
+        logger.debug("DEBUG: Message text: '%s'", update.message.text)
+        logger.debug("DEBUG: Message caption: '%s'", update.message.caption)
+        logger.debug("DEBUG: Has photos: %s", bool(update.message.photo))
 
-📋 Работа с задачами:
-/task <description> - Create a new Jira task
-/bug <description> - Create a bug (shortcut for /task with type: Bug)
-/story <description> - Create a story (shortcut for /task with type: Story)
-/task <description> component: <label> - Create task with specific component
-/task <description> type: <type> - Create task with specific type (Story, Bug)
-/task <description> sprint: <query> - Add task to a specific sprint
-/task <description> link: <issue-key> - Link to another Jira issue
-/task <description> project: <key> - Create task in a specific project (default: AAI)
-/task <description> assignee: <name> - Assign to a user (alias: who:; matched by name)
-/task <description> epic: <name> - Link to an epic (matched by name or key)
-/task desc: <description> - Use description after "desc:" as task description
-/desc <issue-key> - Get details of a Jira issue (e.g., /desc 123 or /desc PROJ-123)
-/search <words> - Full-text search issues by summary and description (default project: AAI)
-/search <words> project: <key> - Search within another project (project: all - search everywhere)
-/link message_ref: <uuid> jira: <key> - Store message reference and Jira issue link
-/unlink message_ref: <uuid> jira: <key> - Remove message reference and Jira issue link
+        # Get the user's message text
+        message_text = update.message.text or ""
 
-ℹ️ Информация:
-/help - Show this help message
-/start - Start the bot
-/userinfo - Show your user information
-/admin - Show admin information (requires authorization)
+        # Check for photo attachments
+        photo_attachments = []
+        if update.message.photo:
+            photo_attachments = update.message.photo
+            logger.info("Found %s photo attachments", len(photo_attachments))
+
+        # Extract the task description (everything after /task)
+        words = message_text.split()
+        if len(words) > 1:
+            task_description = " ".join(words[1:])
+            logger.debug("DEBUG: Task description from text: '%s'", task_description)
+        elif photo_attachments and not message_text:
+            # If there are photos but no text, use a default description
+            task_description = "Task with image attachment"
+            logger.debug("DEBUG: Using default description for photo-only task")
+        else:
+            await update.message.reply_text(self.TASK_USAGE_MSG)
+            return
 
-📝 Examples:
-/register token: ATATT3xFfGF0...
-/task Fix login bug
-/bug Critical authentication error
-/story Add new dashboard component: авиа-параметры
-/desc 123
-/desc PROJ-456
-/search login timeout
-/search оплата картой project: SV
-/link message_ref: 550e8400-e29b-41d4-a716-446655440000 jira: AAI-1020
-/unlink message_ref: 550e8400-e29b-41d4-a716-446655440000 jira: AAI-1020
-/task Fix critical bug type: Bug
-/bug Login issue component: авиа-параметры sprint: active
-/story desc: Implement user authentication system
-/task Update schema component: devops type: Bug sprint: s3 agent
-/bug Login broken assignee: Алексей
-/story New report who: редикульцев epic: мобильное приложение
-/task Add filter epic: AAI-100
-/bug Fix related issue link: 2825
-/task Create new feature project: PROJ component: frontend
-/bug Database error project: SV component: backend sprint: active
-/story New UI feature project: DESIGN component: frontend
+        await self._create_jira_task(update, task_description, photo_attachments)
 
-💡 Features:
-• Для работы с ботом необходимо зарегистрировать свой Jira токен (/register)
-• Регистрация доступна только в приватном чате с ботом
-• Component matching uses transliteration and fuzzy matching for Russian labels
-• Components are fetched dynamically from Jira (DEPRECATED components are filtered out)
-• Sprint matching uses fuzzy matching (e.g., "s3 agent" matches "2025Q4-S3_агент")
-• Link parameter creates "Relates" link to specified issue (e.g., link: 123 or link: PROJ-123)
-• Project parameter allows creating tasks in any Jira project (default: AAI)
-• Available issue types: Story, Bug
-• /bug and /story commands ignore any type: parameter but support all other parameters (component, sprint, link, project, desc)
-• If no close component match is found, you'll see available components list
-• Image attachments are automatically added to Jira tasks (works with /task, /bug, and /story)
-• Assignee is guessed from a partial/Russian name (assignee: or who:) using transliteration, fuzzy matching, and an optional LLM
-• Epic is guessed from its name (epic:) the same way, or you can pass the epic key directly (e.g. epic: AAI-100)
-• All parameters (type, component, sprint, link, project, desc, assignee, epic) can appear in any order
-        """
-        await update.message.reply_text(help_text)
+    async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle the /help command."""
+        if not update.message:
+            return
+        await update.message.reply_text(self.HELP_TEXT)
 
-    async def _download_photos(self, photo_attachments: List) -> List[str]:
+    async def _download_photos(
+        self, photo_attachments: List
+    ) -> List[tuple[str, bytes]]:
         """
-        Download photo attachments from Telegram and return file paths.
+        Download photo attachments from Telegram into memory.
         Only downloads the highest quality version of each photo.
 
         Args:
             photo_attachments: List of photo objects from Telegram
 
         Returns:
-            List[str]: List of downloaded file paths
+            List[tuple[str, bytes]]: (filename, content) of each downloaded photo
         """
         downloaded_files = []
 
@@ -797,47 +698,60 @@ class TelegramBot:
         if len(photo_attachments) > 1 and all(
             hasattr(p, "file_unique_id") for p in photo_attachments
         ):
-            # Check if these are different photos (different file_unique_id prefixes)
-            # For media groups, we already collected only the best version of each
-            unique_photos = {p.file_id: p for p in photo_attachments}
+            # For media groups, we already collected only the best version of each.
+            # Skip repeats by file_unique_id: unlike file_id, it is the same
+            # for the same file whichever bot or message it came from
+            seen = set()
+            unique_photos = []
+            for photo in photo_attachments:
+                if photo.file_unique_id not in seen:
+                    seen.add(photo.file_unique_id)
+                    unique_photos.append(photo)
             logger.info(
-                f"Processing {len(unique_photos)} photos from media group or attachment list"
+                "Processing %s photos from media group or attachment list",
+                len(unique_photos),
             )
         else:
             # Single message with multiple sizes of one photo - take the last (highest quality)
             best_photo = photo_attachments[-1]
-            logger.info(
-                f"DEBUG: Selected last photo as best - file_size: {best_photo.file_size}, width: {best_photo.width}, height: {best_photo.height}"
+            logger.debug(
+                "DEBUG: Selected last photo as best - file_size: %s, width: %s, height: %s",
+                best_photo.file_size,
+                best_photo.width,
+                best_photo.height,
             )
             logger.info(
-                f"Processing 1 photo (selecting last/highest quality) from {len(photo_attachments)} total photo objects"
+                "Processing 1 photo (selecting last/highest quality) from %s total photo objects",
+                len(photo_attachments),
+            )
+            unique_photos = [best_photo]
+
+        async def download(i: int, photo) -> tuple[str, bytes]:
+            # Get the highest resolution photo
+            file = await self.application.bot.get_file(photo.file_id)
+            logger.debug(
+                "DEBUG: Photo details - file_id: %s, size: %s",
+                photo.file_id,
+                photo.file_size,
             )
-            unique_photos = {best_photo.file_id: best_photo}
-
-        for i, photo in enumerate(unique_photos.values()):
-            try:
-                # Get the highest resolution photo
-                file = await self.application.bot.get_file(photo.file_id)
-
-                # Create temporary file
-                with tempfile.NamedTemporaryFile(
-                    delete=False, suffix=f"_{i}.jpg"
-                ) as temp_file:
-                    temp_path = temp_file.name
-
-                logger.debug(f"DEBUG: Creating temp file for photo {i + 1}: {temp_path}")
-                logger.info(
-                    f"DEBUG: Photo details - file_id: {photo.file_id}, size: {photo.file_size}"
-                )
-
-                # Download the file
-                await file.download_to_drive(temp_path)
-                downloaded_files.append(temp_path)
-                logger.debug(f"DEBUG: Downloaded unique photo {i + 1} to {temp_path}")
 
-            except Exception as e:
-                logger.error(f"Failed to download photo {i + 1}: {e}")
-                continue
+            # Photos are small (Telegram caps bot downloads at 20 MB), so they
+            # are kept in memory and uploaded to Jira from there rather than
+            # written to a temp file and read back
+            content = await file.download_as_bytearray()
+            logger.debug("DEBUG: Downloaded unique photo %s", i + 1)
+            return f"photo_{i}.jpg", bytes(content)
+
+        # Download all photos at once rather than one round trip after another
+        results = await asyncio.gather(
+            *(download(i, photo) for i, photo in enumerate(unique_photos)),
+            return_exceptions=True,
+        )
+        for i, result in enumerate(results):
+            if isinstance(result, BaseException):
+                logger.error("Failed to download photo %s: %s", i + 1, result)
+            else:
+                downloaded_files.append(result)
 
         return downloaded_files
 
@@ -850,14 +764,15 @@ class TelegramBot:
         user = update.effective_user
         is_allowed = UserConfig.is_user_allowed(user.username, user.id)
 
-        user_info = f"""
-👤 User Information:
-
-🆔 User ID: {user.id}
-👤 Username: @{user.username or "Not set"}
-📛 Name: {user.first_name} {user.last_name or ""}
-✅ Access: {"Authorized" if is_allowed else "Not authorized"}
-        """
+        user_info = self.USERINFO_TEMPLATE.format_map(
+            {
+                "user_id": user.id,
+                "username": user.username or "Not set",
+                "first_name": user.first_name,
+                "last_name": user.last_name or "",
+                "access": "Authorized" if is_allowed else "Not authorized",
+            }
+        )
 
         await update.message.reply_text(user_info)
 
@@ -918,10 +833,9 @@ class TelegramBot:
             return
 
         # Extract token using regex
-        import re
 
         param_text = parts[1]
-        token_match = re.search(r"token:\s*(\S+)", param_text, re.IGNORECASE)
+        token_match = _TOKEN_PARAM_RE.search(param_text)
 
         if not token_match:
             await update.message.reply_text(
@@ -944,10 +858,14 @@ class TelegramBot:
         try:
             await update.message.reply_text("🔄 Проверяю токен...")
             test_service = JiraService.with_token(jira_token)
+            # Clients connect lazily, so make one authenticated request
+            await asyncio.to_thread(test_service.jira.myself)
             # If we get here, the token is valid
-            logger.info(f"Token verified for user {user.id}")
+            logger.info("Token verified for user %s", user.id)
         except Exception as e:
-            logger.error(f"Token verification failed for user {user.id}: {e}")
+            logger.error("Token verification failed for user %s: %s", user.id, e)
+            # Don't keep a client (and the token) around for a rejected token
+            JiraService.forget_token(jira_token)
             await update.message.reply_text(
                 "❌ Не удалось подключиться к Jira с указанным токеном.\n\n"
                 "Пожалуйста, проверьте:\n"
@@ -965,7 +883,11 @@ class TelegramBot:
             )
             return
 
-        success, error = self.database_service.save_user_token(
+        # ClickHouse calls block, so run them off the event loop.
+        # A re-registration replaces the previous token.
+        await asyncio.to_thread(self._forget_user_token, user.id)
+        success, error = await asyncio.to_thread(
+            self.database_service.save_user_token,
             telegram_id=user.id,
             encrypted_token=encrypted_token,
             username=user.username,
@@ -981,12 +903,12 @@ class TelegramBot:
                 "• /desc - просмотреть задачу\n\n"
                 "Все действия будут выполняться от вашего имени в Jira."
             )
-            logger.info(f"User {user.id} ({user.username}) registered successfully")
+            logger.info("User %s (%s) registered successfully", user.id, user.username)
         else:
             await update.message.reply_text(
                 "❌ Ошибка сохранения токена. Пожалуйста, попробуйте позже."
             )
-            logger.error(f"Failed to save token for user {user.id}: {error}")
+            logger.error("Failed to save token for user %s: %s", user.id, error)
 
     async def unregister_command(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
@@ -1008,14 +930,19 @@ class TelegramBot:
             return
 
         # Check if user is registered
-        if not self.database_service.user_is_registered(user.id):
+        if not await asyncio.to_thread(
+            self.database_service.user_is_registered, user.id
+        ):
             await update.message.reply_text(
                 "ℹ️ Вы не зарегистрированы. Нечего удалять."
             )
             return
 
         # Delete token
-        success, error = self.database_service.delete_user_token(user.id)
+        await asyncio.to_thread(self._forget_user_token, user.id)
+        success, error = await asyncio.to_thread(
+            self.database_service.delete_user_token, user.id
+        )
 
         if success:
             await update.message.reply_text(
@@ -1023,12 +950,14 @@ class TelegramBot:
                 "Для использования бота вам нужно будет зарегистрироваться снова "
                 "с помощью команды /register."
             )
-            logger.info(f"User {user.id} ({user.username}) unregistered successfully")
+            logger.info(
+                "User %s (%s) unregistered successfully", user.id, user.username
+            )
         else:
             await update.message.reply_text(
                 "❌ Ошибка удаления токена. Пожалуйста, попробуйте позже."
             )
-            logger.error(f"Failed to delete token for user {user.id}: {error}")
+            logger.error("Failed to delete token for user %s: %s", user.id, error)
 
     async def link_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle the /link command to store message reference and Jira key in database."""
@@ -1043,12 +972,14 @@ class TelegramBot:
                 "❌ Access denied. You are not authorized to use this command."
             )
             logger.warning(
-                f"Unauthorized access attempt by user: {user.username} (ID: {user.id})"
+                "Unauthorized access attempt by user: %s (ID: %s)",
+                user.username,
+                user.id,
             )
             return
 
         # Get user's JiraService with their personal token
-        jira_service = self._get_user_jira_service(user.id)
+        jira_service = await asyncio.to_thread(self._get_user_jira_service, user.id)
         if not jira_service:
             await update.message.reply_text(self.REGISTRATION_REQUIRED_MSG)
             return
@@ -1068,17 +999,14 @@ class TelegramBot:
             return
 
         # Extract parameters using regex
-        import re
 
         param_text = parts[1]
         message_ref = None
         jira_key = None
 
         # Pattern to extract message_ref and jira parameters
-        message_ref_match = re.search(
-            r"message_ref:\s*([a-fA-F0-9\-]+)", param_text, re.IGNORECASE
-        )
-        jira_match = re.search(r"jira:\s*([A-Z]+-\d+|\d+)", param_text, re.IGNORECASE)
+        message_ref_match = _MESSAGE_REF_RE.search(param_text)
+        jira_match = _JIRA_PARAM_RE.search(param_text)
 
         if message_ref_match:
             message_ref = message_ref_match.group(1).strip()
@@ -1086,7 +1014,7 @@ class TelegramBot:
         if jira_match:
             jira_key = jira_match.group(1).strip().upper()
             # If only digits, prepend default project key
-            if jira_key.isdigit():
+            if _ISSUE_NUMBER_RE.fullmatch(jira_key):
                 jira_key = f"{Config.JIRA_PROJECT_KEY}-{jira_key}"
 
         # Validate parameters
@@ -1101,10 +1029,7 @@ class TelegramBot:
             return
 
         # Validate UUID format
-        uuid_pattern = re.compile(
-            r"^[a-fA-F0-9]{8}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{12}$"
-        )
-        if not uuid_pattern.match(message_ref):
+        if not _UUID_RE.match(message_ref):
             await update.message.reply_text(
                 f"❌ Invalid UUID format for message_ref: {message_ref}\n\n"
                 "Expected format: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx"
@@ -1113,15 +1038,17 @@ class TelegramBot:
 
         # Insert into database and add comment to Jira
         try:
-            success, error_reason = self.database_service.insert_jira_issue_link(
-                message_ref, jira_key
+            success, error_reason = await asyncio.to_thread(
+                self.database_service.insert_jira_issue_link, message_ref, jira_key
             )
 
             if success:
                 # Add comment to Jira issue with link to message reference
                 grafana_url = f"{Config.GRAFANA_MESSAGE_URL}{message_ref}"
                 comment = f"Message reference linked: {grafana_url}"
-                comment_added = jira_service.add_comment(jira_key, comment)
+                comment_added = await asyncio.to_thread(
+                    jira_service.add_comment, jira_key, comment
+                )
 
                 if comment_added:
                     await update.message.reply_text(
@@ -1141,7 +1068,10 @@ class TelegramBot:
                     )
 
                 logger.info(
-                    f"User {user.username} linked message_ref {message_ref} to Jira issue {jira_key}"
+                    "User %s linked message_ref %s to Jira issue %s",
+                    user.username,
+                    message_ref,
+                    jira_key,
                 )
             elif error_reason == "duplicate":
                 await update.message.reply_text(
@@ -1150,21 +1080,26 @@ class TelegramBot:
                     f"• Jira Issue: {jira_key}"
                 )
                 logger.warning(
-                    f"Duplicate link attempt by {user.username}: message_ref={message_ref}, jira_key={jira_key}"
+                    "Duplicate link attempt by %s: message_ref=%s, jira_key=%s",
+                    user.username,
+                    message_ref,
+                    jira_key,
                 )
             else:
                 await update.message.reply_text(
                     f"❌ Failed to store the link. Database error occurred."
                 )
                 logger.error(
-                    f"Failed to insert link: message_ref={message_ref}, jira_key={jira_key}"
+                    "Failed to insert link: message_ref=%s, jira_key=%s",
+                    message_ref,
+                    jira_key,
                 )
 
         except Exception as e:
             await update.message.reply_text(
                 f"❌ An error occurred while storing the link: {str(e)}"
             )
-            logger.error(f"Error in link_command: {e}", exc_info=True)
+            logger.error("Error in link_command: %s", e, exc_info=True)
 
     async def unlink_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle the /unlink command to remove message reference and Jira key link from database."""
@@ -1179,7 +1114,9 @@ class TelegramBot:
                 "❌ Access denied. You are not authorized to use this command."
             )
             logger.warning(
-                f"Unauthorized access attempt by user: {user.username} (ID: {user.id})"
+                "Unauthorized access attempt by user: %s (ID: %s)",
+                user.username,
+                user.id,
             )
             return
 
@@ -1198,17 +1135,14 @@ class TelegramBot:
             return
 
         # Extract parameters using regex
-        import re
 
         param_text = parts[1]
         message_ref = None
         jira_key = None
 
         # Pattern to extract message_ref and jira parameters
-        message_ref_match = re.search(
-            r"message_ref:\s*([a-fA-F0-9\-]+)", param_text, re.IGNORECASE
-        )
-        jira_match = re.search(r"jira:\s*([A-Z]+-\d+|\d+)", param_text, re.IGNORECASE)
+        message_ref_match = _MESSAGE_REF_RE.search(param_text)
+        jira_match = _JIRA_PARAM_RE.search(param_text)
 
         if message_ref_match:
             message_ref = message_ref_match.group(1).strip()
@@ -1216,7 +1150,7 @@ class TelegramBot:
         if jira_match:
             jira_key = jira_match.group(1).strip().upper()
             # If only digits, prepend default project key
-            if jira_key.isdigit():
+            if _ISSUE_NUMBER_RE.fullmatch(jira_key):
                 jira_key = f"{Config.JIRA_PROJECT_KEY}-{jira_key}"
 
         # Validate parameters
@@ -1231,10 +1165,7 @@ class TelegramBot:
             return
 
         # Validate UUID format
-        uuid_pattern = re.compile(
-            r"^[a-fA-F0-9]{8}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{12}$"
-        )
-        if not uuid_pattern.match(message_ref):
+        if not _UUID_RE.match(message_ref):
             await update.message.reply_text(
                 f"❌ Invalid UUID format for message_ref: {message_ref}\n\n"
                 "Expected format: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx"
@@ -1243,8 +1174,8 @@ class TelegramBot:
 
         # Delete from database
         try:
-            success, error_reason = self.database_service.delete_jira_issue_link(
-                message_ref, jira_key
+            success, error_reason = await asyncio.to_thread(
+                self.database_service.delete_jira_issue_link, message_ref, jira_key
             )
 
             if success:
@@ -1254,7 +1185,10 @@ class TelegramBot:
                     f"• Jira Issue: {jira_key}"
                 )
                 logger.info(
-                    f"User {user.username} unlinked message_ref {message_ref} from Jira issue {jira_key}"
+                    "User %s unlinked message_ref %s from Jira issue %s",
+                    user.username,
+                    message_ref,
+                    jira_key,
                 )
             elif error_reason == "not_found":
                 await update.message.reply_text(
@@ -1264,21 +1198,26 @@ class TelegramBot:
                     "This link does not exist in the database."
                 )
                 logger.warning(
-                    f"Unlink attempt for non-existent link by {user.username}: message_ref={message_ref}, jira_key={jira_key}"
+                    "Unlink attempt for non-existent link by %s: message_ref=%s, jira_key=%s",
+                    user.username,
+                    message_ref,
+                    jira_key,
                 )
             else:
                 await update.message.reply_text(
                     f"❌ Failed to remove the link. Database error occurred."
                 )
                 logger.error(
-                    f"Failed to delete link: message_ref={message_ref}, jira_key={jira_key}"
+                    "Failed to delete link: message_ref=%s, jira_key=%s",
+                    message_ref,
+                    jira_key,
                 )
 
         except Exception as e:
             await update.message.reply_text(
                 f"❌ An error occurred while removing the link: {str(e)}"
             )
-            logger.error(f"Error in unlink_command: {e}", exc_info=True)
+            logger.error("Error in unlink_command: %s", e, exc_info=True)
 
     async def desc_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle the /desc command to fetch and display Jira issue details."""
@@ -1293,12 +1232,14 @@ class TelegramBot:
                 "❌ Access denied. You are not authorized to view Jira tasks."
             )
             logger.warning(
-                f"Unauthorized access attempt by user: {user.username} (ID: {user.id})"
+                "Unauthorized access attempt by user: %s (ID: %s)",
+                user.username,
+                user.id,
             )
             return
 
         # Get user's JiraService with their personal token
-        jira_service = self._get_user_jira_service(user.id)
+        jira_service = await asyncio.to_thread(self._get_user_jira_service, user.id)
         if not jira_service:
             await update.message.reply_text(self.REGISTRATION_REQUIRED_MSG)
             return
@@ -1323,9 +1264,11 @@ class TelegramBot:
         # Send "fetching" message
         await update.message.reply_text(f"🔍 Fetching issue {issue_key}...")
 
+        # Attachment id -> downloaded temp file, all removed when done
+        downloaded = {}
         try:
             # Get issue details from Jira
-            issue_data = jira_service.get_issue(issue_key)
+            issue_data = await asyncio.to_thread(jira_service.get_issue, issue_key)
 
             if not issue_data:
                 await update.message.reply_text(
@@ -1362,33 +1305,37 @@ class TelegramBot:
                     else:
                         other_attachments.append(attachment)
 
+            # Download every attachment up front, in parallel and off the event
+            # loop; the sends below then only read local files
+            to_download = image_attachments + other_attachments
+            if to_download:
+                paths = await asyncio.to_thread(
+                    jira_service.download_attachments, to_download
+                )
+                downloaded = {
+                    attachment["id"]: path
+                    for attachment, path in zip(to_download, paths)
+                }
+
             # If there's at least one image, send the first image with the issue text as caption
             if image_attachments:
                 first_image = image_attachments[0]
                 try:
-                    file_path = jira_service.download_attachment(
-                        first_image["content_url"], first_image["filename"]
-                    )
+                    file_path = downloaded.get(first_image["id"])
 
                     if file_path:
-                        caption = issue_text[:1024] if len(issue_text) > 1024 else issue_text
-                        with open(file_path, "rb") as f:
-                            await update.message.reply_photo(
-                                photo=f, caption=caption, parse_mode="HTML"
-                            )
-
-                        # Clean up
-                        import os
-
-                        try:
-                            os.unlink(file_path)
-                        except:
-                            pass
+                        caption = (
+                            issue_text[:1024] if len(issue_text) > 1024 else issue_text
+                        )
+                        content = await asyncio.to_thread(_read_file, file_path)
+                        await update.message.reply_photo(
+                            photo=content, caption=caption, parse_mode="HTML"
+                        )
 
                         # Remove the first image from the list
                         image_attachments = image_attachments[1:]
                 except Exception as e:
-                    logger.error(f"Failed to send first image: {e}")
+                    logger.error("Failed to send first image: %s", e)
                     await update.message.reply_text(issue_text, parse_mode="HTML")
             else:
                 await update.message.reply_text(issue_text, parse_mode="HTML")
@@ -1397,26 +1344,18 @@ class TelegramBot:
             if image_attachments:
                 for attachment in image_attachments:
                     try:
-                        file_path = jira_service.download_attachment(
-                            attachment["content_url"], attachment["filename"]
-                        )
+                        file_path = downloaded.get(attachment["id"])
 
                         if file_path:
-                            with open(file_path, "rb") as f:
-                                await update.message.reply_photo(
-                                    photo=f, caption=f"📎 {attachment['filename']}"
-                                )
-
-                            # Clean up
-                            import os
-
-                            try:
-                                os.unlink(file_path)
-                            except:
-                                pass
+                            content = await asyncio.to_thread(_read_file, file_path)
+                            await update.message.reply_photo(
+                                photo=content, caption=f"📎 {attachment['filename']}"
+                            )
                     except Exception as e:
                         logger.error(
-                            f"Failed to send attachment {attachment['filename']}: {e}"
+                            "Failed to send attachment %s: %s",
+                            attachment["filename"],
+                            e,
                         )
                         await update.message.reply_text(
                             f"⚠️ Failed to download attachment: {attachment['filename']}"
@@ -1426,38 +1365,35 @@ class TelegramBot:
             if other_attachments:
                 for attachment in other_attachments:
                     try:
-                        file_path = jira_service.download_attachment(
-                            attachment["content_url"], attachment["filename"]
-                        )
+                        file_path = downloaded.get(attachment["id"])
 
                         if file_path:
-                            with open(file_path, "rb") as f:
-                                await update.message.reply_document(
-                                    document=f,
-                                    filename=attachment["filename"],
-                                    caption=f"📎 {attachment['filename']}",
-                                )
-
-                            # Clean up
-                            import os
-
-                            try:
-                                os.unlink(file_path)
-                            except:
-                                pass
+                            content = await asyncio.to_thread(_read_file, file_path)
+                            await update.message.reply_document(
+                                document=content,
+                                filename=attachment["filename"],
+                                caption=f"📎 {attachment['filename']}",
+                            )
                     except Exception as e:
                         logger.error(
-                            f"Failed to send attachment {attachment['filename']}: {e}"
+                            "Failed to send attachment %s: %s",
+                            attachment["filename"],
+                            e,
                         )
                         await update.message.reply_text(
                             f"⚠️ Failed to download attachment: {attachment['filename']}"
                         )
 
         except Exception as e:
-            logger.error(f"Error in desc_command: {e}")
+            logger.error("Error in desc_command: %s", e)
             await update.message.reply_text(
                 "❌ An error occurred while fetching the issue. Please try again later."
             )
+        finally:
+            # Sent or not, remove every download in one trip off the event loop
+            paths = [path for path in downloaded.values() if path]
+            if paths:
+                await asyncio.to_thread(_remove_files, paths)
 
     async def search_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle the /search command to full-text search issues by summary + description."""
@@ -1472,12 +1408,14 @@ class TelegramBot:
                 "❌ Access denied. You are not authorized to search Jira tasks."
             )
             logger.warning(
-                f"Unauthorized access attempt by user: {user.username} (ID: {user.id})"
+                "Unauthorized access attempt by user: %s (ID: %s)",
+                user.username,
+                user.id,
             )
             return
 
         # Get user's JiraService with their personal token
-        jira_service = self._get_user_jira_service(user.id)
+        jira_service = await asyncio.to_thread(self._get_user_jira_service, user.id)
         if not jira_service:
             await update.message.reply_text(self.REGISTRATION_REQUIRED_MSG)
             return
@@ -1503,15 +1441,12 @@ class TelegramBot:
 
         # Extract optional project: parameter. Default to the configured project;
         # "project: all" searches across every accessible project.
-        import re
 
         project_key = Config.JIRA_PROJECT_KEY
-        project_match = re.search(r"project:\s*(\S+)", query_text, re.IGNORECASE)
+        project_match = _SEARCH_PROJECT_RE.search(query_text)
         if project_match:
             raw_project = project_match.group(1).strip()
-            query_text = re.sub(
-                r"project:\s*\S+", "", query_text, flags=re.IGNORECASE
-            ).strip()
+            query_text = _SEARCH_PROJECT_RE.sub("", query_text).strip()
             project_key = None if raw_project.lower() == "all" else raw_project.upper()
 
         if not query_text:
@@ -1524,8 +1459,8 @@ class TelegramBot:
         await update.message.reply_text(f"🔍 Searching for '{query_text}'{scope}...")
 
         try:
-            results, error_message = jira_service.search_issues(
-                query_text, project_key=project_key
+            results, error_message = await asyncio.to_thread(
+                jira_service.search_issues, query_text, project_key=project_key
             )
 
             if error_message:
@@ -1560,7 +1495,7 @@ class TelegramBot:
             )
 
         except Exception as e:
-            logger.error(f"Error in search_command: {e}")
+            logger.error("Error in search_command: %s", e)
             await update.message.reply_text(
                 "❌ An error occurred while searching. Please try again later."
             )
@@ -1574,180 +1509,72 @@ class TelegramBot:
                 logger.warning("Received update without message")
                 return
 
-            logger.debug(f"DEBUG: photo_message_handler triggered")
-            logger.debug(f"DEBUG: Message text: '{update.message.text}'")
-            logger.debug(f"DEBUG: Message caption: '{update.message.caption}'")
-            logger.debug(f"DEBUG: Has photos: {bool(update.message.photo)}")
-            logger.debug(f"DEBUG: Media group ID: '{update.message.media_group_id}'")
+            logger.debug("DEBUG: photo_message_handler triggered")
+            logger.debug("DEBUG: Message text: '%s'", update.message.text)
+            logger.debug("DEBUG: Message caption: '%s'", update.message.caption)
+            logger.debug("DEBUG: Has photos: %s", bool(update.message.photo))
+            logger.debug("DEBUG: Media group ID: '%s'", update.message.media_group_id)
 
             # Check if this is part of a media group (multiple photos sent together)
             if update.message.media_group_id:
-                logger.info(
-                    f"DEBUG: Part of media group {update.message.media_group_id}"
+                logger.debug(
+                    "DEBUG: Part of media group %s", update.message.media_group_id
                 )
 
-                # Keys for tracking media groups
                 media_group_id = update.message.media_group_id
-                task_key = f"task_{media_group_id}"
-                photo_count_key = f"photo_count_{media_group_id}"
 
                 # Check if we already created a task for this media group
-                existing_task_key = context.bot_data.get(task_key)
+                existing_task_key = context.bot_data.get(f"task_{media_group_id}")
 
                 if existing_task_key:
-                    # Task already exists, add this photo to it
-                    logger.info(
-                        f"DEBUG: Task already exists for media group {media_group_id}, adding photo"
-                    )
-
-                    if update.message.photo:
-                        best_photo = update.message.photo[-1]
-
-                        # Get user's JiraService for adding attachment
-                        user = update.effective_user
-                        jira_service = self._get_user_jira_service(user.id)
-                        if not jira_service:
-                            logger.warning(f"User {user.id} not registered, cannot add attachment")
-                            return
-
-                        # Download and attach the photo
-                        try:
-                            photo_file = await context.bot.get_file(best_photo.file_id)
-                            photo_count = context.bot_data.get(photo_count_key, 1) + 1
-
-                            with tempfile.NamedTemporaryFile(
-                                delete=False, suffix=f"_{photo_count - 1}.jpg"
-                            ) as temp_file:
-                                temp_path = temp_file.name
-                                logger.info(
-                                    f"DEBUG: Downloading additional photo {photo_count} to {temp_path}"
-                                )
-                                await photo_file.download_to_drive(temp_path)
-
-                                # Add attachment to existing Jira task
-                                jira_service.add_attachment(
-                                    existing_task_key, temp_path
-                                )
-                                logger.info(
-                                    f"DEBUG: Added photo {photo_count} to task {existing_task_key}"
-                                )
-
-                                # Update photo count
-                                context.bot_data[photo_count_key] = photo_count
-
-                                # Clean up temp file
-                                import os
-
-                                try:
-                                    os.unlink(temp_path)
-                                except:
-                                    pass
-                        except Exception as e:
-                            logger.error(f"Error adding additional photo to task: {e}")
-
-                    return
-
-                # This is the first photo in the media group
-                logger.debug(f"DEBUG: First photo in media group {media_group_id}")
-
-                # Process the caption to extract task details
-                caption = update.message.caption or ""
-
-                # Only create task if there's a /task, /bug, or /story command
-                if (
-                    caption.startswith("/task")
-                    or caption.startswith("/bug")
-                    or caption.startswith("/story")
-                ):
-                    command = caption.split()[0]
-                    logger.info(
-                        f"DEBUG: Found {command} command in first photo caption"
+                    # Task already exists (this photo arrived after the group
+                    # was flushed), add this photo to it
+                    logger.debug(
+                        "DEBUG: Task already exists for media group %s, adding photo",
+                        media_group_id,
                     )
-
-                    # Extract description after command
-                    task_description = (
-                        " ".join(caption.split()[1:])
-                        if len(caption.split()) > 1
-                        else ""
+                    await self._add_media_group_photo(
+                        update, context, existing_task_key
                     )
+                    return
 
-                    # Add type parameter for /bug and /story
-                    import re
-
-                    if command == "/bug":
-                        task_description = re.sub(
-                            r"\btype:\s*\w+", "", task_description, flags=re.IGNORECASE
-                        ).strip()
-                        task_description = f"{task_description} type: Bug".strip()
-                    elif command == "/story":
-                        task_description = re.sub(
-                            r"\btype:\s*\w+", "", task_description, flags=re.IGNORECASE
-                        ).strip()
-                        task_description = f"{task_description} type: Story".strip()
-
-                    # Process and create the task with the first photo
-                    if update.message.photo:
-                        # Only use the highest quality version (last one in the list)
-                        best_photo = update.message.photo[-1]
-                        photos_to_process = [best_photo]
-
-                        # Create the task and get the task key
-                        created_task_key = await self._process_task(
-                            update, task_description, photos_to_process
-                        )
-
-                        # Store the task key for this media group
-                        if created_task_key:
-                            context.bot_data[task_key] = created_task_key
-                            context.bot_data[photo_count_key] = 1
-                            logger.info(
-                                f"DEBUG: Stored task {created_task_key} for media group {media_group_id}"
-                            )
-                else:
-                    # No command, just ignore the photo
-                    logger.debug("DEBUG: Media group photo without command - ignoring")
+                if media_group_id in self._media_group_pending:
+                    # The group's task is still being created; the photo is
+                    # added to it once its key is known
+                    self._media_group_pending[media_group_id].append(update)
+                    return
 
+                # Telegram sends an album as one update per photo, and only
+                # one of them carries the caption. Collect the group's photos
+                # and create a single task with all of them once the group
+                # has gone quiet (see _flush_media_group).
+                self._media_group_buffer.setdefault(media_group_id, []).append(update)
+                timer = self._media_group_timers.pop(media_group_id, None)
+                if timer:
+                    timer.cancel()
+                loop = asyncio.get_running_loop()
+                self._media_group_timers[media_group_id] = loop.call_later(
+                    _MEDIA_GROUP_WAIT, self._flush_media_group, media_group_id, context
+                )
                 return
 
             # Check if there's a command in the caption - if so, process it directly
-            caption = update.message.caption or ""
-            if (
-                caption.startswith("/task")
-                or caption.startswith("/bug")
-                or caption.startswith("/story")
-            ):
-                command = caption.split()[0]
-                logger.info(
-                    f"DEBUG: Found {command} command in caption, processing directly"
-                )
-
-                # Extract task description from caption (everything after command)
-                task_description = (
-                    " ".join(caption.split()[1:]) if len(caption.split()) > 1 else ""
-                )
-
-                # Add type parameter for /bug and /story
-                import re
-
-                if command == "/bug":
-                    task_description = re.sub(
-                        r"\btype:\s*\w+", "", task_description, flags=re.IGNORECASE
-                    ).strip()
-                    task_description = f"{task_description} type: Bug".strip()
-                elif command == "/story":
-                    task_description = re.sub(
-                        r"\btype:\s*\w+", "", task_description, flags=re.IGNORECASE
-                    ).strip()
-                    task_description = f"{task_description} type: Story".strip()
-
-                logger.info(
-                    f"DEBUG: Task description from caption: '{task_description}'"
+            caption_task = _parse_caption_command(update.message.caption or "")
+            if caption_task:
+                task_description, forced_issue_type = caption_task
+                logger.debug(
+                    "DEBUG: Task description from caption: '%s'", task_description
                 )
 
                 # Process the task with the caption text
                 # Pass only the highest quality photo (last one in the list)
                 best_photo = [update.message.photo[-1]] if update.message.photo else []
-                await self._process_task(update, task_description, best_photo)
+                await self._create_jira_task(
+                    update,
+                    task_description,
+                    best_photo,
+                    forced_issue_type=forced_issue_type,
+                )
                 return
 
             # If photo doesn't have /task, /bug, or /story command, ignore it (just a regular photo message)
@@ -1755,21 +1582,162 @@ class TelegramBot:
             return
 
         except Exception as e:
-            logger.error(f"Error in photo_message_handler: {e}")
+            logger.error("Error in photo_message_handler: %s", e)
             await update.message.reply_text(
                 "❌ An error occurred while processing the photo message. Please try again later."
             )
 
-    async def _process_task(
-        self, update: Update, task_description: str, photo_attachments: List
+    async def _add_media_group_photo(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE, task_key: str
+    ):
+        """Attach a media group photo that arrived after its task was created."""
+        if not update.message.photo:
+            return
+        best_photo = update.message.photo[-1]
+        photo_count_key = f"photo_count_{update.message.media_group_id}"
+
+        # Get user's JiraService for adding attachment
+        user = update.effective_user
+        jira_service = await asyncio.to_thread(self._get_user_jira_service, user.id)
+        if not jira_service:
+            logger.warning("User %s not registered, cannot add attachment", user.id)
+            return
+
+        # Download and attach the photo
+        try:
+            # Take the photo's number before any await, so photos attached
+            # at the same time get distinct file names
+            photo_count = context.bot_data.get(photo_count_key, 1) + 1
+            context.bot_data[photo_count_key] = photo_count
+
+            photo_file = await context.bot.get_file(best_photo.file_id)
+            logger.debug("DEBUG: Downloading additional photo %s", photo_count)
+            content = await photo_file.download_as_bytearray()
+
+            # Add attachment to existing Jira task
+            await asyncio.to_thread(
+                jira_service.add_attachment,
+                task_key,
+                f"photo_{photo_count - 1}.jpg",
+                bytes(content),
+            )
+            logger.debug("DEBUG: Added photo %s to task %s", photo_count, task_key)
+        except Exception as e:
+            logger.error("Error adding additional photo to task: %s", e)
+
+    def _flush_media_group(
+        self, media_group_id: str, context: ContextTypes.DEFAULT_TYPE
+    ):
+        """Create the task for a media group once its photos stopped arriving."""
+        del self._media_group_timers[media_group_id]
+        updates = self._media_group_buffer.pop(media_group_id)
+        # Photos arriving until the task key is stored wait here instead of
+        # starting a new (caption-less) buffer for the group
+        self._media_group_pending[media_group_id] = []
+        # Application.create_task keeps a reference to the task and passes
+        # its errors to the error handler
+        self.application.create_task(
+            self._create_media_group_task(media_group_id, updates, context)
+        )
+
+    async def _create_media_group_task(
+        self,
+        media_group_id: str,
+        updates: List[Update],
+        context: ContextTypes.DEFAULT_TYPE,
     ):
-        """Common task processing logic for both text and photo messages."""
+        """Create one Jira task with every photo of a media group."""
+        created_task_key = None
+        try:
+            created_task_key = await self._create_media_group_issue(
+                media_group_id, updates, context
+            )
+        finally:
+            late_updates = self._media_group_pending.pop(media_group_id, [])
+
+        if created_task_key:
+            for late_update in late_updates:
+                await self._add_media_group_photo(
+                    late_update, context, created_task_key
+                )
+
+    async def _create_media_group_issue(
+        self,
+        media_group_id: str,
+        updates: List[Update],
+        context: ContextTypes.DEFAULT_TYPE,
+    ) -> str | None:
+        """Create the Jira task for a media group and store its key."""
+        captioned = next((u for u in updates if u.message.caption), None)
+        caption_task = (
+            _parse_caption_command(captioned.message.caption) if captioned else None
+        )
+        if not caption_task:
+            # No command, just ignore the photos
+            logger.debug("DEBUG: Media group photos without command - ignoring")
+            return None
+        task_description, forced_issue_type = caption_task
+
+        # Only the highest quality version (last one in the list) of each photo
+        photos = [u.message.photo[-1] for u in updates if u.message.photo]
+        logger.debug(
+            "DEBUG: Creating task for media group %s with %s photos",
+            media_group_id,
+            len(photos),
+        )
+        created_task_key = await self._create_jira_task(
+            captioned,
+            task_description,
+            photos,
+            forced_issue_type=forced_issue_type,
+        )
+
+        # Store the task key so late photos of this group are attached to it
+        if created_task_key:
+            context.bot_data[f"task_{media_group_id}"] = created_task_key
+            context.bot_data[f"photo_count_{media_group_id}"] = len(photos)
+            logger.debug(
+                "DEBUG: Stored task %s for media group %s",
+                created_task_key,
+                media_group_id,
+            )
+        return created_task_key
+
+    async def _create_jira_task(
+        self,
+        update: Update,
+        task_description: str,
+        photo_attachments: List,
+        forced_issue_type: str | None = None,
+    ) -> str | None:
+        """
+        Create a Jira issue from a task description, replying with the outcome.
+
+        The one create path behind /task, /bug, /story and photo captions.
+        /bug and /story pass forced_issue_type instead of a type: parameter.
+
+        Returns:
+            The created issue key, or None if nothing was created
+        """
         try:
             user = update.effective_user
             chat = update.effective_chat
 
+            # Check user permissions
+            if not UserConfig.is_user_allowed(user.username, user.id):
+                await update.message.reply_text(
+                    "❌ Access denied. You are not authorized to create Jira tasks.\n"
+                    f"Contact administrator to get access."
+                )
+                logger.warning(
+                    "Unauthorized access attempt by user: %s (ID: %s)",
+                    user.username,
+                    user.id,
+                )
+                return None
+
             # Get user's JiraService with their personal token
-            jira_service = self._get_user_jira_service(user.id)
+            jira_service = await asyncio.to_thread(self._get_user_jira_service, user.id)
             if not jira_service:
                 await update.message.reply_text(self.REGISTRATION_REQUIRED_MSG)
                 return None
@@ -1799,38 +1767,21 @@ class TelegramBot:
                 sprint_service,
                 assignee_service,
                 epic_service,
+                forced_issue_type,
             )
             if should_stop:
                 return None
 
             # Prepare labels for Jira issue
-            labels = []
-
-            # Add chat/channel name as label
-            if chat:
-                if chat.type in ["group", "supergroup", "channel"]:
-                    # For groups and channels, use the chat title
-                    if chat.title:
-                        # Clean label: replace spaces and special chars
-                        chat_label = chat.title.replace(" ", "_").replace("-", "_")
-                        labels.append(f"tg_chat:{chat_label}")
-                elif chat.type == "private":
-                    # For private chats, use "private"
-                    labels.append("tg_chat:private")
-
-            # Add username as label
-            if user:
-                if user.username:
-                    labels.append(f"tg_user:{user.username}")
-                elif user.first_name:
-                    # If no username, use first name
-                    user_label = user.first_name.replace(" ", "_").replace("-", "_")
-                    labels.append(f"tg_user:{user_label}")
-
-            logger.info(f"Adding labels to Jira issue: {labels}")
-
-            # Create the Jira issue
-            await update.message.reply_text(f"Creating Jira {issue_type.lower()}...")
+            labels = self._build_labels(chat, user)
+
+            logger.info("Adding labels to Jira issue: %s", labels)
+
+            # Create the Jira issue. Show "typing..." rather than sending a
+            # "Creating..." message: chat actions don't count against
+            # Telegram's outgoing message limits, so each task costs one
+            # message (the result) instead of two.
+            await update.message.reply_chat_action(ChatAction.TYPING)
 
             # Prepare description for Jira
             if jira_description:
@@ -1843,14 +1794,17 @@ class TelegramBot:
             if photo_attachments:
                 try:
                     attachment_files = await self._download_photos(photo_attachments)
-                    logger.info(f"Downloaded {len(attachment_files)} photo attachments")
+                    logger.info(
+                        "Downloaded %s photo attachments", len(attachment_files)
+                    )
                 except Exception as e:
-                    logger.error(f"Failed to download photo attachments: {e}")
+                    logger.error("Failed to download photo attachments: %s", e)
                     await update.message.reply_text(
                         "⚠️ Warning: Failed to download some photo attachments. Creating task without them."
                     )
 
-            issue_key, error_message = jira_service.create_story(
+            issue_key, error_message = await asyncio.to_thread(
+                jira_service.create_story,
                 summary=task_description,
                 description=final_description,
                 component_name=component_name,
@@ -1873,11 +1827,15 @@ class TelegramBot:
 
                 # Link to another issue if specified
                 if link_issue:
-                    link_success = jira_service.link_issues(
-                        inward_issue=issue_key, outward_issue=link_issue
+                    link_success = await asyncio.to_thread(
+                        jira_service.link_issues,
+                        inward_issue=issue_key,
+                        outward_issue=link_issue,
                     )
                     if link_success:
-                        logger.info(f"Successfully linked {issue_key} to {link_issue}")
+                        logger.info(
+                            "Successfully linked %s to %s", issue_key, link_issue
+                        )
                     else:
                         await update.message.reply_text(
                             f"⚠️ Created task but failed to link to {link_issue}. Please check the issue key."
@@ -1896,9 +1854,9 @@ class TelegramBot:
                 return None
 
         except Exception as e:
-            logger.error(f"Error in _process_task: {e}")
+            logger.error("Error in _create_jira_task: %s", e)
             await update.message.reply_text(
-                "❌ An error occurred while creating the Jira story. Please try again later."
+                "❌ An error occurred while creating the Jira task. Please try again later."
             )
             return None
 
@@ -1925,9 +1883,17 @@ class TelegramBot:
                 return await _call()
             except NetworkError as e:
                 logger.critical(
-                    f"{handler.__name__}: Telegram unreachable after {max_retries} retries: {e}. "
-                    "Restarting application..."
+                    "%s: Telegram unreachable after %s retries: %s. Restarting application...",
+                    handler.__name__,
+                    max_retries,
+                    e,
                 )
+                # os._exit skips run()'s cleanup, so write out buffered link
+                # inserts first
+                try:
+                    await asyncio.to_thread(self.database_service.flush)
+                except Exception as flush_error:
+                    logger.error("Failed to flush link inserts: %s", flush_error)
                 os._exit(1)
 
         return wrapper
@@ -1936,26 +1902,37 @@ class TelegramBot:
         """Handle unhandled errors. Suppress transient network errors from proxy disconnects."""
         err = context.error
         if isinstance(err, NetworkError):
-            logger.debug(f"Transient network error (proxy disconnect): {err}")
+            logger.debug("Transient network error (proxy disconnect): %s", err)
             return
-        logger.error(f"Unhandled exception: {err}", exc_info=err)
+        logger.error("Unhandled exception: %s", err, exc_info=err)
 
     def setup_handlers(self):
         """Set up command handlers for the bot."""
         self.application.add_error_handler(self.error_handler)
-        self.application.add_handler(CommandHandler("start", self._with_retry(self.start_command)))
-        self.application.add_handler(CommandHandler("register", self._with_retry(self.register_command)))
-        self.application.add_handler(CommandHandler("unregister", self._with_retry(self.unregister_command)))
-        self.application.add_handler(CommandHandler("task", self._with_retry(self.task_command)))
-        self.application.add_handler(CommandHandler("bug", self._with_retry(self.bug_command)))
-        self.application.add_handler(CommandHandler("story", self._with_retry(self.story_command)))
-        self.application.add_handler(CommandHandler("link", self._with_retry(self.link_command)))
-        self.application.add_handler(CommandHandler("unlink", self._with_retry(self.unlink_command)))
-        self.application.add_handler(CommandHandler("desc", self._with_retry(self.desc_command)))
-        self.application.add_handler(CommandHandler("search", self._with_retry(self.search_command)))
-        self.application.add_handler(CommandHandler("help", self._with_retry(self.help_command)))
-        self.application.add_handler(CommandHandler("userinfo", self._with_retry(self.userinfo_command)))
-        self.application.add_handler(CommandHandler("admin", self._with_retry(self.admin_command)))
+        # One CommandHandler for every command, routed by dict lookup in
+        # _dispatch_command: PTB checks handlers one by one, so a handler per
+        # command meant parsing each command message once per command
+        self._command_handlers = {
+            command: self._with_retry(handler)
+            for command, handler in (
+                ("start", self.start_command),
+                ("register", self.register_command),
+                ("unregister", self.unregister_command),
+                ("task", self.task_command),
+                ("bug", self.bug_command),
+                ("story", self.story_command),
+                ("link", self.link_command),
+                ("unlink", self.unlink_command),
+                ("desc", self.desc_command),
+                ("search", self.search_command),
+                ("help", self.help_command),
+                ("userinfo", self.userinfo_command),
+                ("admin", self.admin_command),
+            )
+        }
+        self.application.add_handler(
+            CommandHandler(self._command_handlers, self._dispatch_command)
+        )
         # Handle photo-only messages (no text, just photos, and not commands)
         # This should only trigger for messages that have photos but NO text at all
         self.application.add_handler(
@@ -1965,6 +1942,16 @@ class TelegramBot:
             )
         )
 
+    async def _dispatch_command(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+    ):
+        """Run the handler for a command matched by setup_handlers' CommandHandler."""
+        message = update.effective_message
+        # CommandHandler only matches a bot_command entity at offset 0;
+        # drop the "/" and any "@botname", as it does
+        command = message.text[1 : message.entities[0].length].split("@")[0]
+        await self._command_handlers[command.lower()](update, context)
+
     async def run(self):
         """Run the Telegram bot."""
         try:
@@ -1981,10 +1968,12 @@ class TelegramBot:
                 .get_updates_connect_timeout(30.0)
                 .get_updates_read_timeout(60.0)
                 .get_updates_write_timeout(30.0)
+                # Don't let a slow command in one chat hold up the others
+                .concurrent_updates(ChatOrderedUpdateProcessor())
             )
 
             if Config.TELEGRAM_PROXY_URL:
-                logger.info(f"Using proxy: {Config.TELEGRAM_PROXY_URL.split('@')[-1]}")
+                logger.info("Using proxy: %s", Config.TELEGRAM_PROXY_URL.split("@")[-1])
                 builder = builder.proxy(Config.TELEGRAM_PROXY_URL).get_updates_proxy(Config.TELEGRAM_PROXY_URL)
 
             self.application = builder.build()
@@ -2001,7 +1990,11 @@ class TelegramBot:
                     await self.application.initialize()
                     break
                 except Exception as e:
-                    logger.warning(f"Telegram API not reachable yet ({e}), retrying in {retry_delay}s...")
+                    logger.warning(
+                        "Telegram API not reachable yet (%s), retrying in %ss...",
+                        e,
+                        retry_delay,
+                    )
                     await asyncio.sleep(retry_delay)
 
             try:
@@ -2024,7 +2017,9 @@ class TelegramBot:
                 await self.application.stop()
             finally:
                 await self.application.shutdown()
+                # Write out any link inserts still waiting in the buffer
+                await asyncio.to_thread(self.database_service.flush)
 
         except Exception as e:
-            logger.error(f"Failed to start bot: {e}")
+            logger.error("Failed to start bot: %s", e)
             raise
@@ -0,0 +1,85 @@
+import asyncio
+import sys
+from typing import Any, Awaitable
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+# Updates handled at once across all chats
+MAX_CONCURRENT_UPDATES = 64
+
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """
+    Process updates from different chats concurrently, but one at a time per chat.
+
+    PTB's default processes updates strictly one after another, so a slow
+    /task in one chat holds up every other chat. Its concurrent mode drops
+    ordering altogether, so a chat's commands could finish out of order and
+    an album's photos would be buffered in arbitrary order.
+    """
+
+    def __init__(self, max_concurrent_updates: int = MAX_CONCURRENT_UPDATES):
+        if max_concurrent_updates < 1:
+            raise ValueError("`max_concurrent_updates` must be a positive integer!")
+        # PTB holds its own semaphore while an update waits for its chat's
+        # lock, so a burst from one chat could take every slot and stall the
+        # other chats. Its limit is made effectively unbounded (the base class
+        # sizes it from max_concurrent_updates, hence setting _limit around
+        # the call); the real limit is only taken once an update is next in
+        # line in its chat.
+        self._limit = sys.maxsize
+        super().__init__(sys.maxsize)
+        self._limit = max_concurrent_updates
+        self._slots = asyncio.Semaphore(max_concurrent_updates)
+        self._active = 0
+        # chat ID -> (lock, number of updates holding or waiting for it)
+        self._chats: dict[int, tuple[asyncio.Lock, int]] = {}
+
+    @property
+    def max_concurrent_updates(self) -> int:
+        return self._limit
+
+    @property
+    def current_concurrent_updates(self) -> int:
+        return self._active
+
+    async def _run(self, coroutine: Awaitable[Any]) -> None:
+        """Await an update's coroutine in one of the limited slots."""
+        async with self._slots:
+            self._active += 1
+            try:
+                await coroutine
+            finally:
+                self._active -= 1
+
+    async def do_process_update(
+        self, update: object, coroutine: Awaitable[Any]
+    ) -> None:
+        chat = update.effective_chat if isinstance(update, Update) else None
+        if chat is None:
+            await self._run(coroutine)
+            return
+
+        lock, users = self._chats.get(chat.id, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._chats[chat.id] = (lock, users + 1)
+        try:
+            # asyncio.Lock wakes waiters in FIFO order, so a chat's updates
+            # run in the order they were received
+            async with lock:
+                await self._run(coroutine)
+        finally:
+            lock, users = self._chats[chat.id]
+            if users == 1:
+                # Drop idle chats so the map doesn't grow with every chat seen
+                del self._chats[chat.id]
+            else:
+                self._chats[chat.id] = (lock, users - 1)
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
@@ -2,6 +2,7 @@
 User authorization configuration for the Jira Telegram bot.
 """
 
+import functools
 import os
 from typing import List, Optional
 
@@ -10,6 +11,28 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+@functools.lru_cache(maxsize=8)
+def _parse_allowed_users(users_str: str) -> tuple[tuple[str, ...], frozenset[str]]:
+    """
+    Parse an ALLOWED_USERS string into (ordered entries, set of entries).
+
+    Memoized on the string itself, so the list is split once rather than on
+    every update, and a changed ALLOWED_USERS_STR is simply a new key.
+    """
+    # Split by comma and strip whitespace, filtering out empty strings
+    users = tuple(user for user in (u.strip() for u in users_str.split(",")) if user)
+    return users, frozenset(users)
+
+
+@functools.lru_cache(maxsize=8)
+def _format_allowed_users(users_str: str) -> str:
+    """The allowlist as shown by /admin, rendered once per ALLOWED_USERS value."""
+    users = _parse_allowed_users(users_str)[0]
+    if not users:
+        return "No restrictions (all users allowed)"
+    return ", ".join(users)
+
+
 class UserConfig:
     """Configuration class for user authorization."""
 
@@ -25,13 +48,7 @@ class UserConfig:
         Returns:
             List[str]: List of allowed usernames and user IDs
         """
-        if not cls.ALLOWED_USERS_STR:
-            return []
-
-        # Split by comma and strip whitespace
-        users = [user.strip() for user in cls.ALLOWED_USERS_STR.split(",")]
-        # Filter out empty strings
-        return [user for user in users if user]
+        return list(_parse_allowed_users(cls.ALLOWED_USERS_STR)[0])
 
     @classmethod
     def is_user_allowed(cls, username: Optional[str], user_id: Optional[int]) -> bool:
@@ -45,7 +62,8 @@ class UserConfig:
         Returns:
             bool: True if user is allowed, False otherwise
         """
-        allowed_users = cls.get_allowed_users()
+        # Set lookup: this runs on every command
+        allowed_users = _parse_allowed_users(cls.ALLOWED_USERS_STR)[1]
 
         # If no users configured, allow everyone (backward compatibility)
         if not allowed_users:
@@ -69,7 +87,4 @@ class UserConfig:
         Returns:
             str: Formatted list of allowed users
         """
-        users = cls.get_allowed_users()
-        if not users:
-            return "No restrictions (all users allowed)"
-        return ", ".join(users)
+        return _format_allowed_users(cls.ALLOWED_USERS_STR)
@@ -3,9 +3,30 @@ drop table if exists jira_issues;
 CREATE TABLE jira_issues(  
     message_ref UUID NOT NULL  ,
     jira_key VARCHAR(255) NOT NULL ,
-    created_at TIMESTAMP NOT NULL DEFAULT now()
-) ENGINE = MergeTree()
-ORDER BY (message_ref)
+    created_at TIMESTAMP NOT NULL DEFAULT now(),
+    updated_at DateTime64(6) NOT NULL DEFAULT now64(6),
+    is_deleted UInt8 NOT NULL DEFAULT 0
+) ENGINE = ReplacingMergeTree(updated_at)
+ORDER BY (message_ref, jira_key)
 ;
 
+-- Note: ReplacingMergeTree keyed by (message_ref, jira_key) collapses duplicate
+-- links on merge. Unlinking inserts a tombstone row (is_deleted = 1) instead of
+-- running an ALTER ... DELETE mutation; reads take each link's latest row with
+-- argMax(..., updated_at) and skip tombstones. updated_at has microsecond
+-- precision, so an unlink and a relink within the same second still order
+-- correctly, both in reads and in the engine's merges.
+--
+-- message_ref leads the sorting key, so lookups by message_ref (link_exists,
+-- get_jira_keys_by_message_ref) already use the primary index and need no
+-- skip index. Only a lookup by jira_key alone would, e.g.:
+-- ALTER TABLE jira_issues ADD INDEX idx_jira_key jira_key TYPE bloom_filter(0.01) GRANULARITY 1;
+--
+-- Upgrading an existing table: the engine's version column can't be added or
+-- retyped in place, so create the table above as jira_issues_new, then:
+-- INSERT INTO jira_issues_new (message_ref, jira_key, created_at, updated_at)
+--     SELECT message_ref, jira_key, created_at, created_at FROM jira_issues;
+-- EXCHANGE TABLES jira_issues_new AND jira_issues;
+-- DROP TABLE jira_issues_new;
+
 OPTIMIZE TABLE jira_issues FINAL DEDUPLICATE BY message_ref, jira_key;
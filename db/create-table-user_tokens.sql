@@ -8,13 +8,28 @@ CREATE TABLE user_tokens (
     jira_token_encrypted String NOT NULL,
     telegram_username Nullable(String),
     created_at DateTime NOT NULL DEFAULT now(),
-    updated_at DateTime NOT NULL DEFAULT now()
+    updated_at DateTime64(6) NOT NULL DEFAULT now64(6),
+    is_deleted UInt8 NOT NULL DEFAULT 0
 ) ENGINE = ReplacingMergeTree(updated_at)
 ORDER BY (telegram_id);
 
 -- Note: ReplacingMergeTree ensures only the latest token per telegram_id is kept
 -- based on the updated_at column. This allows users to update their tokens.
 -- jira_token_encrypted contains Fernet-encrypted token data.
+-- /unregister inserts a tombstone row (is_deleted = 1, empty token) rather than
+-- running an ALTER ... DELETE mutation; reads ignore users whose latest row is one.
+-- Reads pick the latest row with argMax(..., updated_at), the same rule as the
+-- engine; microsecond precision keeps an /unregister followed by /register
+-- within the same second in order.
+--
+-- Upgrading an existing table: updated_at is the engine's version column and
+-- can't be retyped in place, so create the table above as user_tokens_new, then:
+-- INSERT INTO user_tokens_new
+--     (telegram_id, jira_token_encrypted, telegram_username, created_at, updated_at)
+--     SELECT telegram_id, jira_token_encrypted, telegram_username, created_at, updated_at
+--     FROM user_tokens;
+-- EXCHANGE TABLES user_tokens_new AND user_tokens;
+-- DROP TABLE user_tokens_new;
 
 
 
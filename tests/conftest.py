@@ -14,7 +14,7 @@ def make_update(
     chat_type: str = "private",
     chat_title: str = None,
 ):
-    """Build a lightweight fake telegram Update with an async reply_text mock.
+    """Build a lightweight fake telegram Update with async reply mocks.
 
     Only the attributes actually touched by the handlers are populated.
     """
@@ -26,6 +26,7 @@ def make_update(
         reply_text=AsyncMock(),
         reply_photo=AsyncMock(),
         reply_document=AsyncMock(),
+        reply_chat_action=AsyncMock(),
     )
     user = SimpleNamespace(
         id=user_id,
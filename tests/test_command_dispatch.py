@@ -0,0 +1,47 @@
+"""Tests for routing commands through the single CommandHandler."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from telegram.ext import CommandHandler
+
+from app.telegram_bot import TelegramBot
+
+
+@pytest.fixture
+def bot():
+    b = object.__new__(TelegramBot)
+    b.application = MagicMock()
+    for name in ("task", "help"):
+        setattr(b, f"{name}_command", AsyncMock())
+    b.setup_handlers()
+    return b
+
+
+def command_update(text, command_length):
+    message = SimpleNamespace(
+        text=text, entities=[SimpleNamespace(length=command_length)]
+    )
+    return SimpleNamespace(effective_message=message)
+
+
+def test_one_command_handler_covers_every_command(bot):
+    handlers = [
+        c.args[0]
+        for c in bot.application.add_handler.call_args_list
+        if isinstance(c.args[0], CommandHandler)
+    ]
+
+    assert len(handlers) == 1
+    assert handlers[0].commands == frozenset(bot._command_handlers)
+    assert {"task", "bug", "story", "desc", "search", "help"} <= handlers[0].commands
+
+
+async def test_dispatch_routes_by_command_name(bot):
+    update = command_update("/Task@jira_bot Fix login", len("/Task@jira_bot"))
+
+    await bot._dispatch_command(update, None)
+
+    bot.task_command.assert_awaited_once_with(update, None)
+    bot.help_command.assert_not_awaited()
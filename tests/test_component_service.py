@@ -1,9 +1,19 @@
 """Tests for ComponentService (static fallback + fuzzy matching)."""
 
+import pytest
+
+import app.component_service as cs
 from app.component_service import ComponentService
 from app.components import components
 
 
+@pytest.fixture(autouse=True)
+def clear_component_cache():
+    cs._component_cache.clear()
+    yield
+    cs._component_cache.clear()
+
+
 def test_static_fallback_when_no_jira():
     svc = ComponentService()
     available = svc.get_available_components()
@@ -42,3 +52,182 @@ def test_cyrillic_input_does_not_crash():
     selected, message = svc.find_component("авиа-параметры")
     assert selected == "default"
     assert message  # a non-empty message with the available components
+
+
+def test_match_ignores_case_and_word_order():
+    svc = ComponentService()
+    selected, message = svc.find_component("A COMPONENT")
+    assert selected == "component-a"
+    assert message == ""
+
+
+def test_short_prefix_does_not_pick_arbitrary_component():
+    svc = ComponentService()
+    selected, message = svc.find_component("comp")
+    assert selected == "default"
+    assert "No close match" in message
+
+
+def test_repeated_label_is_memoized(monkeypatch):
+    import app.component_service as cs
+
+    cs._match_component.cache_clear()
+    calls = []
+    real_to_latin = cs._to_latin
+
+    def counting_to_latin(text):
+        calls.append(text)
+        return real_to_latin(text)
+
+    monkeypatch.setattr(cs, "_to_latin", counting_to_latin)
+    svc = ComponentService()
+    assert svc.find_component("component-b") == ("component-b", "")
+    assert svc.find_component("component-b") == ("component-b", "")
+    assert calls == ["component-b"]
+
+
+def test_to_latin_matches_transliterate_library():
+    from transliterate import translit
+
+    from app.component_service import _to_latin
+
+    for label in ["авиа-параметры", "Щука ЖЁЛТАЯ", "съезд", "mixed Цена 42", ""]:
+        assert _to_latin(label) == translit(label, "ru", reversed=True)
+
+
+def test_match_returns_original_component_name():
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+
+    jira_service = SimpleNamespace(project_key="PROJ", jira=MagicMock())
+    jira_service.jira.project_components.return_value = [
+        SimpleNamespace(name="Backend-API"),
+        SimpleNamespace(name="Frontend"),
+    ]
+    svc = ComponentService(jira_service)
+    selected, message = svc.find_component("backend api")
+    assert selected == "Backend-API"
+    assert message == ""
+
+
+def test_exact_match_skips_fuzzy_scoring(monkeypatch):
+    import app.component_service as cs
+
+    def fail(*args, **kwargs):
+        raise AssertionError("fuzzy matcher should not run for exact hits")
+
+    cs._match_component.cache_clear()
+    monkeypatch.setattr(cs.process, "extractOne", fail)
+    svc = ComponentService()
+    selected, message = svc.find_component("COMPONENT-A")
+    assert selected == "component-a"
+    assert message == ""
+
+
+def test_fetched_components_are_sorted_and_filtered():
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+
+    jira_service = SimpleNamespace(project_key="PROJ", jira=MagicMock())
+    jira_service.jira.project_components.return_value = [
+        SimpleNamespace(name="zeta"),
+        SimpleNamespace(name="DEPRECATED-old"),
+        SimpleNamespace(name="alpha"),
+    ]
+    svc = ComponentService(jira_service)
+    assert svc.get_available_components() == ["alpha", "zeta"]
+    _, message = svc.find_component("totally-unrelated-xyz")
+    assert message.endswith("• alpha\n• zeta")
+
+
+def test_fetch_builds_match_indexes():
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+
+    import app.component_service as cs
+
+    cs._component_index.cache_clear()
+    jira_service = SimpleNamespace(project_key="PROJ", jira=MagicMock())
+    jira_service.jira.project_components.return_value = [SimpleNamespace(name="Web")]
+    ComponentService(jira_service).get_available_components()
+    assert cs._component_index.cache_info().currsize == 1
+
+
+def test_to_latin_returns_ascii_labels_unchanged():
+    from app.component_service import _to_latin
+
+    label = "component-a"
+    assert _to_latin(label) is label
+
+
+def test_concurrent_fetches_share_one_jira_call():
+    import threading
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def project_components(project_key):
+        calls.append(project_key)
+        started.set()
+        release.wait(timeout=5)
+        return [SimpleNamespace(name="Web")]
+
+    results = []
+
+    def worker():
+        jira_service = SimpleNamespace(project_key="PROJ", jira=MagicMock())
+        jira_service.jira.project_components.side_effect = project_components
+        results.append(ComponentService(jira_service).get_available_components())
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for t in threads:
+        t.start()
+    # Let every worker reach the in-flight fetch before it completes
+    started.wait(timeout=5)
+    release.wait(timeout=0.1)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert calls == ["PROJ"]
+    assert results == [["Web"]] * 5
+
+
+def test_fetched_components_are_reused_until_ttl(monkeypatch):
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+
+    now = [1000.0]
+    monkeypatch.setattr(cs.time, "monotonic", lambda: now[0])
+    jira = MagicMock()
+    jira.project_components.return_value = [SimpleNamespace(name="Web")]
+
+    # A new service per command, as the bot builds them
+    for _ in range(3):
+        service = ComponentService(SimpleNamespace(project_key="PROJ", jira=jira))
+        assert service.get_available_components() == ["Web"]
+    assert jira.project_components.call_count == 1
+
+    now[0] += cs.COMPONENT_CACHE_TTL + 1
+    ComponentService(SimpleNamespace(project_key="PROJ", jira=jira)).find_component(
+        "web"
+    )
+    assert jira.project_components.call_count == 2
+
+
+def test_failed_fetch_is_not_cached():
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+
+    jira = MagicMock()
+    jira.project_components.side_effect = [
+        RuntimeError("jira down"),
+        [SimpleNamespace(name="Web")],
+    ]
+    service = ComponentService(SimpleNamespace(project_key="PROJ", jira=jira))
+
+    assert service.get_available_components() == components
+    assert service.get_available_components() == ["Web"]
@@ -45,3 +45,8 @@ def test_no_key_disables_encryption(monkeypatch):
     svc = CryptoService()
     assert svc.encrypt_token("secret") is None
     assert svc.decrypt_token("whatever") is None
+
+
+def test_services_with_same_key_share_fernet(monkeypatch):
+    monkeypatch.setattr(Config, "TOKEN_ENCRYPTION_KEY", CryptoService.generate_key())
+    assert CryptoService()._fernet is CryptoService()._fernet
@@ -12,10 +12,29 @@ def db():
     """A DatabaseService whose ClickHouse Client is fully mocked."""
     with patch("app.database_service.Client") as mock_client_cls:
         client = mock_client_cls.return_value
-        client.execute.return_value = [[0]]  # default: SELECT 1 / counts
+        client.execute.return_value = []  # default: no rows
         svc = DatabaseService()
         svc.client = client
         yield svc
+        svc.close()  # stop any pending flush timer
+
+
+def test_compression_is_off_by_default(monkeypatch):
+    from app.config import Config
+
+    monkeypatch.setattr(Config, "CH_COMPRESSION", None)
+    with patch("app.database_service.Client") as mock_client_cls:
+        DatabaseService()
+    assert mock_client_cls.call_args.kwargs["compression"] is False
+
+
+def test_compression_from_config(monkeypatch):
+    from app.config import Config
+
+    monkeypatch.setattr(Config, "CH_COMPRESSION", "lz4")
+    with patch("app.database_service.Client") as mock_client_cls:
+        DatabaseService()
+    assert mock_client_cls.call_args.kwargs["compression"] == "lz4"
 
 
 # --------------------------------------------------------------- link CRUD ---
@@ -26,27 +45,134 @@ def test_link_exists_true(db):
     assert db.link_exists("ref", "AAI-1") is True
 
 
+def test_link_exists_ignores_tombstoned_links(db):
+    db.link_exists("ref", "AAI-1")
+    query = db.client.execute.call_args.args[0]
+    assert "HAVING argMax(is_deleted" in query
+    assert "count()" not in query
+
+
 def test_link_exists_false(db):
-    db.client.execute.return_value = [[0]]
+    db.client.execute.return_value = []
     assert db.link_exists("ref", "AAI-1") is False
 
 
 def test_insert_rejects_duplicate(db):
-    db.client.execute.return_value = [[1]]  # link_exists -> True
+    db.client.execute.return_value = [[1]]  # link already in ClickHouse
     ok, reason = db.insert_jira_issue_link("ref", "AAI-1")
     assert ok is False
     assert reason == "duplicate"
 
 
 def test_insert_success(db):
-    db.client.execute.return_value = [[0]]  # link_exists -> False
+    db.client.execute.return_value = []  # link not in ClickHouse yet
     ok, reason = db.insert_jira_issue_link("ref", "AAI-1")
     assert ok is True
     assert reason == ""
 
 
+def test_insert_is_buffered_until_flush(db):
+    db.client.execute.reset_mock()
+    db.insert_jira_issue_link("ref-1", "AAI-1")
+    db.insert_jira_issue_link("ref-2", "AAI-2")
+    queries = [c.args[0] for c in db.client.execute.call_args_list]
+    assert all("INSERT" not in q for q in queries)
+
+    db.client.execute.reset_mock()
+    assert db.flush() is True
+    db.client.execute.assert_called_once()
+    query, rows = db.client.execute.call_args.args
+    assert "INSERT INTO jira_issues" in query
+    assert [(r["message_ref"], r["jira_key"]) for r in rows] == [
+        ("ref-1", "AAI-1"),
+        ("ref-2", "AAI-2"),
+    ]
+
+
+def test_buffered_link_is_a_duplicate_and_exists(db):
+    assert db.insert_jira_issue_link("ref", "AAI-1") == (True, "")
+    assert db.insert_jira_issue_link("ref", "AAI-1") == (False, "duplicate")
+    assert db.link_exists("ref", "AAI-1") is True
+
+
+def test_failed_flush_keeps_rows_buffered(db):
+    db.insert_jira_issue_link("ref", "AAI-1")
+    db.client.execute.side_effect = RuntimeError("db down")
+    assert db.flush() is False
+    db.client.execute.side_effect = None
+    db.client.execute.reset_mock()
+    assert db.flush() is True
+    db.client.execute.assert_called_once()
+    assert db._flush_timer is None
+
+
+def test_failed_flush_is_retried_with_backoff(db, monkeypatch):
+    import app.database_service as dbs
+
+    monkeypatch.setattr(dbs, "INSERT_FLUSH_INTERVAL", 5)
+    monkeypatch.setattr(dbs.threading, "Timer", MagicMock())
+    db.insert_jira_issue_link("ref", "AAI-1")
+    db.client.execute.side_effect = RuntimeError("db down")
+
+    delays = []
+    for _ in range(4):
+        assert db.flush() is False
+        delays.append(dbs.threading.Timer.call_args.args[0])
+    assert delays == [10, 20, 30.0, 30.0]
+
+    db.client.execute.side_effect = None
+    assert db.flush() is True
+    assert db._flush_failures == 0
+
+
+def test_buffer_flushes_on_timer(db, monkeypatch):
+    import app.database_service as dbs
+
+    monkeypatch.setattr(dbs, "INSERT_FLUSH_INTERVAL", 0.01)
+    db.insert_jira_issue_link("ref", "AAI-1")
+    timer = db._flush_timer
+    timer.join(timeout=5)
+    assert db._insert_buffer == []
+
+
+def test_reads_flush_buffer_first(db):
+    db.insert_jira_issue_link("ref", "AAI-1")
+    db.client.execute.reset_mock()
+    db.client.execute.return_value = [("AAI-1",)]
+    assert db.get_jira_keys_by_message_ref("ref") == ["AAI-1"]
+    first_query = db.client.execute.call_args_list[0].args[0]
+    assert "INSERT INTO jira_issues" in first_query
+
+
+def test_queries_do_not_ping_first(db):
+    db.client.execute.reset_mock()
+    db.client.execute.return_value = [["enc-token"]]
+    db.get_user_token(123)
+    db.client.execute.assert_called_once()
+    assert "SELECT 1" not in db.client.execute.call_args.args[0]
+
+
+def test_link_exists_reconnects_once_on_network_error(db):
+    from clickhouse_driver.errors import NetworkError
+
+    db.client.execute.side_effect = [NetworkError("gone"), [[1]], [[1]]]
+    assert db.link_exists("ref", "AAI-1") is True
+
+
+def test_insert_jira_issue_links_sends_one_block(db):
+    db.client.execute.reset_mock()
+    assert db.insert_jira_issue_links([("ref-1", "AAI-1"), ("ref-2", "AAI-2")])
+    db.client.execute.assert_called_once()
+    query, rows = db.client.execute.call_args.args
+    assert query.strip().endswith("VALUES")
+    assert rows == [
+        {"message_ref": "ref-1", "jira_key": "AAI-1"},
+        {"message_ref": "ref-2", "jira_key": "AAI-2"},
+    ]
+
+
 def test_delete_not_found(db):
-    db.client.execute.return_value = [[0]]  # link_exists -> False
+    db.client.execute.return_value = []  # link_exists -> False
     ok, reason = db.delete_jira_issue_link("ref", "AAI-1")
     assert ok is False
     assert reason == "not_found"
@@ -59,9 +185,42 @@ def test_delete_success(db):
     assert reason == ""
 
 
+def test_delete_writes_tombstone_instead_of_mutation(db):
+    db.client.execute.return_value = [[1]]
+    db.delete_jira_issue_link("ref", "AAI-1")
+    db.delete_user_token(123)
+    queries = [c.args[0] for c in db.client.execute.call_args_list]
+    assert not any("ALTER TABLE" in q for q in queries)
+    tombstones = [q for q in queries if "is_deleted" in q and "INSERT" in q]
+    assert len(tombstones) == 2
+
+
+def test_versions_have_sub_second_precision(db):
+    db.client.execute.return_value = [[1]]
+    db.delete_jira_issue_link("ref", "AAI-1")
+    db.save_user_token(123, "enc-token")
+    db.delete_user_token(123)
+    db.get_jira_keys_by_message_ref("ref")
+    queries = [c.args[0] for c in db.client.execute.call_args_list]
+
+    # Same-second writes are ordered by updated_at alone, as in the engine
+    writes = [q for q in queries if "INSERT" in q]
+    assert len(writes) == 3
+    assert all("now64(6)" in q for q in writes)
+    reads = [q for q in queries if "argMax" in q]
+    assert reads
+    assert all("(updated_at, is_deleted)" not in q for q in reads)
+
+
 def test_get_jira_keys_by_message_ref(db):
-    db.client.execute.return_value = [["AAI-1"], ["AAI-2"]]
+    db.client.execute.return_value = [("AAI-1", "AAI-2")]  # one column
     assert db.get_jira_keys_by_message_ref("ref") == ["AAI-1", "AAI-2"]
+    assert db.client.execute.call_args.kwargs["columnar"] is True
+
+
+def test_get_jira_keys_by_message_ref_no_rows(db):
+    db.client.execute.return_value = []
+    assert db.get_jira_keys_by_message_ref("ref") == []
 
 
 # --------------------------------------------------------------- user tokens ---
@@ -79,6 +238,14 @@ def test_get_user_token_found(db):
     assert db.get_user_token(123) == "enc-token"
 
 
+def test_get_user_token_reads_latest_without_final(db):
+    db.client.execute.return_value = [["enc-token"]]
+    db.get_user_token(123)
+    query = db.client.execute.call_args.args[0]
+    assert "argMax(jira_token_encrypted" in query
+    assert "FINAL" not in query
+
+
 def test_get_user_token_missing(db):
     db.client.execute.return_value = []
     assert db.get_user_token(123) is None
@@ -88,7 +255,38 @@ def test_user_is_registered(db):
     db.client.execute.return_value = [["enc-token"]]
     assert db.user_is_registered(123) is True
     db.client.execute.return_value = []
-    assert db.user_is_registered(123) is False
+    assert db.user_is_registered(456) is False
+
+
+def test_get_user_token_is_cached(db):
+    db.client.execute.return_value = [["enc-token"]]
+    assert db.get_user_token(123) == "enc-token"
+    db.client.execute.reset_mock()
+    assert db.get_user_token(123) == "enc-token"
+    db.client.execute.assert_not_called()
+
+
+def test_token_cache_expires(db, monkeypatch):
+    import app.database_service as dbs
+
+    monkeypatch.setattr(dbs, "TOKEN_CACHE_TTL", -1)
+    db.client.execute.return_value = [["enc-token"]]
+    db.get_user_token(123)
+    db.client.execute.reset_mock()
+    db.get_user_token(123)
+    db.client.execute.assert_called_once()
+
+
+def test_save_and_delete_invalidate_token_cache(db):
+    db.client.execute.return_value = [["old-token"]]
+    db.get_user_token(123)
+    db.save_user_token(123, "new-token")
+    db.client.execute.return_value = [["new-token"]]
+    assert db.get_user_token(123) == "new-token"
+
+    assert db.delete_user_token(123) == (True, "")
+    db.client.execute.return_value = []
+    assert db.get_user_token(123) is None
 
 
 def test_delete_user_token_not_found(db):
@@ -99,14 +297,7 @@ def test_delete_user_token_not_found(db):
 
 
 def test_error_paths_return_false(db):
-    # Let the health-check ("SELECT 1") succeed but fail the real query, so
-    # _ensure_connection does not mask the error by reconnecting.
-    def exec_side(query, *args, **kwargs):
-        if "SELECT 1" in query:
-            return [[1]]
-        raise RuntimeError("db down")
-
-    db.client.execute.side_effect = exec_side
+    db.client.execute.side_effect = RuntimeError("db down")
     ok, reason = db.save_user_token(1, "t")
     assert ok is False
     assert reason == "error"
@@ -0,0 +1,111 @@
+"""Tests for the /desc command handler."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app import telegram_bot as tb
+from app.telegram_bot import TelegramBot
+
+
+@pytest.fixture(autouse=True)
+def allow_all(monkeypatch):
+    monkeypatch.setattr(
+        tb.UserConfig, "is_user_allowed", lambda username, user_id: True
+    )
+
+
+@pytest.fixture
+def mock_jira():
+    jira = MagicMock()
+    jira.get_issue_url.side_effect = lambda key: f"https://jira/browse/{key}"
+    jira.get_issue.return_value = {
+        "key": "AAI-1",
+        "summary": "Broken login",
+        "description": "Steps",
+        "status": "Open",
+        "issue_type": "Bug",
+        "assignee": "Alice",
+        "reporter": "Bob",
+        "attachments": [
+            {
+                "id": "1",
+                "filename": "a.png",
+                "mimeType": "image/png",
+                "content_url": "u1",
+            },
+            {
+                "id": "2",
+                "filename": "b.png",
+                "mimeType": "image/png",
+                "content_url": "u2",
+            },
+            {
+                "id": "3",
+                "filename": "c.log",
+                "mimeType": "text/plain",
+                "content_url": "u3",
+            },
+        ],
+    }
+    return jira
+
+
+@pytest.fixture
+def bot(mock_jira):
+    b = object.__new__(TelegramBot)
+    b._get_user_jira_service = lambda user_id: mock_jira
+    return b
+
+
+@pytest.fixture
+def downloads(mock_jira, tmp_path):
+    paths = []
+    for name in ("a.png", "b.png", "c.log"):
+        path = tmp_path / name
+        path.write_bytes(b"data")
+        paths.append(path)
+    mock_jira.download_attachments.return_value = [str(p) for p in paths]
+    return paths
+
+
+async def test_desc_downloads_all_attachments_in_one_batch(
+    bot, mock_jira, downloads, update_factory
+):
+    upd = update_factory(text="/desc AAI-1")
+
+    await bot.desc_command(upd, None)
+
+    mock_jira.download_attachments.assert_called_once()
+    (batch,) = mock_jira.download_attachments.call_args.args
+    assert [a["id"] for a in batch] == ["1", "2", "3"]
+    mock_jira.download_attachment.assert_not_called()
+    assert upd.message.reply_photo.await_count == 2
+    assert upd.message.reply_document.await_count == 1
+    assert not any(p.exists() for p in downloads)
+
+
+async def test_desc_removes_downloads_when_sending_fails(
+    bot, mock_jira, downloads, update_factory
+):
+    upd = update_factory(text="/desc AAI-1")
+    upd.message.reply_photo.side_effect = RuntimeError("telegram down")
+    upd.message.reply_document.side_effect = RuntimeError("telegram down")
+
+    await bot.desc_command(upd, None)
+
+    assert not any(p.exists() for p in downloads)
+
+
+async def test_desc_sends_attachment_contents(
+    bot, mock_jira, downloads, update_factory
+):
+    upd = update_factory(text="/desc AAI-1")
+
+    await bot.desc_command(upd, None)
+
+    photos = [c.kwargs["photo"] for c in upd.message.reply_photo.await_args_list]
+    assert photos == [b"data", b"data"]
+    document = upd.message.reply_document.await_args.kwargs
+    assert document["document"] == b"data"
+    assert document["filename"] == "c.log"
@@ -0,0 +1,88 @@
+"""Tests for TelegramBot._download_photos."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.telegram_bot import TelegramBot
+
+
+def make_photo(file_id):
+    return SimpleNamespace(
+        file_id=file_id,
+        file_unique_id=f"u-{file_id}",
+        file_size=10,
+        width=1,
+        height=1,
+    )
+
+
+@pytest.fixture
+def bot():
+    b = object.__new__(TelegramBot)
+    b.application = MagicMock()
+    return b
+
+
+async def test_photos_download_concurrently_in_order(bot):
+    in_flight = 0
+    peak = 0
+
+    async def get_file(file_id):
+        async def download_as_bytearray():
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return bytearray(file_id.encode())
+
+        return SimpleNamespace(download_as_bytearray=download_as_bytearray)
+
+    bot.application.bot.get_file = AsyncMock(side_effect=get_file)
+    photos = [make_photo(f"f{i}") for i in range(3)]
+
+    files = await bot._download_photos(photos)
+
+    assert peak == 3
+    assert files == [
+        ("photo_0.jpg", b"f0"),
+        ("photo_1.jpg", b"f1"),
+        ("photo_2.jpg", b"f2"),
+    ]
+
+
+async def test_failed_photo_is_skipped(bot):
+    async def get_file(file_id):
+        async def download_as_bytearray():
+            if file_id == "bad":
+                raise RuntimeError("telegram down")
+            return bytearray(b"ok")
+
+        return SimpleNamespace(download_as_bytearray=download_as_bytearray)
+
+    bot.application.bot.get_file = AsyncMock(side_effect=get_file)
+
+    files = await bot._download_photos([make_photo("ok"), make_photo("bad")])
+
+    assert files == [("photo_0.jpg", b"ok")]
+
+
+async def test_same_file_is_downloaded_once(bot):
+    async def get_file(file_id):
+        return SimpleNamespace(
+            download_as_bytearray=AsyncMock(return_value=bytearray(b"x"))
+        )
+
+    bot.application.bot.get_file = AsyncMock(side_effect=get_file)
+    # Same file seen through two different file_ids
+    repeat = make_photo("f2")
+    repeat.file_unique_id = "u-f1"
+
+    files = await bot._download_photos([make_photo("f1"), repeat, make_photo("f3")])
+
+    assert len(files) == 2
+    fetched = [c.args[0] for c in bot.application.bot.get_file.await_args_list]
+    assert fetched == ["f1", "f3"]
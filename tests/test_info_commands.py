@@ -0,0 +1,43 @@
+"""Tests for the /start, /help and /userinfo command handlers."""
+
+import pytest
+
+from app import telegram_bot as tb
+from app.telegram_bot import TelegramBot
+
+
+@pytest.fixture
+def bot():
+    return object.__new__(TelegramBot)
+
+
+async def test_help_replies_with_help_text(bot, update_factory):
+    upd = update_factory(text="/help")
+
+    await bot.help_command(upd, None)
+
+    upd.message.reply_text.assert_awaited_once_with(TelegramBot.HELP_TEXT)
+    assert "/task <description>" in TelegramBot.HELP_TEXT
+
+
+async def test_start_replies_with_start_text(bot, update_factory):
+    upd = update_factory(text="/start")
+
+    await bot.start_command(upd, None)
+
+    upd.message.reply_text.assert_awaited_once_with(TelegramBot.START_TEXT)
+
+
+async def test_userinfo_fills_in_user_fields(bot, update_factory, monkeypatch):
+    monkeypatch.setattr(
+        tb.UserConfig, "is_user_allowed", lambda username, user_id: False
+    )
+    upd = update_factory(text="/userinfo", username=None, user_id=42)
+
+    await bot.userinfo_command(upd, None)
+
+    (text,) = upd.message.reply_text.await_args.args
+    assert "🆔 User ID: 42" in text
+    assert "👤 Username: @Not set" in text
+    assert "📛 Name: Test \n" in text
+    assert "✅ Access: Not authorized" in text
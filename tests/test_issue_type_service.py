@@ -28,6 +28,12 @@ def test_fuzzy_typo_match():
     assert message == ""
 
 
+def test_single_letter_is_not_a_match():
+    issue_type, message = IssueTypeService.find_issue_type("b")
+    assert issue_type == "Story"
+    assert "No close match" in message
+
+
 def test_unknown_returns_default_and_message():
     issue_type, message = IssueTypeService.find_issue_type("epic-supertask")
     assert issue_type == "Story"  # default fallback
@@ -41,3 +47,8 @@ def test_get_available_issue_types_returns_copy():
     types.append("Task")
     # Mutating the returned list must not affect subsequent calls
     assert IssueTypeService.get_available_issue_types() == ["Story", "Bug"]
+
+
+def test_repeated_label_is_memoized():
+    first = IssueTypeService.find_issue_type("stroy")
+    assert IssueTypeService.find_issue_type("stroy") is first
@@ -1,5 +1,6 @@
 """Tests for JiraService, focused on search, JQL escaping, and key handling."""
 
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -12,6 +13,9 @@ from app.jira_service import JiraService
 @pytest.fixture
 def jira_service():
     """A JiraService with the underlying JIRA client mocked out (no network)."""
+    JiraService._clients.clear()
+    JiraService._issue_cache.clear()
+    JiraService._rate_limited_until.clear()
     with patch("app.jira_service.JIRA") as mock_jira_cls:
         svc = JiraService.with_token("dummy-token")
         # svc.jira is the instance returned by JIRA(...)
@@ -28,6 +32,122 @@ def _make_issue(key, summary, status, issue_type):
     return issue
 
 
+# -------------------------------------------------------------- connection ---
+
+
+def test_clients_are_shared_per_token():
+    JiraService._clients.clear()
+    with patch("app.jira_service.JIRA") as mock_jira_cls:
+        mock_jira_cls.side_effect = lambda **kwargs: MagicMock()
+        a = JiraService.with_token("token-a")
+        b = JiraService.with_token("token-a")
+        c = JiraService.with_token("token-b")
+    JiraService._clients.clear()
+
+    assert a.jira is b.jira
+    assert c.jira is not a.jira
+    assert mock_jira_cls.call_count == 2
+
+
+def test_clients_are_keyed_by_token_hash_and_bounded(monkeypatch):
+    import app.jira_service as js
+
+    monkeypatch.setattr(js, "MAX_CACHED_CLIENTS", 2)
+    JiraService._clients.clear()
+    with patch("app.jira_service.JIRA") as mock_jira_cls:
+        mock_jira_cls.side_effect = lambda **kwargs: MagicMock()
+        a = JiraService.with_token("token-a").jira
+        JiraService.with_token("token-b")
+        JiraService.with_token("token-a")  # a is now the most recently used
+        JiraService.with_token("token-c")
+        keys = list(JiraService._clients)
+    JiraService._clients.clear()
+
+    assert "token-a" not in keys
+    assert keys == [
+        JiraService._token_key_for("token-a"),
+        JiraService._token_key_for("token-c"),
+    ]
+    a.close.assert_not_called()
+
+
+def test_idle_client_is_replaced(monkeypatch):
+    JiraService._clients.clear()
+    with (
+        patch("app.jira_service.JIRA") as mock_jira_cls,
+        patch("app.jira_service.time.monotonic") as monotonic,
+    ):
+        mock_jira_cls.side_effect = lambda **kwargs: MagicMock()
+        monotonic.return_value = 0.0
+        first = JiraService.with_token("token-a").jira
+        monotonic.return_value = 10_000.0
+        second = JiraService.with_token("token-a").jira
+    JiraService._clients.clear()
+
+    assert second is not first
+    first.close.assert_called_once()
+
+
+def test_forget_token_drops_client_and_caches(jira_service):
+    key = jira_service._token_key
+    client = JiraService._clients[key][0]
+    JiraService._rate_limited_until[key] = 1.0
+    JiraService._issue_cache[(key, "AAI-1")] = ({}, 1.0, True)
+    JiraService._issue_cache[("other", "AAI-1")] = ({}, 1.0, True)
+
+    JiraService.forget_token("dummy-token")
+
+    assert key not in JiraService._clients
+    assert JiraService._rate_limited_until == {}
+    assert list(JiraService._issue_cache) == [("other", "AAI-1")]
+    client.close.assert_called_once()
+
+
+def test_client_skips_server_info_and_mounts_pooled_adapter():
+    from requests.adapters import HTTPAdapter
+
+    JiraService._clients.clear()
+    with patch("app.jira_service.JIRA") as mock_jira_cls:
+        JiraService.with_token("dummy-token")
+    JiraService._clients.clear()
+
+    assert mock_jira_cls.call_args.kwargs["get_server_info"] is False
+    session = mock_jira_cls.return_value._session
+    mounted = dict(c.args for c in session.mount.call_args_list)
+    assert isinstance(mounted["https://"], HTTPAdapter)
+    assert mounted["https://"]._pool_maxsize == 64
+
+
+def test_rate_limit_hook_records_retry_after():
+    JiraService._rate_limited_until.clear()
+    ok = MagicMock(status_code=200, headers={})
+    limited = MagicMock(status_code=429, headers={"Retry-After": "5"})
+    dated = MagicMock(status_code=429, headers={"Retry-After": "Wed, 21 Oct"})
+
+    JiraService._note_rate_limit("token-a", ok)
+    JiraService._note_rate_limit("token-b", dated)
+    assert JiraService._rate_limited_until == {}
+
+    with patch("app.jira_service.time.monotonic", return_value=100.0):
+        JiraService._note_rate_limit("token-a", limited)
+    assert JiraService._rate_limited_until == {"token-a": 105.0}
+    JiraService._rate_limited_until.clear()
+
+
+def test_create_story_waits_out_rate_limit(jira_service):
+    jira_service.jira.create_issue.return_value = MagicMock(key="AAI-1")
+    JiraService._rate_limited_until[jira_service._token_key] = 103.0
+
+    with (
+        patch("app.jira_service.time.monotonic", return_value=100.0),
+        patch("app.jira_service.time.sleep") as sleep,
+    ):
+        jira_service.create_story("Summary")
+
+    sleep.assert_called_once_with(3.0)
+    jira_service.jira.create_issue.assert_called_once()
+
+
 # ---------------------------------------------------------------- escaping ---
 
 
@@ -181,6 +301,83 @@ def test_get_issue_returns_dict(jira_service):
     assert data["attachments"] == []
     # Digit-only key should be prefixed with the project key before lookup
     assert jira_service.jira.issue.call_args[0][0] == "AAI-5"
+    fields = jira_service.jira.issue.call_args.kwargs["fields"].split(",")
+    assert "attachment" in fields and "summary" in fields
+    assert "expand" not in jira_service.jira.issue.call_args.kwargs
+
+
+def test_get_issue_lists_attachments(jira_service):
+    attachment = MagicMock(
+        id="10", filename="a.png", size=3, mimeType="image/png", content="u"
+    )
+    jira_service.jira.issue.return_value.fields.attachment = [attachment]
+
+    data = jira_service.get_issue("AAI-5")
+
+    assert data["attachments"] == [
+        {
+            "id": "10",
+            "filename": "a.png",
+            "size": 3,
+            "mimeType": "image/png",
+            "content_url": "u",
+        }
+    ]
+
+
+def test_get_issue_without_attachments(jira_service):
+    jira_service.jira.issue.return_value = MagicMock(key="AAI-5")
+
+    data = jira_service.get_issue("AAI-5", with_attachments=False)
+
+    assert data["attachments"] == []
+    fields = jira_service.jira.issue.call_args.kwargs["fields"].split(",")
+    assert "attachment" not in fields
+    # A cached entry without attachments can't serve a full lookup
+    jira_service.get_issue("AAI-5")
+    assert jira_service.jira.issue.call_count == 2
+    jira_service.get_issue("AAI-5", with_attachments=False)
+    assert jira_service.jira.issue.call_count == 2
+
+
+def test_get_issue_is_cached_briefly(jira_service):
+    jira_service.jira.issue.return_value = MagicMock(key="AAI-5")
+
+    first = jira_service.get_issue("AAI-5")
+    assert jira_service.get_issue("AAI-5") is first
+    jira_service.jira.issue.assert_called_once()
+
+    # Adding an attachment makes the cached attachment list stale
+    jira_service.add_attachment("AAI-5", "shot.png", b"png")
+    jira_service.jira.issue.reset_mock()
+    jira_service.get_issue("AAI-5")
+    jira_service.jira.issue.assert_called()
+
+
+def test_get_issue_cache_expires(jira_service, monkeypatch):
+    import app.jira_service as js
+
+    monkeypatch.setattr(js, "ISSUE_CACHE_TTL", -1)
+    jira_service.jira.issue.return_value = MagicMock(key="AAI-5")
+    jira_service.get_issue("AAI-5")
+    jira_service.get_issue("AAI-5")
+    assert jira_service.jira.issue.call_count == 2
+
+
+def test_get_issue_cache_is_safe_across_threads(jira_service, monkeypatch):
+    import app.jira_service as js
+
+    # A small cache keeps evictions (and iteration) racing with inserts
+    monkeypatch.setattr(js, "ISSUE_CACHE_SIZE", 4)
+    jira_service.jira.issue.side_effect = lambda key, fields: MagicMock(key=key)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(
+            pool.map(jira_service.get_issue, [f"AAI-{i}" for i in range(400)])
+        )
+
+    assert all(result is not None for result in results)
+    assert len(JiraService._issue_cache) <= 4
 
 
 def test_get_issue_not_found_returns_none(jira_service):
@@ -223,11 +420,32 @@ def test_create_story_success(jira_service):
     assert fields["labels"] == ["tg_user:alice"]
 
 
+def test_create_story_does_not_preflight_project(jira_service):
+    jira_service.jira.create_issue.return_value = MagicMock(key="AAI-1")
+
+    key, error = jira_service.create_story(
+        summary="A", component_name="org", project_key="AAI"
+    )
+
+    assert key == "AAI-1"
+    assert error is None
+    jira_service.jira.project.assert_not_called()
+    jira_service.jira.project_components.assert_not_called()
+
+
+def _field_error(errors):
+    response = MagicMock()
+    response.json.return_value = {"errors": errors}
+    return JIRAError(status_code=400, text="Bad Request", response=response)
+
+
 def test_create_story_component_not_found(jira_service):
-    jira_service.jira.project.return_value = MagicMock(name="proj")
+    jira_service.jira.create_issue.side_effect = _field_error(
+        {"components": "Component name 'nonexistent' is not valid"}
+    )
     jira_service.jira.project_components.return_value = [
-        _component("backend"),
         _component("frontend"),
+        _component("backend"),
     ]
 
     key, error = jira_service.create_story(
@@ -235,9 +453,21 @@ def test_create_story_component_not_found(jira_service):
     )
 
     assert key is None
-    assert "not found" in error
-    assert "backend" in error and "frontend" in error
-    jira_service.jira.create_issue.assert_not_called()
+    assert "Component 'nonexistent' not found in project AAI" in error
+    assert error.endswith("• backend\n• frontend")
+
+
+def test_create_story_project_not_found(jira_service):
+    jira_service.jira.create_issue.side_effect = _field_error(
+        {"project": "valid project is required"}
+    )
+
+    key, error = jira_service.create_story(
+        summary="Fix it", component_name="org", project_key="NOPE"
+    )
+
+    assert key is None
+    assert "Project 'NOPE' not found" in error
 
 
 def test_create_story_adds_to_sprint(jira_service):
@@ -257,7 +487,7 @@ def test_create_story_adds_to_sprint(jira_service):
 
 
 def test_create_story_jira_error(jira_service):
-    jira_service.jira.project.side_effect = JIRAError(status_code=500, text="boom")
+    jira_service.jira.create_issue.side_effect = JIRAError(status_code=500, text="boom")
 
     key, error = jira_service.create_story(
         summary="S", component_name="org", project_key="AAI"
@@ -364,3 +594,98 @@ def test_create_story_no_epic_skips_link(jira_service):
     jira_service.create_story(summary="S", component_name="org", project_key="AAI")
 
     jira_service.jira.add_issues_to_epic.assert_not_called()
+
+
+def test_create_story_attachment_failure_does_not_stop_others(jira_service):
+    jira_service.jira.create_issue.return_value = MagicMock(key="AAI-23")
+    uploaded = {}
+
+    def add_attachment(issue, attachment, filename):
+        if filename == "bad.png":
+            raise JIRAError(status_code=413, text="too large")
+        uploaded[filename] = attachment.read()
+
+    jira_service.jira.add_attachment.side_effect = add_attachment
+
+    key, error = jira_service.create_story(
+        summary="S",
+        component_name="org",
+        project_key="AAI",
+        attachments=[("bad.png", b"nope"), ("good.png", b"ok")],
+    )
+
+    assert key == "AAI-23"
+    assert error is None
+    assert jira_service.jira.add_attachment.call_count == 2
+    assert uploaded == {"good.png": b"ok"}
+
+
+# ------------------------------------------------------------- attachments ---
+
+
+def test_download_attachment_uses_jira_session(jira_service):
+    import io
+    import os
+
+    response = jira_service.jira._session.get.return_value
+    response.raw = io.BytesIO(b"hello world")
+    response.headers = {"Content-Length": "11"}
+
+    path = jira_service.download_attachment("https://jira/att/1", "a.txt")
+
+    try:
+        jira_service.jira._session.get.assert_called_once_with(
+            "https://jira/att/1", stream=True, headers={"Accept": "*/*"}
+        )
+        with open(path, "rb") as f:
+            assert f.read() == b"hello world"
+    finally:
+        os.unlink(path)
+
+
+def test_download_attachment_failure_returns_none(jira_service):
+    jira_service.jira._session.get.side_effect = JIRAError(status_code=404)
+    assert jira_service.download_attachment("https://jira/att/1", "a.txt") is None
+
+
+def test_add_attachment_uploads_from_memory(jira_service):
+    assert jira_service.add_attachment("AAI-1", "shot.png", b"png") is True
+
+    kwargs = jira_service.jira.add_attachment.call_args.kwargs
+    assert kwargs["filename"] == "shot.png"
+    assert kwargs["attachment"].read() == b"png"
+
+
+def test_add_attachment_failure_returns_false(jira_service):
+    jira_service.jira.add_attachment.side_effect = JIRAError(status_code=500)
+    assert jira_service.add_attachment("AAI-1", "shot.png", b"png") is False
+
+
+def test_download_attachments_keeps_order_and_failures(jira_service):
+    attachments = [
+        {"content_url": "https://jira/att/1", "filename": "a.txt"},
+        {"content_url": "https://jira/att/2", "filename": "b.txt"},
+    ]
+    with patch.object(
+        jira_service,
+        "download_attachment",
+        side_effect=lambda url, name: None if name == "b.txt" else f"/tmp/{name}",
+    ):
+        assert jira_service.download_attachments(attachments) == ["/tmp/a.txt", None]
+    assert jira_service.download_attachments([]) == []
+
+
+def test_download_attachment_trims_preallocated_space(jira_service):
+    import io
+    import os
+
+    response = jira_service.jira._session.get.return_value
+    # A compressed transfer's Content-Length need not match the decoded body
+    response.raw = io.BytesIO(b"short")
+    response.headers = {"Content-Length": "4096"}
+
+    path = jira_service.download_attachment("https://jira/att/1", "a.txt")
+    try:
+        assert os.path.getsize(path) == len(b"short")
+    finally:
+        os.unlink(path)
@@ -0,0 +1,115 @@
+"""Tests for photo caption commands and collecting media groups into one task."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+import app.telegram_bot as tb
+from app.telegram_bot import TelegramBot
+
+
+@pytest.fixture
+def bot(monkeypatch):
+    monkeypatch.setattr(tb, "_MEDIA_GROUP_WAIT", 0.01)
+    b = object.__new__(TelegramBot)
+    b._media_group_buffer = {}
+    b._media_group_timers = {}
+    b._media_group_pending = {}
+    b.application = MagicMock()
+    tasks = []
+    b.application.create_task = lambda coro: tasks.append(asyncio.create_task(coro))
+    b._tasks = tasks
+    b._create_jira_task = AsyncMock(return_value="AAI-1")
+    return b
+
+
+def album(make_update, n, caption):
+    updates = []
+    for i in range(n):
+        update = make_update()
+        update.message.media_group_id = "g1"
+        # Several sizes per photo; the last is the largest
+        update.message.photo = [f"small{i}", f"photo{i}"]
+        update.message.caption = caption if i == 0 else None
+        updates.append(update)
+    return updates
+
+
+async def flush(bot):
+    await asyncio.sleep(0.05)
+    await asyncio.gather(*bot._tasks)
+
+
+async def test_album_creates_one_task_with_all_photos(bot, update_factory):
+    context = SimpleNamespace(bot_data={})
+    updates = album(update_factory, 3, "/bug Login fails")
+
+    for update in updates:
+        await bot.photo_message_handler(update, context)
+    bot._create_jira_task.assert_not_called()
+    await flush(bot)
+
+    bot._create_jira_task.assert_awaited_once_with(
+        updates[0],
+        "Login fails",
+        ["photo0", "photo1", "photo2"],
+        forced_issue_type="Bug",
+    )
+    assert context.bot_data == {"task_g1": "AAI-1", "photo_count_g1": 3}
+    assert bot._media_group_buffer == {}
+    assert bot._media_group_timers == {}
+
+
+async def test_album_without_command_is_ignored(bot, update_factory):
+    context = SimpleNamespace(bot_data={})
+
+    for update in album(update_factory, 2, "holiday"):
+        await bot.photo_message_handler(update, context)
+    await flush(bot)
+
+    bot._create_jira_task.assert_not_called()
+    assert context.bot_data == {}
+
+
+async def test_photo_arriving_during_creation_is_added_to_task(bot, update_factory):
+    context = SimpleNamespace(bot_data={}, bot=MagicMock())
+    photo_file = MagicMock()
+    photo_file.download_as_bytearray = AsyncMock(return_value=bytearray(b"png"))
+    context.bot.get_file = AsyncMock(return_value=photo_file)
+    jira_service = MagicMock()
+    bot._get_user_jira_service = lambda telegram_id: jira_service
+
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def create_jira_task(*args, **kwargs):
+        started.set()
+        await release.wait()
+        return "AAI-1"
+
+    bot._create_jira_task = AsyncMock(side_effect=create_jira_task)
+    first, late = album(update_factory, 2, "/bug Login fails")
+    late.message.photo = [SimpleNamespace(file_id="late")]
+
+    await bot.photo_message_handler(first, context)
+    await started.wait()
+    # Arrives after the group was flushed but before the task key is stored
+    await bot.photo_message_handler(late, context)
+    assert bot._media_group_buffer == {}
+    release.set()
+    await asyncio.gather(*bot._tasks)
+
+    context.bot.get_file.assert_awaited_once_with("late")
+    jira_service.add_attachment.assert_called_once_with("AAI-1", "photo_1.jpg", b"png")
+    assert context.bot_data == {"task_g1": "AAI-1", "photo_count_g1": 2}
+    assert bot._media_group_pending == {}
+
+
+def test_caption_keeps_description_line_breaks():
+    assert tb._parse_caption_command("/task\nLogin fails desc: step 1\nstep 2 ") == (
+        "Login fails desc: step 1\nstep 2",
+        None,
+    )
+    assert tb._parse_caption_command("/story") == ("", "Story")
+    assert tb._parse_caption_command("holiday") is None
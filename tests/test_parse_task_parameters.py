@@ -1,5 +1,6 @@
-"""Tests for TelegramBot._parse_task_parameters (the parameter-parsing regex)."""
+"""Tests for TelegramBot._parse_task_parameters (parameter parsing)."""
 
+import threading
 from unittest.mock import MagicMock
 
 import pytest
@@ -98,6 +99,12 @@ async def test_link_explicit_key_preserved(bot, update_factory):
     assert r["link"] == "SV-99"
 
 
+async def test_link_non_ascii_digits_not_prefixed(bot, update_factory):
+    upd = update_factory()
+    r = parsed(await bot._parse_task_parameters("Fix bug link: ۱۲۳", upd))
+    assert r["link"] == "۱۲۳"
+
+
 async def test_project_parameter_uppercased(bot, update_factory):
     upd = update_factory()
     r = parsed(await bot._parse_task_parameters("New feature project: sv link: 5", upd))
@@ -111,6 +118,81 @@ async def test_newlines_collapsed_in_summary(bot, update_factory):
     assert r["summary"] == "line one line two"
 
 
+async def test_uppercase_keywords_keep_value_case(bot, update_factory):
+    upd = update_factory()
+    r = parsed(
+        await bot._parse_task_parameters("Fix Login DESC: Steps To Reproduce", upd)
+    )
+    assert r["summary"] == "Fix Login"
+    assert r["description"] == "Steps To Reproduce"
+
+
+async def test_keywords_found_after_multichar_lowercase(bot, update_factory):
+    # "İ".lower() is two characters, so offsets in a lowercased copy shift
+    upd = update_factory()
+    r = parsed(await bot._parse_task_parameters("İzmir Desc: Details", upd))
+    assert r["summary"] == "İzmir"
+    assert r["description"] == "Details"
+
+
+async def test_keyword_inside_a_word_is_not_a_parameter(bot, update_factory):
+    upd = update_factory()
+    r = parsed(await bot._parse_task_parameters("Fix prototype: login desc: x", upd))
+    assert r["summary"] == "Fix prototype: login"
+    assert r["issue_type"] == "Story"
+    assert r["description"] == "x"
+
+
+async def test_blank_parameter_is_ignored(bot, update_factory):
+    upd = update_factory()
+    r = parsed(await bot._parse_task_parameters("Fix login type: desc: Steps", upd))
+    assert r["summary"] == "Fix login"
+    assert r["issue_type"] == "Story"
+    assert r["description"] == "Steps"
+    assert r["stop"] is False
+
+
+async def test_long_whitespace_run_in_value(bot, update_factory):
+    upd = update_factory()
+    text = "Fix desc: a" + " " * 20000 + "b"
+    r = parsed(await bot._parse_task_parameters(text, upd))
+    assert r["summary"] == "Fix"
+    assert r["description"] == "a" + " " * 20000 + "b"
+
+
+async def test_forced_issue_type_ignores_type_parameter(bot, update_factory):
+    upd = update_factory()
+    r = parsed(
+        await bot._parse_task_parameters(
+            "Login fails type: superepic", upd, forced_issue_type="Bug"
+        )
+    )
+    assert r["summary"] == "Login fails"
+    assert r["issue_type"] == "Bug"
+    assert r["stop"] is False
+    upd.message.reply_text.assert_not_awaited()
+
+
+async def test_summary_without_parameters_is_truncated(bot, update_factory):
+    upd = update_factory()
+    r = parsed(await bot._parse_task_parameters("x" * 300, upd))
+    assert r["summary"] == "x" * 252 + "..."
+
+
+async def test_cyrillic_summary_at_limit_is_kept(bot, update_factory):
+    upd = update_factory()
+    r = parsed(await bot._parse_task_parameters("ж" * 255, upd))
+    assert r["summary"] == "ж" * 255
+
+
+async def test_emoji_count_twice_towards_summary_limit(bot, update_factory):
+    upd = update_factory()
+    # 151 characters, but 301 UTF-16 units; the cut falls inside an emoji
+    r = parsed(await bot._parse_task_parameters("a" + "🐛" * 150, upd))
+    assert r["summary"] == "a" + "🐛" * 125 + "..."
+    assert len(r["summary"].encode("utf-16-le")) <= 255 * 2
+
+
 async def test_component_match_success(bot, update_factory):
     upd = update_factory()
     component_service = MagicMock()
@@ -152,6 +234,34 @@ async def test_sprint_match_success(bot, update_factory):
     assert r["stop"] is False
 
 
+async def test_lookups_run_off_the_event_loop(bot, update_factory):
+    upd = update_factory()
+    threads = []
+
+    def lookup(result):
+        def record(*args):
+            threads.append(threading.get_ident())
+            return result
+
+        return record
+
+    component_service = MagicMock()
+    component_service.find_component.side_effect = lookup(("frontend", ""))
+    sprint_service = MagicMock()
+    sprint_service.find_sprint.side_effect = lookup((42, None))
+    r = parsed(
+        await bot._parse_task_parameters(
+            "Task component: ui sprint: s3",
+            upd,
+            component_service=component_service,
+            sprint_service=sprint_service,
+        )
+    )
+    assert (r["component"], r["sprint_id"]) == ("frontend", 42)
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
+
+
 async def test_sprint_error_stops(bot, update_factory):
     upd = update_factory()
     sprint_service = MagicMock()
@@ -0,0 +1,54 @@
+"""Tests for /register and /unregister dropping cached Jira clients."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.telegram_bot import TelegramBot
+
+
+@pytest.fixture
+def bot():
+    b = object.__new__(TelegramBot)
+    b.database_service = MagicMock()
+    b.database_service.get_user_token.return_value = b"encrypted-old"
+    b.database_service.user_is_registered.return_value = True
+    b.database_service.save_user_token.return_value = (True, None)
+    b.database_service.delete_user_token.return_value = (True, None)
+    b.crypto_service = MagicMock()
+    b.crypto_service.decrypt_token.return_value = "old-token-123"
+    b.crypto_service.encrypt_token.return_value = b"encrypted-new"
+    return b
+
+
+async def test_rejected_token_is_forgotten(bot, update_factory):
+    upd = update_factory(text="/register token: bad-token-123")
+
+    with patch("app.telegram_bot.JiraService") as jira_service_cls:
+        jira_service_cls.with_token.return_value.jira.myself.side_effect = RuntimeError(
+            "401"
+        )
+        await bot.register_command(upd, None)
+
+    jira_service_cls.forget_token.assert_called_once_with("bad-token-123")
+    bot.database_service.save_user_token.assert_not_called()
+
+
+async def test_reregistering_forgets_previous_token(bot, update_factory):
+    upd = update_factory(text="/register token: new-token-123")
+
+    with patch("app.telegram_bot.JiraService") as jira_service_cls:
+        await bot.register_command(upd, None)
+
+    jira_service_cls.forget_token.assert_called_once_with("old-token-123")
+    bot.database_service.save_user_token.assert_called_once()
+
+
+async def test_unregister_forgets_stored_token(bot, update_factory):
+    upd = update_factory(text="/unregister")
+
+    with patch("app.telegram_bot.JiraService") as jira_service_cls:
+        await bot.unregister_command(upd, None)
+
+    jira_service_cls.forget_token.assert_called_once_with("old-token-123")
+    bot.database_service.delete_user_token.assert_called_once_with(1)
@@ -1,5 +1,6 @@
 """Tests for the /search command handler."""
 
+import threading
 from unittest.mock import MagicMock
 
 import pytest
@@ -143,3 +144,24 @@ async def test_search_denied_for_unauthorized(mock_jira, update_factory, monkeyp
     body = upd.message.reply_text.call_args_list[-1].args[0]
     assert "Access denied" in body
     mock_jira.search_issues.assert_not_called()
+
+
+async def test_search_runs_off_the_event_loop(bot, mock_jira, update_factory):
+    threads = []
+
+    def get_user_jira_service(user_id):
+        threads.append(threading.get_ident())
+        return mock_jira
+
+    def search_issues(*args, **kwargs):
+        threads.append(threading.get_ident())
+        return [], None
+
+    bot._get_user_jira_service = get_user_jira_service
+    mock_jira.search_issues.side_effect = search_issues
+
+    await bot.search_command(update_factory(text="/search login"), None)
+
+    # The token lookup and the search itself both block
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
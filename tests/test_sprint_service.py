@@ -86,3 +86,152 @@ def test_find_sprint_empty_project():
     sprint_id, message = svc.find_sprint("anything")
     assert sprint_id is None
     assert "No sprints found" in message
+
+
+# ------------------------------------------------------------------ caching ---
+
+
+def _jira_with_sprints():
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+
+    jira = MagicMock()
+    jira.boards.return_value = [SimpleNamespace(id=7)]
+    # Combined "active,future" requests answer future first, like Jira may
+    jira.sprints.side_effect = lambda board_id, state, **kwargs: [
+        SimpleNamespace(id=1 if s == "active" else 2, name=s, state=s)
+        for s in reversed(state.split(","))
+    ]
+    return jira
+
+
+def _clear_sprint_caches():
+    import app.sprint_service as ss
+
+    ss._board_cache.clear()
+    ss._sprint_cache.clear()
+
+
+def test_boards_and_sprints_are_cached_across_services():
+    _clear_sprint_caches()
+    jira = _jira_with_sprints()
+
+    first = SprintService(jira)._get_all_sprints()
+    second = SprintService(jira)._get_all_sprints()
+
+    assert first == second
+    assert [s["id"] for s in first] == [1, 2]
+    jira.boards.assert_called_once()
+    jira.sprints.assert_called_once()
+
+
+def test_active_and_future_sprints_come_from_one_request():
+    _clear_sprint_caches()
+    jira = _jira_with_sprints()
+
+    result = SprintService(jira)._get_all_sprints()
+
+    jira.sprints.assert_called_once_with(7, maxResults=False, state="active,future")
+    assert [s["state"] for s in result] == ["active", "future"]
+
+
+def test_partial_sprint_list_is_not_cached():
+    _clear_sprint_caches()
+    jira = _jira_with_sprints()
+    jira.sprints.side_effect = RuntimeError("boom")
+
+    assert SprintService(jira)._get_all_sprints() == []
+    assert jira.sprints.call_count == 3  # combined, then one per state
+    jira.sprints.side_effect = None
+    jira.sprints.return_value = []
+    SprintService(jira)._get_all_sprints()
+    assert jira.sprints.call_count == 4
+
+
+def test_missing_board_drops_cached_board():
+    from jira.exceptions import JIRAError
+
+    import app.sprint_service as ss
+
+    _clear_sprint_caches()
+    jira = _jira_with_sprints()
+    jira.sprints.side_effect = JIRAError(status_code=404, text="gone")
+
+    SprintService(jira)._get_all_sprints()
+    assert ss._board_cache == {}
+
+
+def test_fallback_fetches_states_concurrently():
+    import threading
+    from types import SimpleNamespace
+
+    _clear_sprint_caches()
+    jira = _jira_with_sprints()
+    # Each call waits for the other: only passes if both are in flight at once
+    barrier = threading.Barrier(2, timeout=5)
+
+    def sprints(board_id, state, **kwargs):
+        if "," in state:
+            raise RuntimeError("combined request rejected")
+        barrier.wait()
+        return [SimpleNamespace(id=state, name=state, state=state)]
+
+    jira.sprints.side_effect = sprints
+    result = SprintService(jira)._get_all_sprints()
+    assert [s["state"] for s in result] == ["active", "future"]
+
+
+def test_find_sprint_transliterates_each_name_once(monkeypatch):
+    import app.sprint_service as ss
+
+    ss._normalize.cache_clear()
+    calls = []
+    real_translit = ss._ru_translit()
+
+    def counting_translit(text, *args, **kwargs):
+        calls.append(text)
+        return real_translit(text, *args, **kwargs)
+
+    monkeypatch.setattr(ss, "_ru_translit", lambda: counting_translit)
+    svc = _service()
+    svc._get_all_sprints = lambda: [
+        {"id": 10, "name": "2025Q4-S3_агент", "state": "future"},
+        {"id": 11, "name": "2025Q4-S1_backend", "state": "future"},
+    ]
+    svc.find_sprint("s3 agent")
+    svc.find_sprint("s3 agent")
+    assert sorted(calls) == sorted(["2025q4-s3_агент", "2025q4-s1_backend", "s3 agent"])
+
+
+def test_similarity_uses_indel_ratio():
+    svc = _service()
+    # 2 * matches / total length, as difflib's ratio() gave for this pair
+    assert svc._calculate_similarity("abcd", "abxy") == 0.5
+
+
+def test_full_word_match_skips_ratio_scoring(monkeypatch):
+    import app.sprint_service as ss
+
+    def fail(*args, **kwargs):
+        raise AssertionError("ratio scoring should be skipped")
+
+    monkeypatch.setattr(ss.fuzz, "ratio", fail)
+    assert _service()._calculate_similarity("2025Q4-S3_агент", "s3 agent") == 1.0
+
+
+def test_similarity_cutoff_zeroes_weak_ratios():
+    svc = _service()
+    assert svc._calculate_similarity("abcd", "abxy", score_cutoff=0.4) == 0.5
+    assert 0.0 < svc._calculate_similarity("abcdefghij", "abx") < 0.4
+    assert svc._calculate_similarity("abcdefghij", "abx", score_cutoff=0.4) == 0.0
+
+
+def test_ru_translit_matches_transliterate_library():
+    from transliterate import translit
+
+    from app.sprint_service import _ru_translit
+
+    for text in ["2025q4-s3_агент", "щука жёлтая", "plain"]:
+        assert _ru_translit()(text, reversed=True) == translit(
+            text, "ru", reversed=True
+        )
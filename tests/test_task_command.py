@@ -0,0 +1,139 @@
+"""Tests for the /task command handler."""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app import telegram_bot as tb
+from app.config import Config
+from app.telegram_bot import TelegramBot
+
+
+@pytest.fixture(autouse=True)
+def allow_all(monkeypatch):
+    monkeypatch.setattr(
+        tb.UserConfig, "is_user_allowed", lambda username, user_id: True
+    )
+    monkeypatch.setattr(Config, "JIRA_PROJECT_KEY", "AAI")
+    monkeypatch.setattr(Config, "JIRA_COMPONENT_NAME", "org")
+
+
+@pytest.fixture
+def mock_jira():
+    jira = MagicMock()
+    jira.create_story.return_value = ("AAI-7", None)
+    jira.get_issue_url.side_effect = lambda key: f"https://jira/browse/{key}"
+    return jira
+
+
+@pytest.fixture
+def bot(mock_jira):
+    b = object.__new__(TelegramBot)
+    b.component_service = None
+    b.sprint_service = None
+    b.assignee_service = None
+    b.epic_service = None
+    b._get_user_jira_service = lambda user_id: mock_jira
+    for name in ("component", "sprint", "assignee", "epic"):
+        setattr(b, f"_get_{name}_service", lambda jira_service: None)
+    return b
+
+
+async def test_task_sends_only_the_result_message(bot, mock_jira, update_factory):
+    upd = update_factory(text="/task Fix login bug")
+
+    await bot.task_command(upd, None)
+
+    mock_jira.create_story.assert_called_once()
+    upd.message.reply_chat_action.assert_awaited_once_with("typing")
+    upd.message.reply_text.assert_awaited_once()
+    (text,) = upd.message.reply_text.await_args.args
+    assert "AAI-7" in text
+    assert "https://jira/browse/AAI-7" in text
+
+
+async def test_task_reports_create_error(bot, mock_jira, update_factory):
+    mock_jira.create_story.return_value = (None, "❌ Project 'X' not found in Jira.")
+    upd = update_factory(text="/task Fix login bug")
+
+    await bot.task_command(upd, None)
+
+    upd.message.reply_text.assert_awaited_once_with("❌ Project 'X' not found in Jira.")
+
+
+async def test_task_creates_issue_off_the_event_loop(bot, mock_jira, update_factory):
+    threads = []
+
+    def create_story(**kwargs):
+        threads.append(threading.get_ident())
+        return "AAI-7", None
+
+    mock_jira.create_story.side_effect = create_story
+    mock_jira.link_issues.side_effect = lambda **kwargs: threads.append(
+        threading.get_ident()
+    )
+    upd = update_factory(text="/task Fix login bug link: 5")
+
+    await bot.task_command(upd, None)
+
+    mock_jira.link_issues.assert_called_once_with(
+        inward_issue="AAI-7", outward_issue="AAI-5"
+    )
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
+
+
+def test_labels_from_group_chat_and_first_name():
+    chat = SimpleNamespace(type="supergroup", title="Team - Web app")
+    user = SimpleNamespace(username=None, first_name="Anna-Maria K")
+
+    assert TelegramBot._build_labels(chat, user) == [
+        "tg_chat:Team___Web_app",
+        "tg_user:Anna_Maria_K",
+    ]
+
+
+def test_labels_from_private_chat_and_username():
+    chat = SimpleNamespace(type="private", title=None)
+    user = SimpleNamespace(username="alice", first_name="Alice")
+
+    assert TelegramBot._build_labels(chat, user) == [
+        "tg_chat:private",
+        "tg_user:alice",
+    ]
+
+
+async def test_bug_command_creates_a_bug(bot, mock_jira, update_factory):
+    upd = update_factory(text="/bug Login fails type: Story")
+
+    await bot.bug_command(upd, None)
+
+    kwargs = mock_jira.create_story.call_args.kwargs
+    assert kwargs["summary"] == "Login fails"
+    assert kwargs["issue_type"] == "Bug"
+
+
+async def test_unauthorized_user_cannot_create(
+    bot, mock_jira, update_factory, monkeypatch
+):
+    monkeypatch.setattr(
+        tb.UserConfig, "is_user_allowed", lambda username, user_id: False
+    )
+    upd = update_factory(text="/story New dashboard")
+
+    await bot.story_command(upd, None)
+
+    mock_jira.create_story.assert_not_called()
+    (text,) = upd.message.reply_text.await_args.args
+    assert text.startswith("❌ Access denied.")
+
+
+async def test_task_without_description_shows_usage(bot, mock_jira, update_factory):
+    upd = update_factory(text="/task")
+
+    await bot.task_command(upd, None)
+
+    mock_jira.create_story.assert_not_called()
+    upd.message.reply_text.assert_awaited_once_with(TelegramBot.TASK_USAGE_MSG)
@@ -0,0 +1,114 @@
+"""Tests for ChatOrderedUpdateProcessor."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+from telegram import Update
+
+from app.update_processor import ChatOrderedUpdateProcessor
+
+
+def make_update(chat_id):
+    update = MagicMock(spec=Update)
+    update.effective_chat.id = chat_id
+    return update
+
+
+async def test_updates_run_in_order_within_a_chat():
+    processor = ChatOrderedUpdateProcessor()
+    events = []
+
+    async def handle(name, delay):
+        events.append(f"start {name}")
+        await asyncio.sleep(delay)
+        events.append(f"end {name}")
+
+    await asyncio.gather(
+        processor.process_update(make_update(1), handle("a", 0.02)),
+        processor.process_update(make_update(1), handle("b", 0)),
+    )
+
+    assert events == ["start a", "end a", "start b", "end b"]
+    assert processor._chats == {}
+
+
+async def test_chats_do_not_wait_for_each_other():
+    processor = ChatOrderedUpdateProcessor()
+    slow_started = asyncio.Event()
+    release = asyncio.Event()
+    done = []
+
+    async def slow():
+        slow_started.set()
+        await release.wait()
+        done.append("slow")
+
+    async def fast():
+        done.append("fast")
+
+    slow_task = asyncio.create_task(processor.process_update(make_update(1), slow()))
+    await slow_started.wait()
+    await asyncio.wait_for(processor.process_update(make_update(2), fast()), 1)
+
+    assert done == ["fast"]
+    release.set()
+    await slow_task
+    assert done == ["fast", "slow"]
+
+
+async def test_update_without_chat_is_processed():
+    processor = ChatOrderedUpdateProcessor()
+    ran = []
+
+    async def handle():
+        ran.append(True)
+
+    await processor.process_update(object(), handle())
+
+    assert ran == [True]
+
+
+async def test_burst_from_one_chat_does_not_stall_other_chats():
+    processor = ChatOrderedUpdateProcessor(max_concurrent_updates=2)
+    release = asyncio.Event()
+    done = []
+
+    async def blocked():
+        await release.wait()
+        done.append("a")
+
+    async def other():
+        done.append("b")
+
+    # More updates queued in chat 1 than there are slots
+    burst = [
+        asyncio.create_task(processor.process_update(make_update(1), blocked()))
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    await asyncio.wait_for(processor.process_update(make_update(2), other()), 1)
+
+    assert done == ["b"]
+    assert processor.current_concurrent_updates == 1
+    release.set()
+    await asyncio.gather(*burst)
+    assert done == ["b"] + ["a"] * 5
+    assert processor.current_concurrent_updates == 0
+
+
+async def test_concurrency_is_capped_across_chats():
+    processor = ChatOrderedUpdateProcessor(max_concurrent_updates=2)
+    release = asyncio.Event()
+
+    async def blocked():
+        await release.wait()
+
+    tasks = [
+        asyncio.create_task(processor.process_update(make_update(chat), blocked()))
+        for chat in range(4)
+    ]
+    await asyncio.sleep(0.01)
+
+    assert processor.current_concurrent_updates == 2
+    release.set()
+    await asyncio.gather(*tasks)
@@ -1,6 +1,6 @@
 """Tests for UserConfig authorization logic."""
 
-from app.users import UserConfig
+from app.users import UserConfig, _parse_allowed_users
 
 
 def test_no_users_configured_allows_everyone(monkeypatch):
@@ -38,3 +38,23 @@ def test_display_no_restrictions(monkeypatch):
 def test_display_lists_users(monkeypatch):
     monkeypatch.setattr(UserConfig, "ALLOWED_USERS_STR", "alice,bob")
     assert UserConfig.get_allowed_users_display() == "alice, bob"
+
+
+def test_allowlist_parsed_once_per_value(monkeypatch):
+    monkeypatch.setattr(UserConfig, "ALLOWED_USERS_STR", "alice,123")
+    assert UserConfig.is_user_allowed("alice", None) is True
+    assert UserConfig.is_user_allowed(None, 123) is True
+    first = _parse_allowed_users("alice,123")
+    assert _parse_allowed_users("alice,123") is first
+
+    # A changed allowlist is picked up, not served from the cache
+    monkeypatch.setattr(UserConfig, "ALLOWED_USERS_STR", "bob")
+    assert UserConfig.is_user_allowed("alice", 123) is False
+    assert UserConfig.is_user_allowed("bob", None) is True
+
+
+def test_display_follows_allowlist_changes(monkeypatch):
+    monkeypatch.setattr(UserConfig, "ALLOWED_USERS_STR", "alice,bob")
+    assert UserConfig.get_allowed_users_display() == "alice, bob"
+    monkeypatch.setattr(UserConfig, "ALLOWED_USERS_STR", "carol")
+    assert UserConfig.get_allowed_users_display() == "carol"
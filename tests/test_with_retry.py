@@ -0,0 +1,23 @@
+"""Tests for TelegramBot._with_retry giving up on Telegram network errors."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from telegram.error import NetworkError
+
+from app.telegram_bot import TelegramBot
+
+
+async def test_buffered_links_are_flushed_before_exit(update_factory):
+    bot = object.__new__(TelegramBot)
+    bot.database_service = MagicMock()
+    handler = AsyncMock(side_effect=NetworkError("unreachable"))
+    handler.__name__ = "link_command"
+
+    with (
+        patch("app.telegram_bot.os._exit") as exit_,
+        patch("asyncio.sleep", AsyncMock()),
+    ):
+        exit_.side_effect = lambda code: bot.database_service.exited(code)
+        await bot._with_retry(handler, max_retries=2)(update_factory(), None)
+
+    assert [c[0] for c in bot.database_service.mock_calls] == ["flush", "exited"]